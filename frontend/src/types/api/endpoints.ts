@@ -116,6 +116,10 @@ export const endpoints = {
     quarantine: 'runtime/quarantine/'
   },
 
+  managedMedia: {
+    processedVideoStream: (videoId: Id) => `managed-media/videos/${videoId}/stream/`
+  },
+
   workflow: {
     saveWorkflowData: 'save-workflow-data/'
   },
@@ -1,6 +1,10 @@
 import { describe, expect, it, vi } from 'vitest'
 
-import { buildVideoHlsPlaylistUrl, buildVideoPlaybackUrls } from '@/utils/mediaUrls'
+import {
+  buildVideoHlsPlaylistUrl,
+  buildVideoPlaybackUrls,
+  buildVideoStreamUrl
+} from '@/utils/mediaUrls'
 
 vi.mock('@/api/axiosInstance', () => ({
   r: (path: string) => `/endoreg-api/${path.replace(/^\/+/, '')}`
@@ -25,8 +29,8 @@ describe('mediaUrls', () => {
 
     expect(hlsUrl.pathname).toBe('/endoreg-api/media/videos/42/hls/playlist/')
     expect(hlsUrl.searchParams.get('type')).toBe('processed')
-    expect(fallbackUrl.pathname).toBe('/endoreg-api/media/videos/42/stream/')
-    expect(fallbackUrl.searchParams.get('type')).toBe('processed')
+    expect(fallbackUrl.pathname).toBe('/endoreg-api/managed-media/videos/42/stream/')
+    expect(fallbackUrl.searchParams.has('type')).toBe(false)
   })
 
   it('builds an explicit raw HLS playback URL for validation', () => {
@@ -39,4 +43,11 @@ describe('mediaUrls', () => {
     expect(fallbackUrl.pathname).toBe('/endoreg-api/media/videos/12/stream/')
     expect(fallbackUrl.searchParams.get('type')).toBe('raw')
   })
+
+  it('keeps the endoreg stream for unspecified video types', () => {
+    const url = parsedUrl(buildVideoStreamUrl(7))
+
+    expect(url.pathname).toBe('/endoreg-api/media/videos/7/stream/')
+    expect(url.searchParams.has('type')).toBe(false)
+  })
 })
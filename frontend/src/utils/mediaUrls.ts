@@ -33,6 +33,10 @@ export function buildVideoStreamUrl(
   type?: MediaFileType,
   query?: QueryParams
 ): string {
+  if (type === 'processed') {
+    // lx-annotate's own range-streaming view; it only serves the processed file.
+    return buildApiUrl(endpoints.managedMedia.processedVideoStream(fileId), query)
+  }
   return buildApiUrl(endpoints.media.videoStream(fileId), {
     ...(type ? { type } : {}),
     ...query
@@ -5,6 +5,7 @@ from lx_annotate.views.hub_export import (
     hub_export_overview,
     hub_export_unmark,
 )
+from lx_annotate.views.managed_media import processed_video_stream
 from lx_annotate.views.quarantine import quarantine_overview
 from lx_annotate.views.administration import (
     administration_overview,
@@ -37,5 +38,10 @@ urlpatterns = [
         quarantine_overview,
         name="runtime-quarantine-overview",
     ),
+    path(
+        "managed-media/videos/<int:video_id>/stream/",
+        processed_video_stream,
+        name="managed-media-video-stream",
+    ),
     path("", include(("endoreg_db.urls", "endoreg_db"), namespace="api")),
 ]
@@ -5,21 +5,27 @@ File watcher service packaged with the lx_annotate Django app.
 from __future__ import annotations
 
 import glob
+import inspect
 import logging
 import os
 import shutil
 import threading
 import time
-from contextlib import contextmanager
-from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Iterator, Set
+from typing import Callable, ContextManager, Iterable, Iterator, Set
 
 import requests
 from django.core.exceptions import ObjectDoesNotExist
 from watchdog.events import (  # type: ignore[import-not-found]
     DirCreatedEvent,
+    DirDeletedEvent,
+    DirModifiedEvent,
     FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
     FileMovedEvent,
     FileSystemEventHandler,
     DirMovedEvent,
@@ -27,7 +33,13 @@ from watchdog.events import (  # type: ignore[import-not-found]
 from watchdog.observers import Observer  # type: ignore[import-not-found]
 from django.db.models import Q
 from django.db.models.fields.files import FieldFile
-from endoreg_db.models import Center, EndoscopyProcessor, LabelVideoSegment, VideoFile
+from endoreg_db.models import (
+    Center,
+    EndoscopyProcessor,
+    LabelVideoSegment,
+    RawPdfFile,
+    VideoFile,
+)
 from endoreg_db.services.environment_readiness import assert_environment_readiness
 from endoreg_db.services.hub.ingest import (
     process_preanonymized_watcher_file,
@@ -45,6 +57,73 @@ from endoreg_db.services.video_files._imports import (
     check_storage_capacity,
 )
 
+from .storage.working_copies import configured_working_copy_cache
+from .watcher.admission import StorageAdmission
+from .watcher.batching import (
+    BatchItem,
+    ReportBatchContext,
+    configured_report_batcher,
+)
+from .watcher.claims import (
+    ClaimKeeper,
+    claim_file,
+    ingest_task_id,
+    is_claimed,
+    new_lease_token,
+    release_claim,
+)
+from .watcher.coalescer import EventCoalescer
+from .watcher.hashing import ContentHash, IncrementalHasher
+from .watcher.ingest import INGEST_MODE_CELERY, configured_ingest_mode
+from .watcher.lanes import (
+    LANE_PSEUDONYMIZED,
+    LANE_REPORT,
+    LANE_VIDEO,
+    IntakeLaneExecutor,
+    LaneSnapshot,
+    configured_lane_workers,
+)
+from .watcher.ledger import (
+    OUTCOME_DEFERRED,
+    OUTCOME_DUPLICATE,
+    OUTCOME_ENQUEUED,
+    OUTCOME_FAILED,
+    OUTCOME_PROCESSING,
+    OUTCOME_QUARANTINED,
+    OUTCOME_SUCCEEDED,
+    IntakeLedger,
+    LedgerPathSet,
+    configured_ledger_path,
+)
+from .watcher.metrics import (
+    MetricsServer,
+    WatcherMetrics,
+    configured_metrics_file,
+    configured_metrics_server,
+)
+from .watcher.model_residency import ModelResidencyManager
+from .watcher.priority import (
+    KIND_REPORT,
+    KIND_VIDEO,
+    IntakeRank,
+    PriorityPolicy,
+    configured_queue_snapshot_path,
+    write_queue_snapshot,
+)
+from .watcher.process_pool import (
+    RESULT_COMPLETE,
+    RESULT_NO_STORAGE,
+    RESULT_NOT_READY,
+    PooledUploadJob,
+    configured_ocr_pool,
+)
+from .watcher.quarantine import RetryPolicy, quarantine_file
+from .watcher.scanner import IntakeScanner, ScanRoot
+from .watcher.readiness import (
+    FileReadinessTracker,
+    observer_emits_close_events,
+)
+
 LOG_DIR = path_utils.LOG_DIR
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 MANAGED_VAULT_ROOT = path_utils.STORAGE_DIR.resolve()
@@ -184,8 +263,17 @@ def managed_media_temp_path(
     Materialize managed media into a short-lived plaintext temp file.
 
     Use this only for legacy binaries that require an on-disk path. The source
-    bytes are read via the storage backend, not with raw filesystem I/O.
+    bytes are read via the storage backend, not with raw filesystem I/O. With
+    ``LX_ANNOTATE_WORKING_COPY_CACHE_MB`` set, the copy comes from the shared
+    working-copy cache and must be treated as read-only.
     """
+    working_copies = configured_working_copy_cache()
+    if working_copies is not None:
+        with working_copies.acquire(
+            field_file.storage, field_file.name, suffix=suffix
+        ) as local_path:
+            yield local_path
+        return
     with ensure_local_file(field_file, suffix=suffix) as local_path:
         yield local_path
 
@@ -370,6 +458,433 @@ intake_video_import_service = IntakeVideoImportService()
 intake_report_import_service = IntakeReportImportService()
 
 
+def _ingest_hash_kwargs(content_hash: str) -> dict[str, str]:
+    """Hand a precomputed hash to ingest when the installed endoreg-db accepts it."""
+    if not content_hash:
+        return {}
+    try:
+        parameters = inspect.signature(process_watcher_file).parameters.values()
+    except (TypeError, ValueError):
+        return {}
+    if any(
+        parameter.name == "content_hash"
+        or parameter.kind is inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters
+    ):
+        return {"content_hash": content_hash}
+    return {}
+
+
+@dataclass(frozen=True)
+class IngestDefaults:
+    """Center, processor and model that intake files are imported with."""
+
+    center_reference: str
+    processor_name: str = "olympus_cv_1500"
+    model_name: str = "image_multilabel_classification_colonoscopy_default"
+
+    @classmethod
+    def from_env(cls) -> IngestDefaults:
+        return cls(
+            center_reference=_normalize_center_reference(
+                os.getenv("LX_ANNOTATE_DEFAULT_CENTER", "university_hospital_wuerzburg")
+            )
+        )
+
+    def resolve_center(self) -> Center:
+        try:
+            return _resolve_center_by_key(self.center_reference)
+        except ValueError:
+            return _resolve_center_reference(self.center_reference)
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """
+    How the import of one intake file ended, as an intake-ledger outcome.
+
+    ``content_hash`` is the hash of the imported (or duplicate) content when
+    it is known.
+    """
+
+    outcome: str = OUTCOME_SUCCEEDED
+    error: str = ""
+    content_hash: str = ""
+
+
+def _is_imported_video(content_hash: str) -> bool:
+    try:
+        video_file = VideoFile.objects.filter(video_hash=content_hash).first()
+        # An earlier import that stopped before prediction goes through
+        # ingest again so the pipeline is resumed.
+        return video_file is not None and _prediction_pipeline_complete(video_file)
+    except Exception as exc:
+        logger.warning("Duplicate check failed for video %s: %s", content_hash, exc)
+        return False
+
+
+def _is_imported_report(content_hash: str) -> bool:
+    try:
+        return RawPdfFile.objects.filter(pdf_hash=content_hash).exists()
+    except Exception as exc:
+        logger.warning("Duplicate check failed for report %s: %s", content_hash, exc)
+        return False
+
+
+def _remove_duplicate(path: Path, content_hash: str, existing: str) -> IngestResult:
+    logger.info(
+        "Skipping duplicate intake file %s (already imported as %s)",
+        path,
+        existing,
+    )
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as exc:
+        logger.warning("Could not remove duplicate intake file %s: %s", path, exc)
+    return IngestResult(OUTCOME_DUPLICATE, content_hash=content_hash)
+
+
+def ensure_report_storage_root() -> None:
+    storage_root_path = storage_root_report_sensitive
+    storage_root_path.mkdir(parents=True, exist_ok=True)
+    if not storage_root_path.exists():
+        raise InsufficientStorageError(
+            f"Storage root does not exist: {storage_root_path}"
+        )
+
+
+def _dispatch_video_segmentation(video_file: VideoFile, model_name: str) -> None:
+    try:
+        from endoreg_db.models import AiModel
+        from endoreg_db.services.video_temporal_inference import (
+            dispatch_video_temporal_inference,
+        )
+
+        ai_model = AiModel.objects.get(name=model_name)
+        model_meta = ai_model.get_latest_version()
+        dispatch_result = dispatch_video_temporal_inference(
+            video_id=video_file.pk,
+            model_meta_id=model_meta.pk,
+            replace_prediction_segments=True,
+            delete_frames_after=True,
+        )
+        logger.info(
+            "Video segmentation queued for %s on %s queue: "
+            "task=%s history=%s status=%s",
+            video_file.video_hash,
+            dispatch_result.queue,
+            dispatch_result.task_id,
+            dispatch_result.history_id,
+            dispatch_result.status,
+        )
+    except Exception as exc:
+        logger.error("Error queuing video segmentation: %s", exc, exc_info=True)
+
+
+def _is_storage_error(exc: BaseException) -> bool:
+    error_msg = str(exc).lower()
+    return any(
+        phrase in error_msg
+        for phrase in ["insufficient storage", "no space left", "disk full"]
+    )
+
+
+def ingest_video(
+    video_path: Path,
+    *,
+    defaults: IngestDefaults,
+    content_hash: str = "",
+) -> IngestResult:
+    """
+    Import one intake video and queue its AI pipeline.
+
+    Storage shortages and sources that are not ready yet are deferred; other
+    errors are failures. Nothing here touches the intake ledger.
+    """
+    try:
+        logger.info("Starting video processing: %s", video_path)
+        if not is_intake_path(video_path):
+            raise ValueError(
+                f"Video path is outside plaintext intake zone: {video_path}"
+            )
+
+        if content_hash and _is_imported_video(content_hash):
+            return _remove_duplicate(video_path, content_hash, f"video {content_hash}")
+
+        try:
+            check_storage_capacity(video_path, Path(storage_root_global))
+        except InsufficientStorageError as storage_error:
+            logger.error(
+                "Insufficient storage space for %s: %s", video_path, storage_error
+            )
+            return IngestResult(OUTCOME_DEFERRED, str(storage_error))
+        except Exception as storage_error:
+            logger.warning("Storage check failed, proceeding anyway: %s", storage_error)
+
+        video_hash = ""
+        try:
+            upload_job = process_watcher_file(
+                file_path=video_path,
+                file_type="video",
+                center=defaults.resolve_center(),
+                processor_name=defaults.processor_name,
+                prediction_model_name=defaults.model_name,
+                source_system="watcher",
+                **_ingest_hash_kwargs(content_hash),
+            )
+            upload_job.refresh_from_db(
+                fields=[
+                    "status",
+                    "sensitive_meta",
+                    "content_hash",
+                    "processing_provenance",
+                    "error_detail",
+                ]
+            )
+            if not upload_job.is_complete:
+                logger.info(
+                    "Watcher upload job handed off for async ingest: %s status=%s",
+                    upload_job.id,
+                    upload_job.status,
+                )
+                return IngestResult()
+            if not upload_job.is_successful:
+                logger.warning(
+                    "Watcher upload job did not complete successfully for %s: "
+                    "job=%s status=%s error=%s",
+                    video_path,
+                    upload_job.id,
+                    upload_job.status,
+                    upload_job.error_detail,
+                )
+                return IngestResult()
+
+            video_hash = str(getattr(upload_job, "content_hash", "") or "").strip()
+            if not video_hash:
+                provenance: UploadProvenance = (
+                    getattr(upload_job, "processing_provenance", None) or {}
+                )
+                video_hash = str(provenance.get("content_hash", "")).strip()
+            video_file = (
+                VideoFile.objects.filter(video_hash=video_hash).first()
+                if video_hash
+                else None
+            )
+            if video_file is None:
+                logger.warning(
+                    "Watcher upload job completed but no VideoFile could be resolved for %s",
+                    video_path,
+                )
+                return IngestResult(content_hash=video_hash)
+            if not _video_has_sensitive_meta(video_file):
+                if getattr(upload_job, "sensitive_meta_id", None) is not None:
+                    logger.warning(
+                        "SensitiveMeta was created for upload job %s but is not "
+                        "linked to VideoFile %s",
+                        upload_job.id,
+                        video_file.video_hash,
+                    )
+                else:
+                    logger.warning(
+                        "Video imported but no SensitiveMeta created: %s",
+                        video_file.video_hash,
+                    )
+            logger.info(
+                "Video imported through shared hub ingest: %s",
+                video_file.video_hash,
+            )
+        except WatcherFileNotReadyError as not_ready_error:
+            logger.info(
+                "Video watcher source is not ready yet, deferring: %s (%s)",
+                video_path,
+                not_ready_error,
+            )
+            return IngestResult(OUTCOME_DEFERRED, str(not_ready_error))
+        except Exception as import_error:
+            if _is_storage_error(import_error):
+                logger.error(
+                    "Storage error during import for %s: %s", video_path, import_error
+                )
+                return IngestResult(OUTCOME_DEFERRED, str(import_error))
+            logger.error("Import failed for %s: %s", video_path, import_error)
+            return IngestResult(OUTCOME_FAILED, str(import_error))
+
+        if getattr(video_file, "pk", None):
+            if not video_path.exists():
+                if _prediction_pipeline_complete(video_file):
+                    logger.info(
+                        "Video %s already has completed prediction segments. "
+                        "Bypassing AI pipeline.",
+                        video_hash,
+                    )
+                    return IngestResult(content_hash=video_hash)
+                logger.info(
+                    "Watcher source for video %s was cleaned up after ingest; "
+                    "queuing AI pipeline.",
+                    video_hash,
+                )
+            _dispatch_video_segmentation(video_file, defaults.model_name)
+
+        logger.info("Video processing completed: %s", video_path)
+        if video_path.exists():
+            logger.info("Source video still exists: %s", video_path)
+            video_path.unlink()
+        return IngestResult(content_hash=video_hash)
+    except Exception as exc:
+        logger.error("Error processing video %s: %s", video_path, exc, exc_info=True)
+        if _is_storage_error(exc):
+            logger.warning(
+                "Storage error for %s, will retry when space is available",
+                video_path,
+            )
+            return IngestResult(OUTCOME_DEFERRED, str(exc))
+        return IngestResult(OUTCOME_FAILED, str(exc))
+
+
+def ingest_report(
+    report_path: Path,
+    *,
+    defaults: IngestDefaults,
+    content_hash: str = "",
+    center: Center | None = None,
+    imported_hashes: set[str] | None = None,
+    upload: Callable[..., object] | None = None,
+) -> IngestResult:
+    """
+    Import one intake report.
+
+    ``imported_hashes`` replaces the per-file duplicate query when the caller
+    looked the hashes up already; imports add their hash to it. ``upload``
+    replaces ``process_watcher_file`` (without ``center``), for example with
+    a call into the OCR worker pool.
+    """
+    try:
+        logger.info("Starting report processing: %s", report_path)
+        if not is_intake_path(report_path):
+            raise ValueError(
+                f"Report path is outside plaintext intake zone: {report_path}"
+            )
+
+        if imported_hashes is None:
+            is_duplicate = bool(content_hash) and _is_imported_report(content_hash)
+        else:
+            is_duplicate = content_hash in imported_hashes
+        if is_duplicate:
+            return _remove_duplicate(
+                report_path, content_hash, f"report {content_hash}"
+            )
+
+        try:
+            ensure_report_storage_root()
+            if upload is None:
+                upload_job = process_watcher_file(
+                    file_path=report_path,
+                    file_type="report",
+                    center=center if center is not None else defaults.resolve_center(),
+                    source_system="watcher",
+                    **_ingest_hash_kwargs(content_hash),
+                )
+            else:
+                upload_job = upload(
+                    file_path=report_path,
+                    file_type="report",
+                    source_system="watcher",
+                    **_ingest_hash_kwargs(content_hash),
+                )
+            if not upload_job.is_complete:
+                logger.info(
+                    "Report import skipped (already being processed): %s",
+                    report_path,
+                )
+                return IngestResult(OUTCOME_DEFERRED)
+            logger.info("Report imported through shared hub ingest: %s", upload_job.id)
+            if imported_hashes is not None and content_hash:
+                # A later copy of the same PDF is a duplicate of this import.
+                imported_hashes.add(content_hash)
+            try:
+                if report_path.exists():
+                    report_path.unlink()
+            except Exception as exc:
+                logger.error("Error removing report file %s: %s", report_path, exc)
+            return IngestResult(content_hash=content_hash)
+        except WatcherFileNotReadyError as not_ready_error:
+            logger.info(
+                "Report watcher source is not ready yet, deferring: %s (%s)",
+                report_path,
+                not_ready_error,
+            )
+            return IngestResult(OUTCOME_DEFERRED, str(not_ready_error))
+        except InsufficientStorageError as storage_error:
+            logger.error(
+                "Insufficient storage space for %s: %s", report_path, storage_error
+            )
+            return IngestResult(OUTCOME_DEFERRED, str(storage_error))
+        except Exception as import_error:
+            logger.error("report import failed for %s: %s", report_path, import_error)
+            return IngestResult(OUTCOME_FAILED, str(import_error))
+    except Exception as exc:
+        logger.error("Error processing report %s: %s", report_path, exc, exc_info=True)
+        return IngestResult(OUTCOME_FAILED, str(exc))
+
+
+def ingest_pseudonymized(
+    file_path: Path,
+    *,
+    upload: Callable[..., object] | None = None,
+) -> IngestResult:
+    """Import one pre-anonymized intake file; ``upload`` as in ``ingest_report``."""
+    try:
+        logger.info("Starting pseudonymized processing: %s", file_path)
+        if not is_intake_path(file_path):
+            raise ValueError(
+                f"Pseudonymized path is outside plaintext intake zone: {file_path}"
+            )
+        if upload is None:
+            process_preanonymized_watcher_file(file_path=file_path)
+        else:
+            upload(file_path=file_path)
+        logger.info("Pseudonymized processing completed: %s", file_path)
+        return IngestResult()
+    except WatcherFileNotReadyError as not_ready_error:
+        logger.info(
+            "Pseudonymized watcher source is not ready yet, deferring: %s (%s)",
+            file_path,
+            not_ready_error,
+        )
+        return IngestResult(OUTCOME_DEFERRED, str(not_ready_error))
+    except Exception as exc:
+        logger.error(
+            "Error processing pseudonymized file %s: %s",
+            file_path,
+            exc,
+            exc_info=True,
+        )
+        return IngestResult(OUTCOME_FAILED, str(exc))
+
+
+def ingest_intake_file(
+    kind: str,
+    path: Path,
+    *,
+    content_hash: str = "",
+    defaults: IngestDefaults | None = None,
+) -> IngestResult:
+    """
+    Import one intake file of ``kind`` in the calling process.
+
+    This is the whole import, without the watcher around it: no ledger, lanes,
+    OCR pool or metrics. Celery ingest tasks call it directly.
+    """
+    defaults = defaults or IngestDefaults.from_env()
+    if kind == LANE_VIDEO:
+        return ingest_video(path, defaults=defaults, content_hash=content_hash)
+    if kind == LANE_REPORT:
+        return ingest_report(path, defaults=defaults, content_hash=content_hash)
+    if kind == LANE_PSEUDONYMIZED:
+        return ingest_pseudonymized(path)
+    raise ValueError(f"Unknown intake kind: {kind}")
+
+
 def unload_ollama_model(model_name: str = "llama3.2:1b") -> None:
     """Request Ollama to unload the model immediately."""
     try:
@@ -385,6 +900,13 @@ def unload_ollama_model(model_name: str = "llama3.2:1b") -> None:
         )
 
 
+_DETECTED_MESSAGES = {
+    LANE_VIDEO: "New video detected: %s",
+    LANE_REPORT: "New report detected: %s",
+    LANE_PSEUDONYMIZED: "New pseudonymized file detected: %s",
+}
+
+
 def should_ignore_file(file_path: str | Path) -> bool:
     """Skip internal/temporary files and quarantine paths."""
     p = Path(file_path)
@@ -402,32 +924,57 @@ def should_ignore_file(file_path: str | Path) -> bool:
 class AutoProcessingHandler(FileSystemEventHandler):
     """Handle file-system events for automatic processing of videos and reports."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, ledger: IntakeLedger | None = None) -> None:
         super().__init__()
-        self.processed_files: Set[str] = set()
+        self.ledger = ledger or IntakeLedger(configured_ledger_path())
+        self.processed_files = LedgerPathSet(self.ledger)
+        self.retry_policy = RetryPolicy.from_env()
+        self.ingest_mode = configured_ingest_mode()
+        self.claims = ClaimKeeper()
         self.in_flight_files: Set[str] = set()
+        self.content_hashes: dict[str, ContentHash] = {}
         self.files_lock = threading.Lock()
+        self.readiness = FileReadinessTracker()
         self.video_extensions = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v"}
         self.report_extensions = {".pdf"}
         self.pseudonymized_extensions = {".pdf", ".mp4"}
 
-        configured_default_center = os.getenv(
-            "LX_ANNOTATE_DEFAULT_CENTER",
-            "university_hospital_wuerzburg",
-        )
         # Keep handler construction side-effect free for file watcher tests and
         # lazy service wiring. Resolve the configured center only at ingest time.
-        self.default_center_reference = _normalize_center_reference(
-            configured_default_center
-        )
+        self.ingest_defaults = IngestDefaults.from_env()
+        self.default_center_reference = self.ingest_defaults.center_reference
         self.default_center_key = self.default_center_reference
-        self.default_processor = "olympus_cv_1500"
-        self.default_model = "image_multilabel_classification_colonoscopy_default"
+        self.default_processor = self.ingest_defaults.processor_name
+        self.default_model = self.ingest_defaults.model_name
 
-        self.executor = ThreadPoolExecutor(
-            max_workers=1, thread_name_prefix="FileProcessor"
-        )
         self.pseudonymized_dir = INTAKE_PREANONYMIZED_DIR
+        self.priority_policy = PriorityPolicy.from_env()
+        self.ocr_pool = configured_ocr_pool()
+        self.model_residency = ModelResidencyManager.from_env()
+        self.storage_admission = StorageAdmission.from_env(
+            Path(storage_root_global), resubmit=self._submit_file
+        )
+        self.report_batcher = (
+            configured_report_batcher(self._submit_report_batch)
+            if self.ingest_mode != INGEST_MODE_CELERY
+            else None
+        )
+        lane_workers = configured_lane_workers()
+        if self.ocr_pool is not None:
+            # One lane thread per OCR process keeps every process busy.
+            for lane in (LANE_REPORT, LANE_PSEUDONYMIZED):
+                lane_workers[lane] = max(lane_workers[lane], self.ocr_pool.processes)
+        if self.report_batcher is not None:
+            # Readiness checks keep feeding the next batch while one imports.
+            lane_workers[LANE_REPORT] = max(lane_workers[LANE_REPORT], 2)
+        self.executor = IntakeLaneExecutor(
+            classify=self._lane_for_path,
+            lane_workers=lane_workers,
+            rank=self._rank_file,
+        )
+        self.coalescer = EventCoalescer(self._submit_file)
+        self.metrics = WatcherMetrics()
+        self.metrics.add_collector(self._collect_metrics)
 
         logger.info("AutoProcessingHandler initialized")
         logger.info("Monitoring video extensions: %s", self.video_extensions)
@@ -439,17 +986,74 @@ class AutoProcessingHandler(FileSystemEventHandler):
             "Default watcher center reference: %s", self.default_center_reference
         )
         logger.info("Pseudonymized intake directory: %s", self.pseudonymized_dir)
+        logger.info("Watcher ingest mode: %s", self.ingest_mode)
+        logger.info(
+            "Watcher lane workers: %s",
+            {name: lane.max_workers for name, lane in self.executor.lanes.items()},
+        )
 
-    def _resolve_default_center(self) -> Center:
+    def _lane_for_path(self, file_path: str) -> str:
+        path = Path(file_path)
+        parent_dir = path.parent.resolve()
+        if parent_dir == INTAKE_VIDEO_DIR:
+            return LANE_VIDEO
+        if parent_dir == INTAKE_REPORT_DIR:
+            return LANE_REPORT
+        if parent_dir == self.pseudonymized_dir:
+            return LANE_PSEUDONYMIZED
+        if path.suffix.lower() in self.video_extensions:
+            return LANE_VIDEO
+        return LANE_REPORT
+
+    def _rank_file(self, file_path: str) -> IntakeRank:
+        path = Path(file_path)
         try:
-            return _resolve_center_by_key(self.default_center_key)
-        except ValueError:
-            return _resolve_center_reference(self.default_center_reference)
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        kind = (
+            KIND_VIDEO if path.suffix.lower() in self.video_extensions else KIND_REPORT
+        )
+        # Every file is imported for the default center, so that is the
+        # center whose weight applies.
+        return self.priority_policy.rank(
+            path=file_path,
+            kind=kind,
+            size=size,
+            center_key=self.default_center_key,
+        )
+
+    def lane_snapshot(self) -> dict[str, LaneSnapshot]:
+        snapshot = getattr(self.executor, "snapshot", None)
+        return snapshot() if callable(snapshot) else {}
+
+    def _collect_metrics(self) -> None:
+        for name, lane in self.lane_snapshot().items():
+            self.metrics.lane_queue_depth.set(lane.queued, lane=name)
+            self.metrics.lane_running.set(lane.running, lane=name)
+        events = self.coalescer.stats()
+        self.metrics.events.set_total(events.raw_events, stage="raw")
+        self.metrics.events.set_total(events.coalesced_events, stage="coalesced")
+        if self.storage_admission is not None:
+            admission = self.storage_admission.stats()
+            self.metrics.storage_reserved_bytes.set(admission.outstanding_bytes)
+            self.metrics.storage_deferred.set_total(admission.deferred)
+        working_copies = configured_working_copy_cache()
+        if working_copies is not None:
+            copies = working_copies.stats()
+            self.metrics.working_copy_requests.set_total(copies.hits, result="hit")
+            self.metrics.working_copy_requests.set_total(copies.misses, result="miss")
+            self.metrics.working_copy_evictions.set_total(copies.evictions)
+            self.metrics.working_copy_bytes.set(copies.bytes)
+
+    def _resolve_default_center(self) -> Center:
+        return self.ingest_defaults.resolve_center()
 
     def dispatch(self, event):  # type: ignore[override]
         if event.is_directory:
             return
-        if hasattr(event, "event_type") and event.event_type in {"opened", "closed"}:
+        event_type = getattr(event, "event_type", "")
+        if event_type in {"opened", "closed_no_write"}:
             return
 
         src_path = str(event.src_path)
@@ -464,15 +1068,31 @@ class AutoProcessingHandler(FileSystemEventHandler):
         if is_in_progress_handoff_path(path) or "transcoding" in str(path):
             return
 
+        if event_type == "closed":
+            self.readiness.mark_closed(event_path)
+            self.coalescer.settle(event_path)
+            return
+
         super().dispatch(event)
 
     def on_created(self, event: DirCreatedEvent | FileCreatedEvent):
         if isinstance(event, FileCreatedEvent) and not event.is_directory:
-            self._submit_file(str(event.src_path))
+            self.coalescer.add(str(event.src_path))
 
     def on_moved(self, event: DirMovedEvent | FileMovedEvent) -> None:
         if isinstance(event, FileMovedEvent) and not event.is_directory:
-            self._submit_file(str(event.dest_path))
+            self.readiness.mark_moved(str(event.dest_path))
+            self.coalescer.discard(str(event.src_path))
+            self.coalescer.add(str(event.dest_path))
+
+    def on_modified(self, event: DirModifiedEvent | FileModifiedEvent) -> None:
+        if isinstance(event, FileModifiedEvent) and not event.is_directory:
+            self.readiness.mark_modified(str(event.src_path))
+            self.coalescer.touch(str(event.src_path))
+
+    def on_deleted(self, event: DirDeletedEvent | FileDeletedEvent) -> None:
+        if isinstance(event, FileDeletedEvent) and not event.is_directory:
+            self.coalescer.discard(str(event.src_path))
 
     def _ensure_processing_slot(self, file_path: str) -> bool:
         with self.files_lock:
@@ -486,12 +1106,85 @@ class AutoProcessingHandler(FileSystemEventHandler):
             self.in_flight_files.discard(file_path)
 
     def _mark_processed(self, file_path: str) -> None:
-        with self.files_lock:
-            self.processed_files.add(file_path)
+        self.ledger.record_started(file_path)
 
-    def _unmark_processed(self, file_path: str) -> None:
-        with self.files_lock:
-            self.processed_files.discard(file_path)
+    def _unmark_processed(
+        self,
+        file_path: str,
+        *,
+        outcome: str = OUTCOME_FAILED,
+        error: object = "",
+    ) -> None:
+        if outcome == OUTCOME_FAILED:
+            self._record_failure(file_path, str(error or ""))
+            return
+        self.ledger.record_outcome(file_path, outcome, error=str(error or ""))
+
+    def _record_failure(self, file_path: str, error: str) -> None:
+        """
+        Back off exponentially on repeated failures of an unchanged file and
+        quarantine it once ``retry_policy.max_failures`` is reached.
+        """
+        entry = self.ledger.lookup(file_path)
+        failures = (entry.failures if entry is not None else 0) + 1
+        kind = self._lane_for_path(file_path)
+        if not self.retry_policy.should_quarantine(failures):
+            self.metrics.retries.inc(kind=kind)
+            delay = self.retry_policy.delay_for(failures)
+            self.ledger.record_outcome(
+                file_path,
+                OUTCOME_FAILED,
+                error=error,
+                next_attempt_at=time.time() + delay,
+            )
+            logger.warning(
+                "Import of %s failed (%s/%s); next attempt in %.0fs",
+                file_path,
+                failures,
+                self.retry_policy.max_failures,
+                delay,
+            )
+            return
+
+        self.ledger.record_outcome(file_path, OUTCOME_FAILED, error=error)
+        source = Path(file_path)
+        if not source.exists():
+            return
+        try:
+            quarantine_file(
+                source,
+                reason=error or "Import failed",
+                failures=failures,
+                content_hash=entry.content_hash if entry is not None else "",
+            )
+        except OSError as exc:
+            # Leave the file in place but stop retrying it until it changes.
+            logger.error("Could not quarantine %s: %s", file_path, exc)
+        self.metrics.quarantined.inc(kind=kind)
+        self.ledger.record_outcome(file_path, OUTCOME_QUARANTINED, error=error)
+
+    def _mark_succeeded(self, file_path: str) -> None:
+        entry = self.ledger.lookup(file_path)
+        if entry is not None and entry.outcome == OUTCOME_PROCESSING:
+            self.ledger.record_outcome(
+                file_path, OUTCOME_SUCCEEDED, content_hash=entry.content_hash
+            )
+
+    def is_known_file(
+        self,
+        file_path: str,
+        stat_result: os.stat_result | None = None,
+    ) -> bool:
+        """Whether a rescan should leave ``file_path`` alone for now."""
+        if file_path in self.in_flight_files:
+            return True
+        if self.ledger.is_settled(
+            file_path, stat_result
+        ) or self.ledger.retry_pending(file_path, stat_result):
+            return True
+        # Claim markers cost two stats, so only files the ledger would hand
+        # out again are checked for them.
+        return is_claimed(Path(file_path), ttl=self.claims.ttl_seconds)
 
     def _submit_file(self, file_path: str) -> None:
         if not self._ensure_processing_slot(file_path):
@@ -502,6 +1195,9 @@ class AutoProcessingHandler(FileSystemEventHandler):
     def _process_file(self, file_path: str) -> None:
         path_key = str(Path(file_path))
         path = Path(file_path)
+        lease_token = ""
+        handed_to_batch = False
+        deferred = False
 
         try:
             with self.files_lock:
@@ -515,38 +1211,208 @@ class AutoProcessingHandler(FileSystemEventHandler):
                 logger.debug("Skipping ignored file: %s", path)
                 return
 
+            kind = self._intake_kind(path)
+            if kind is None:
+                logger.debug("Ignoring file (wrong type/location): %s", path)
+                return
+
+            if self.ingest_mode != INGEST_MODE_CELERY:
+                lease_token = self._acquire_lease(path)
+                if not lease_token:
+                    return
+                # Admission comes before the stability wait, so a file that
+                # does not fit is not waited on and hashed again per attempt.
+                if not self._reserve_storage(kind, path):
+                    deferred = True
+                    return
+
+            wait_started = time.monotonic()
             if not self._wait_for_file_stable(path):
                 logger.warning("File not stable after waiting: %s", path)
                 return
+            self.metrics.stability_wait_seconds.observe(
+                time.monotonic() - wait_started, kind=kind
+            )
 
-            file_extension = path.suffix.lower()
-            parent_dir = path.parent.resolve()
-            logger.debug("Parent: %s", parent_dir)
-
-            if (
-                parent_dir == INTAKE_VIDEO_DIR
-                and file_extension in self.video_extensions
-            ):
-                logger.info("New video detected: %s", path)
-                self._process_video(path)
-            elif (
-                parent_dir == INTAKE_REPORT_DIR
-                and file_extension in self.report_extensions
-            ):
-                logger.info("New report detected: %s", path)
-                self._process_report(path)
-            elif (
-                parent_dir == self.pseudonymized_dir
-                and file_extension in self.pseudonymized_extensions
-            ):
-                logger.info("New pseudonymized file detected: %s", path)
-                self._process_pseudonymized(path)
-            else:
-                logger.debug("Ignoring file (wrong type/location): %s", path)
+            logger.info(_DETECTED_MESSAGES[kind], path)
+            if self.ingest_mode == INGEST_MODE_CELERY:
+                self._enqueue_ingest(kind, path)
+                return
+            # The file may have grown while it was still being written.
+            if not self._reserve_storage(kind, path):
+                deferred = True
+                return
+            if kind == LANE_REPORT and self.report_batcher is not None:
+                # The batch owns the lease, the reservation and the processing
+                # slot from here.
+                self.report_batcher.add(BatchItem(path_key, lease_token))
+                handed_to_batch = True
+                return
+            self._run_ingest_measured(kind, path, lambda: self._run_ingest(kind, path))
         except Exception as exc:
             logger.error("Error processing file %s: %s", file_path, exc, exc_info=True)
         finally:
-            self._release_processing_slot(path_key)
+            if not handed_to_batch:
+                self._finish_file(path_key, lease_token, keep_hash=deferred)
+
+    def _finish_file(
+        self, path_key: str, lease_token: str, *, keep_hash: bool = False
+    ) -> None:
+        if lease_token:
+            self._release_lease(Path(path_key), lease_token)
+        self.readiness.forget(path_key)
+        if not keep_hash:
+            # A deferred file keeps its hash for the next attempt; it is only
+            # used while size and mtime still match.
+            with self.files_lock:
+                self.content_hashes.pop(path_key, None)
+        self._release_processing_slot(path_key)
+        if self.storage_admission is not None:
+            # Last, so files it resubmits find their processing slot free.
+            self.storage_admission.release(path_key)
+
+    def _acquire_lease(self, path: Path) -> str:
+        """
+        Take the active claim on ``path`` for an inline import.
+
+        Returns the lease token, or an empty string when another watcher on a
+        shared intake mount holds a live lease on the file.
+        """
+        token = new_lease_token()
+        if not claim_file(path, token, active=True):
+            logger.info("Intake file is leased by another watcher: %s", path)
+            return ""
+        self.claims.hold(path, token, active=True)
+        return token
+
+    def _reserve_storage(self, kind: str, path: Path) -> bool:
+        """
+        Reserve the predicted vault footprint of ``path``.
+
+        Returns ``False`` when it does not fit now. The file then waits in the
+        admission controller, which resubmits it when a running import
+        releases its reservation, and the ledger keeps rescans off it for
+        ``retry_seconds``.
+        """
+        if self.storage_admission is None:
+            return True
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        if self.storage_admission.reserve(str(path), kind, size):
+            return True
+        logger.warning("Not enough storage for %s; deferring", path)
+        path_key = str(path)
+        self._mark_processed(path_key)
+        self.ledger.record_outcome(
+            path_key,
+            OUTCOME_DEFERRED,
+            error="insufficient storage for predicted footprint",
+            next_attempt_at=time.time() + self.storage_admission.retry_seconds,
+        )
+        return False
+
+    def _release_lease(self, path: Path, token: str) -> None:
+        self.claims.drop(path, active=True)
+        release_claim(path, token)
+
+    def _intake_kind(self, path: Path) -> str | None:
+        file_extension = path.suffix.lower()
+        parent_dir = path.parent.resolve()
+        logger.debug("Parent: %s", parent_dir)
+
+        if parent_dir == INTAKE_VIDEO_DIR and file_extension in self.video_extensions:
+            return LANE_VIDEO
+        if parent_dir == INTAKE_REPORT_DIR and file_extension in self.report_extensions:
+            return LANE_REPORT
+        if (
+            parent_dir == self.pseudonymized_dir
+            and file_extension in self.pseudonymized_extensions
+        ):
+            return LANE_PSEUDONYMIZED
+        return None
+
+    def _run_ingest_measured(
+        self, kind: str, path: Path, ingest: Callable[[], None]
+    ) -> None:
+        path_key = str(path)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        started = time.monotonic()
+        try:
+            ingest()
+            self._mark_succeeded(path_key)
+        finally:
+            entry = self.ledger.lookup(path_key)
+            outcome = entry.outcome if entry is not None else "unknown"
+            self.metrics.ingest_duration_seconds.observe(
+                time.monotonic() - started, kind=kind, outcome=outcome
+            )
+            if outcome == OUTCOME_SUCCEEDED:
+                self.metrics.ingested_bytes.inc(size, kind=kind)
+
+    def _run_ingest(self, kind: str, path: Path) -> None:
+        if kind == LANE_VIDEO:
+            self._process_video(path)
+        elif kind == LANE_REPORT:
+            self._process_report(path)
+        elif kind == LANE_PSEUDONYMIZED:
+            self._process_pseudonymized(path)
+        else:
+            raise ValueError(f"Unknown intake kind: {kind}")
+
+    def _enqueue_ingest(self, kind: str, path: Path) -> None:
+        """
+        Claim ``path`` and hand it to an ingest task on the pipeline queue.
+
+        The claim token is the task id, so only one watcher enqueues a file and
+        only the matching task imports it.
+        """
+        from lx_annotate.tasks import ingest_watcher_file_task
+
+        path_key = str(path)
+        self._mark_processed(path_key)
+        content_hash = self._take_content_hash(path)
+        try:
+            stat_result = path.stat()
+        except OSError as exc:
+            self._unmark_processed(path_key, outcome=OUTCOME_DEFERRED, error=exc)
+            return
+
+        task_id = ingest_task_id(kind, path, stat_result, content_hash)
+        if not claim_file(path, task_id):
+            logger.info("Intake file already claimed elsewhere: %s", path)
+            self._unmark_processed(
+                path_key, outcome=OUTCOME_DEFERRED, error="claimed elsewhere"
+            )
+            return
+
+        try:
+            ingest_watcher_file_task.apply_async(
+                kwargs={
+                    "file_path": path_key,
+                    "kind": kind,
+                    "content_hash": content_hash,
+                    "size": stat_result.st_size,
+                    "mtime_ns": stat_result.st_mtime_ns,
+                },
+                task_id=task_id,
+            )
+        except Exception as exc:
+            logger.error("Could not enqueue ingest for %s: %s", path, exc)
+            release_claim(path, task_id)
+            self._unmark_processed(path_key, outcome=OUTCOME_DEFERRED, error=exc)
+            return
+
+        # Keep the queued claim alive until a worker activates it.
+        self.claims.hold(path, task_id, active=False)
+        logger.info("Enqueued ingest task %s for %s", task_id, path)
+        self.ledger.record_outcome(
+            path_key, OUTCOME_ENQUEUED, content_hash=content_hash
+        )
 
     def _wait_for_file_stable(
         self,
@@ -555,315 +1421,240 @@ class AutoProcessingHandler(FileSystemEventHandler):
         stable_checks_required: int = 10,
         interval: float = 2.0,
     ) -> bool:
+        """
+        Block until ``path`` is safe to import.
+
+        On local inotify-backed directories this returns as soon as the writer
+        closes (or renames) the file; otherwise it falls back to requiring
+        ``stable_checks_required`` identical sizes ``interval`` seconds apart.
+        """
         if not path.exists() or should_ignore_file(path):
             return False
 
-        last_size = -1
-        stable_checks = 0
-        deadline = time.monotonic() + timeout
-
-        while time.monotonic() < deadline:
-            try:
-                current_size = path.stat().st_size
-            except OSError as exc:
-                logger.debug("Error checking file size for %s: %s", path, exc)
-                time.sleep(interval)
-                continue
-
-            if current_size <= 0:
-                stable_checks = 0
-            elif current_size == last_size:
-                stable_checks += 1
-                if stable_checks >= stable_checks_required:
-                    logger.info("File stable: %s (%s bytes)", path, current_size)
-                    return True
-            else:
-                stable_checks = 0
-                last_size = current_size
-                logger.debug("File still changing: %s (%s bytes)", path, current_size)
-
-            time.sleep(interval)
-
-        logger.warning("Timed out waiting for stable file: %s", path)
-        return False
-
-    def _process_video(self, video_path: Path) -> None:
+        # Video and report hashes are computed while waiting so duplicates can
+        # be skipped before hand-off and ingest does not read the file again.
+        hasher = (
+            IncrementalHasher(path)
+            if self._lane_for_path(str(path)) in {LANE_VIDEO, LANE_REPORT}
+            and not self._has_content_hash(path)
+            else None
+        )
+        ready = self.readiness.wait_until_ready(
+            path,
+            timeout=timeout,
+            stable_checks_required=stable_checks_required,
+            interval=interval,
+            on_poll=hasher.update if hasher is not None else None,
+        )
+        if ready and hasher is not None:
+            content_hash = hasher.finish()
+            if content_hash is not None:
+                with self.files_lock:
+                    self.content_hashes[str(path)] = content_hash
+        return ready
+
+    def _has_content_hash(self, path: Path) -> bool:
+        """Whether a hash kept from a deferred attempt still fits ``path``."""
+        with self.files_lock:
+            content_hash = self.content_hashes.get(str(path))
+        if content_hash is None:
+            return False
         try:
-            logger.info("Starting video processing: %s", video_path)
-            self._mark_processed(str(video_path))
-            if not is_intake_path(video_path):
-                raise ValueError(
-                    f"Video path is outside plaintext intake zone: {video_path}"
-                )
+            return content_hash.matches(path.stat())
+        except OSError:
+            return False
 
-            try:
-                check_storage_capacity(video_path, Path(storage_root_global))
-            except InsufficientStorageError as storage_error:
-                logger.error(
-                    "Insufficient storage space for %s: %s",
-                    video_path,
-                    storage_error,
-                )
-                self._unmark_processed(str(video_path))
-                return
-            except Exception as storage_error:
-                logger.warning(
-                    "Storage check failed, proceeding anyway: %s", storage_error
-                )
+    def _take_content_hash(self, path: Path) -> str:
+        """Return the precomputed SHA-256 of ``path`` if the file is unchanged."""
+        content_hash = self._pop_content_hash(path)
+        self.ledger.set_content_hash(str(path), content_hash)
+        return content_hash
 
-            try:
-                source_center = self._resolve_default_center()
-                upload_job = process_watcher_file(
-                    file_path=video_path,
-                    file_type="video",
-                    center=source_center,
-                    processor_name=self.default_processor,
-                    prediction_model_name=self.default_model,
-                    source_system="watcher",
-                )
-                upload_job.refresh_from_db(
-                    fields=[
-                        "status",
-                        "sensitive_meta",
-                        "content_hash",
-                        "processing_provenance",
-                        "error_detail",
-                    ]
-                )
-                if not upload_job.is_complete:
-                    logger.info(
-                        "Watcher upload job handed off for async ingest: %s status=%s",
-                        upload_job.id,
-                        upload_job.status,
-                    )
-                    return
-                if not upload_job.is_successful:
-                    logger.warning(
-                        "Watcher upload job did not complete successfully for %s: "
-                        "job=%s status=%s error=%s",
-                        video_path,
-                        upload_job.id,
-                        upload_job.status,
-                        upload_job.error_detail,
-                    )
-                    return
+    def _pop_content_hash(self, path: Path) -> str:
+        with self.files_lock:
+            content_hash = self.content_hashes.pop(str(path), None)
+        if content_hash is None:
+            return ""
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return ""
+        if not content_hash.matches(stat_result):
+            return ""
+        return content_hash.sha256
+
+    def _record_ingest_result(self, path: Path, result: IngestResult) -> None:
+        path_key = str(path)
+        if result.outcome == OUTCOME_DUPLICATE:
+            self.metrics.duplicates_skipped.inc(kind=self._lane_for_path(path_key))
+            self.ledger.record_outcome(
+                path_key, OUTCOME_DUPLICATE, content_hash=result.content_hash
+            )
+        elif result.outcome in {OUTCOME_DEFERRED, OUTCOME_FAILED}:
+            self._unmark_processed(path_key, outcome=result.outcome, error=result.error)
+        elif result.content_hash:
+            self.ledger.set_content_hash(path_key, result.content_hash)
 
-                video_hash = str(getattr(upload_job, "content_hash", "") or "").strip()
-                if not video_hash:
-                    provenance: UploadProvenance = (
-                        getattr(upload_job, "processing_provenance", None) or {}
-                    )
-                    video_hash = str(provenance.get("content_hash", "")).strip()
-                video_file = (
-                    VideoFile.objects.filter(video_hash=video_hash).first()
-                    if video_hash
-                    else None
-                )
-                if video_file is None:
-                    logger.warning(
-                        "Watcher upload job completed but no VideoFile could be resolved for %s",
-                        video_path,
-                    )
-                    return
-                if not _video_has_sensitive_meta(video_file):
-                    if getattr(upload_job, "sensitive_meta_id", None) is not None:
-                        logger.warning(
-                            "SensitiveMeta was created for upload job %s but is not "
-                            "linked to VideoFile %s",
-                            upload_job.id,
-                            video_file.video_hash,
-                        )
-                    else:
-                        logger.warning(
-                            "Video imported but no SensitiveMeta created: %s",
-                            video_file.video_hash,
-                        )
-                logger.info(
-                    "Video imported through shared hub ingest: %s",
-                    video_file.video_hash,
-                )
-            except WatcherFileNotReadyError as not_ready_error:
-                logger.info(
-                    "Video watcher source is not ready yet, deferring: %s (%s)",
-                    video_path,
-                    not_ready_error,
-                )
-                self._unmark_processed(str(video_path))
-                return
-            except Exception as import_error:
-                error_msg = str(import_error)
-                if (
-                    "Insufficient storage" in error_msg
-                    or "No space left on device" in error_msg
-                ):
-                    logger.error(
-                        "Storage error during import for %s: %s",
-                        video_path,
-                        import_error,
-                    )
-                    self._unmark_processed(str(video_path))
-                    return
-                logger.error("Import failed for %s: %s", video_path, import_error)
-                self._unmark_processed(str(video_path))
-                return
-            if video_file and getattr(video_file, "pk", None):
-                if not video_path.exists():
-                    if _prediction_pipeline_complete(video_file):
-                        logger.info(
-                            "Video %s already has completed prediction segments. "
-                            "Bypassing AI pipeline.",
-                            video_hash,
-                        )
-                        return
-                    logger.info(
-                        "Watcher source for video %s was cleaned up after ingest; "
-                        "queuing AI pipeline.",
-                        video_hash,
-                    )
-                try:
-                    from endoreg_db.models import AiModel
-                    from endoreg_db.services.video_temporal_inference import (
-                        dispatch_video_temporal_inference,
-                    )
+    def _process_video(self, video_path: Path) -> None:
+        self._mark_processed(str(video_path))
+        result = ingest_video(
+            video_path,
+            defaults=self.ingest_defaults,
+            content_hash=self._take_content_hash(video_path),
+        )
+        self._record_ingest_result(video_path, result)
 
-                    ai_model = AiModel.objects.get(name=self.default_model)
-                    model_meta = ai_model.get_latest_version()
-                    dispatch_result = dispatch_video_temporal_inference(
-                        video_id=video_file.pk,
-                        model_meta_id=model_meta.pk,
-                        replace_prediction_segments=True,
-                        delete_frames_after=True,
-                    )
-                    logger.info(
-                        "Video segmentation queued for %s on %s queue: "
-                        "task=%s history=%s status=%s",
-                        video_file.video_hash,
-                        dispatch_result.queue,
-                        dispatch_result.task_id,
-                        dispatch_result.history_id,
-                        dispatch_result.status,
-                    )
-                except Exception as exc:
-                    logger.error(
-                        "Error queuing video segmentation: %s", exc, exc_info=True
-                    )
+    def _process_report(
+        self, report_path: Path, batch: ReportBatchContext | None = None
+    ) -> None:
+        """
+        Import one report.
 
-            logger.info("Video processing completed: %s", video_path)
-            if video_path.exists():
-                logger.info("Source video still exists: %s", video_path)
-                video_path.unlink()
-        except Exception as exc:
-            error_msg = str(exc)
-            logger.error(
-                "Error processing video %s: %s", video_path, error_msg, exc_info=True
+        Inside a batch, ``batch`` carries the work already done once for all
+        of its files: ledger start rows, content hashes, the duplicate lookup,
+        the LLM model and the resolved center.
+        """
+        upload = (
+            partial(
+                self._run_in_ocr_pool,
+                "report",
+                center_reference=self.default_center_reference,
             )
-            if any(
-                phrase in error_msg.lower()
-                for phrase in ["insufficient storage", "no space left", "disk full"]
-            ):
-                logger.warning(
-                    "Storage error for %s, will retry when space is available",
-                    video_path,
+            if self.ocr_pool is not None
+            else None
+        )
+        if batch is None:
+            self._mark_processed(str(report_path))
+            with self._report_model_in_use():
+                result = ingest_report(
+                    report_path,
+                    defaults=self.ingest_defaults,
+                    content_hash=self._take_content_hash(report_path),
+                    upload=upload,
                 )
-                self._unmark_processed(str(video_path))
-                return
-            logger.warning("Removing %s from processed set due to error", video_path)
-            self._unmark_processed(str(video_path))
+        else:
+            result = ingest_report(
+                report_path,
+                defaults=self.ingest_defaults,
+                content_hash=batch.content_hashes.get(str(report_path), ""),
+                center=batch.center,
+                imported_hashes=batch.imported_hashes,
+                upload=upload,
+            )
+        self._record_ingest_result(report_path, result)
 
-    def _process_report(self, report_path: Path) -> None:
+    def _imported_report_hashes(self, content_hashes: Iterable[str]) -> set[str]:
+        """Which of ``content_hashes`` are already imported, in one query."""
+        wanted = {content_hash for content_hash in content_hashes if content_hash}
+        if not wanted:
+            return set()
         try:
-            logger.info("Starting report processing: %s", report_path)
-            self._mark_processed(str(report_path))
-            if not is_intake_path(report_path):
-                raise ValueError(
-                    f"Report path is outside plaintext intake zone: {report_path}"
+            return set(
+                RawPdfFile.objects.filter(pdf_hash__in=wanted).values_list(
+                    "pdf_hash", flat=True
                 )
+            )
+        except Exception as exc:
+            logger.warning("Duplicate check failed for report batch: %s", exc)
+            return set()
 
+    def _submit_report_batch(self, items: list[BatchItem]) -> None:
+        try:
+            self.executor.lanes[LANE_REPORT].submit(self._process_report_batch, items)
+        except RuntimeError as exc:
+            # The lanes are shutting down; leave the files for the next run.
+            logger.info("Report batch of %s not started: %s", len(items), exc)
+            for item in items:
+                self._finish_file(item.path, item.lease_token)
+
+    def _process_report_batch(self, items: list[BatchItem]) -> None:
+        started = time.monotonic()
+        paths = [Path(item.path) for item in items]
+        try:
+            # Hashes are taken before the ledger transaction: lane workers
+            # hold ``files_lock`` while they consult the ledger.
+            content_hashes = {str(path): self._pop_content_hash(path) for path in paths}
+            with self.ledger.transaction():
+                for path in paths:
+                    self._mark_processed(str(path))
+                    self.ledger.set_content_hash(str(path), content_hashes[str(path)])
             try:
-                storage_root_path = storage_root_report_sensitive
-                storage_root_path.mkdir(parents=True, exist_ok=True)
-                if not storage_root_path.exists():
-                    raise InsufficientStorageError(
-                        f"Storage root does not exist: {storage_root_path}"
-                    )
-
-                source_center = self._resolve_default_center()
-                upload_job = process_watcher_file(
-                    file_path=report_path,
-                    file_type="report",
-                    center=source_center,
-                    source_system="watcher",
+                ensure_report_storage_root()
+                center = (
+                    self._resolve_default_center() if self.ocr_pool is None else None
                 )
-                if upload_job.is_complete:
-                    logger.info(
-                        "Report imported through shared hub ingest: %s",
-                        upload_job.id,
+            except Exception as exc:
+                logger.error("Report batch of %s failed: %s", len(items), exc)
+                for path in paths:
+                    outcome = (
+                        OUTCOME_DEFERRED
+                        if isinstance(exc, InsufficientStorageError)
+                        else OUTCOME_FAILED
                     )
-                    try:
-                        if report_path.exists():
-                            report_path.unlink()
-                    except Exception as exc:
-                        logger.error(
-                            "Error removing report file %s: %s", report_path, exc
-                        )
-                else:
-                    logger.info(
-                        "Report import skipped (already being processed): %s",
-                        report_path,
+                    self._unmark_processed(str(path), outcome=outcome, error=exc)
+                return
+            batch = ReportBatchContext(
+                center=center,
+                content_hashes=content_hashes,
+                imported_hashes=self._imported_report_hashes(content_hashes.values()),
+            )
+            with self._report_model_in_use():
+                for path in paths:
+                    self._run_ingest_measured(
+                        LANE_REPORT,
+                        path,
+                        lambda path=path: self._process_report(path, batch),
                     )
-                    self._unmark_processed(str(report_path))
-            except WatcherFileNotReadyError as not_ready_error:
-                logger.info(
-                    "Report watcher source is not ready yet, deferring: %s (%s)",
-                    report_path,
-                    not_ready_error,
-                )
-                self._unmark_processed(str(report_path))
-            except InsufficientStorageError as storage_error:
-                logger.error(
-                    "Insufficient storage space for %s: %s", report_path, storage_error
-                )
-                self._unmark_processed(str(report_path))
-            except Exception as import_error:
-                logger.error(
-                    "report import failed for %s: %s", report_path, import_error
-                )
-                self._unmark_processed(str(report_path))
-        except Exception as exc:
-            logger.error(
-                "Error processing report %s: %s", report_path, exc, exc_info=True
+        finally:
+            for item in items:
+                self._finish_file(item.path, item.lease_token)
+            elapsed = time.monotonic() - started
+            rate = len(items) / elapsed if elapsed > 0 else float(len(items))
+            self.metrics.report_batch_files_per_second.set(rate)
+            logger.info(
+                "Report batch of %s files finished in %.1fs (%.1f files/s)",
+                len(items),
+                elapsed,
+                rate,
             )
-            self._unmark_processed(str(report_path))
 
     def _process_pseudonymized(self, file_path: Path) -> None:
-        try:
-            logger.info("Starting pseudonymized processing: %s", file_path)
-            self._mark_processed(str(file_path))
-            if not is_intake_path(file_path):
-                raise ValueError(
-                    f"Pseudonymized path is outside plaintext intake zone: {file_path}"
-                )
-            process_preanonymized_watcher_file(file_path=file_path)
-            logger.info("Pseudonymized processing completed: %s", file_path)
-        except WatcherFileNotReadyError as not_ready_error:
-            logger.info(
-                "Pseudonymized watcher source is not ready yet, deferring: %s (%s)",
-                file_path,
-                not_ready_error,
-            )
-            self._unmark_processed(str(file_path))
-        except Exception as exc:
-            logger.error(
-                "Error processing pseudonymized file %s: %s",
-                file_path,
-                exc,
-                exc_info=True,
-            )
-            self._unmark_processed(str(file_path))
+        self._mark_processed(str(file_path))
+        upload = (
+            partial(self._run_in_ocr_pool, "pseudonymized")
+            if self.ocr_pool is not None
+            else None
+        )
+        self._record_ingest_result(
+            file_path, ingest_pseudonymized(file_path, upload=upload)
+        )
+
+    def _report_model_in_use(self) -> ContextManager[None]:
+        if self.model_residency is None:
+            return nullcontext()
+        return self.model_residency.in_use()
+
+    def _run_in_ocr_pool(self, kind: str, **kwargs) -> PooledUploadJob:
+        """Run one import in a warm OCR worker process."""
+        assert self.ocr_pool is not None
+        status, detail = self.ocr_pool.run(kind, **kwargs)
+        if status == RESULT_NOT_READY:
+            raise WatcherFileNotReadyError(detail)
+        if status == RESULT_NO_STORAGE:
+            raise InsufficientStorageError(detail)
+        return PooledUploadJob(id=detail, is_complete=status == RESULT_COMPLETE)
 
     def shutdown(self) -> None:
         logger.info("Shutting down file processor threads...")
+        self.coalescer.stop()
         self.executor.shutdown(wait=True)
+        if self.report_batcher is not None:
+            for item in self.report_batcher.stop():
+                self._finish_file(item.path, item.lease_token)
+        if self.ocr_pool is not None:
+            self.ocr_pool.shutdown()
+        self.claims.stop()
+        self.ledger.close()
         logger.info("File processor threads shut down")
 
 
@@ -876,6 +1667,15 @@ class FileWatcherService:
         self.video_dir = INTAKE_VIDEO_DIR
         self.report_dir = INTAKE_REPORT_DIR
         self.pseudonymized_dir = self.handler.pseudonymized_dir
+        self.scanner = IntakeScanner(ignore=should_ignore_file)
+        self._last_raw_events = 0
+        self._last_residency_counts = (0, 0, 0)
+        self.queue_snapshot_path = configured_queue_snapshot_path()
+        self.metrics_file = configured_metrics_file()
+        self.metrics_server: MetricsServer | None = None
+        self.handler.readiness.events_available = observer_emits_close_events(
+            self.observer
+        )
 
         self.video_dir.mkdir(parents=True, exist_ok=True)
         self.report_dir.mkdir(parents=True, exist_ok=True)
@@ -895,11 +1695,14 @@ class FileWatcherService:
                 self.handler, str(self.pseudonymized_dir), recursive=False
             )
             self.observer.start()
+            self._start_metrics_server()
             logger.info("File watcher service started successfully")
             logger.info("Monitoring: %s", self.video_dir)
             logger.info("Monitoring: %s", self.report_dir)
             logger.info("Monitoring: %s", self.pseudonymized_dir)
-            self.handler.executor.submit(self._process_existing_files)
+            # The scanner's cursors are not locked, so every scan runs on this
+            # thread: the startup scan first, then one per loop iteration.
+            self._process_existing_files()
 
             try:
                 while True:
@@ -938,8 +1741,21 @@ class FileWatcherService:
             self.observer.stop()
             self.observer.join()
             logger.info("File watcher service stopped")
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
         self.handler.shutdown()
 
+    def _start_metrics_server(self) -> None:
+        try:
+            self.metrics_server = configured_metrics_server(self.handler.metrics)
+            if self.metrics_server is not None:
+                self.metrics_server.start()
+        except OSError as exc:
+            # Metrics are optional; the watcher keeps running without them.
+            logger.error("Could not start watcher metrics server: %s", exc)
+            self.metrics_server = None
+
     def _validate_django_setup(self) -> None:
         from django.db import connection
 
@@ -949,78 +1765,33 @@ class FileWatcherService:
         EndoscopyProcessor.objects.first()
         logger.info("Django setup validation successful")
 
+    def _scan_roots(self) -> list[ScanRoot]:
+        return [
+            ScanRoot("video", self.video_dir, self.handler.video_extensions),
+            ScanRoot("report", self.report_dir, self.handler.report_extensions),
+            ScanRoot(
+                "pseudonymized file",
+                self.pseudonymized_dir,
+                self.handler.pseudonymized_extensions,
+            ),
+        ]
+
     def _process_existing_files(self) -> int:
-        # Only log if we actually find files we haven't seen yet
-        new_files_found = False
         submitted_count = 0
 
-        for video_file in self.video_dir.glob("*"):
-            if (
-                video_file.is_file()
-                and video_file.suffix.lower() in self.handler.video_extensions
-                and not should_ignore_file(video_file)
-            ):
-                path_str = str(video_file)
-                if (
-                    path_str in self.handler.processed_files
-                    or path_str in self.handler.in_flight_files
-                ):
-                    continue
-
-                if not new_files_found:
-                    logger.info("Processing existing files...")
-                    new_files_found = True
-
-                logger.info("Processing existing video: %s", video_file)
-                self.handler._submit_file(path_str)
-                submitted_count += 1
-
-        for report_file in self.report_dir.glob("*"):
-            if (
-                report_file.is_file()
-                and report_file.suffix.lower() in self.handler.report_extensions
-                and not should_ignore_file(report_file)
-            ):
-                path_str = str(report_file)
-                if (
-                    path_str in self.handler.processed_files
-                    or path_str in self.handler.in_flight_files
-                ):
-                    continue
-
-                if not new_files_found:
-                    logger.info("Processing existing files...")
-                    new_files_found = True
-
-                logger.info("Processing existing report: %s", report_file)
-                self.handler._submit_file(path_str)
-                submitted_count += 1
-
-        for pseudonymized_file in self.pseudonymized_dir.glob("*"):
-            if (
-                pseudonymized_file.is_file()
-                and pseudonymized_file.suffix.lower()
-                in self.handler.pseudonymized_extensions
-                and not should_ignore_file(pseudonymized_file)
-            ):
-                path_str = str(pseudonymized_file)
-                if (
-                    path_str in self.handler.processed_files
-                    or path_str in self.handler.in_flight_files
-                ):
-                    continue
-
-                if not new_files_found:
-                    logger.info("Processing existing files...")
-                    new_files_found = True
+        for candidate in self.scanner.scan(self._scan_roots()):
+            if self.handler.is_known_file(candidate.path, candidate.stat):
+                continue
+
+            # Only log if we actually find files we haven't seen yet
+            if not submitted_count:
+                logger.info("Processing existing files...")
 
-                logger.info(
-                    "Processing existing pseudonymized file: %s", pseudonymized_file
-                )
-                self.handler._submit_file(path_str)
-                submitted_count += 1
+            logger.info("Processing existing %s: %s", candidate.kind, candidate.path)
+            self.handler._submit_file(candidate.path)
+            submitted_count += 1
 
-        if new_files_found:
+        if submitted_count:
             logger.info("Existing files processing completed")
 
         return submitted_count
@@ -1028,7 +1799,11 @@ class FileWatcherService:
     def _health_check(self) -> None:
         if not self.observer.is_alive():
             logger.error("Observer thread died, restarting...")
+            self.handler.metrics.observer_restarts.inc()
             self.observer = Observer()
+            self.handler.readiness.events_available = observer_emits_close_events(
+                self.observer
+            )
             self.observer.schedule(self.handler, str(self.video_dir), recursive=False)
             self.observer.schedule(self.handler, str(self.report_dir), recursive=False)
             self.observer.schedule(
@@ -1056,6 +1831,96 @@ class FileWatcherService:
         except Exception as exc:
             logger.debug("Storage check failed: %s", exc)
 
+        try:
+            self.handler.ledger.compact_if_due()
+        except Exception as exc:
+            logger.warning("Watcher ledger compaction failed: %s", exc)
+
+        busy_lanes = [
+            f"{name}={lane.queued} queued/{lane.running} running"
+            for name, lane in self.handler.lane_snapshot().items()
+            if lane.queued or lane.running
+        ]
+        if busy_lanes:
+            logger.info("Watcher lanes: %s", ", ".join(busy_lanes))
+
+        self._write_queue_snapshot()
+        self._tick_model_residency()
+        self._sweep_working_copies()
+        self._write_metrics_file()
+
+        events = self.handler.coalescer.stats()
+        if events.raw_events != self._last_raw_events:
+            self._last_raw_events = events.raw_events
+            logger.info(
+                "Watcher events: %s raw, %s coalesced, %s pending",
+                events.raw_events,
+                events.coalesced_events,
+                events.pending,
+            )
+
+    def _write_metrics_file(self) -> None:
+        if self.metrics_file is None:
+            return
+        try:
+            self.handler.metrics.write_file(self.metrics_file)
+        except OSError as exc:
+            logger.warning("Could not write watcher metrics file: %s", exc)
+
+    def _sweep_working_copies(self) -> None:
+        working_copies = configured_working_copy_cache()
+        if working_copies is None:
+            return
+        try:
+            working_copies.sweep()
+        except Exception as exc:
+            logger.warning("Working copy sweep failed: %s", exc)
+
+    def _tick_model_residency(self) -> None:
+        residency = self.handler.model_residency
+        if residency is None:
+            return
+        report_lane = self.handler.lane_snapshot().get(LANE_REPORT)
+        pending_reports = (
+            report_lane.queued + report_lane.running if report_lane is not None else 0
+        )
+        try:
+            residency.tick(pending_reports=pending_reports)
+        except Exception as exc:
+            logger.warning("LLM model residency check failed: %s", exc)
+            return
+        stats = residency.stats()
+        counts = (stats.loads, stats.unloads, stats.load_failures)
+        if counts != self._last_residency_counts:
+            self._last_residency_counts = counts
+            logger.info(
+                "LLM model residency: loaded=%s loads=%s unloads=%s "
+                "failures=%s load_time=%.1fs",
+                stats.loaded,
+                stats.loads,
+                stats.unloads,
+                stats.load_failures,
+                stats.load_seconds,
+            )
+
+    def _write_queue_snapshot(self) -> None:
+        queued_files = getattr(self.handler.executor, "queued_files", None)
+        if not callable(queued_files):
+            return
+        try:
+            running, pending = queued_files()
+            write_queue_snapshot(
+                self.queue_snapshot_path,
+                workers={
+                    name: lane.max_workers
+                    for name, lane in self.handler.lane_snapshot().items()
+                },
+                running=running,
+                pending=pending,
+            )
+        except OSError as exc:
+            logger.warning("Could not write watcher queue snapshot: %s", exc)
+
 
 def run_file_watcher(*, process_existing_once: bool = False) -> None:
     logger.info("Starting File Watcher Service")
@@ -20,6 +20,7 @@ from .hub_export_audit import emit_hub_export_audit_event
 from .hub_export_cleanup import apply_completed_export_cleanup_policy
 from .hub_export_payloads import build_transfer_payload, validate_transfer_payload
 from ..models import OutboundHubTransferJob
+from ..storage.working_copies import configured_working_copy_cache
 
 _MULTIPART_UPLOAD_CHUNK_SIZE = 1024 * 1024
 
@@ -265,6 +266,13 @@ def _localized_processed_media_path(
 ) -> Iterator[tuple[Path, str]]:
     field_file, media_role = _processed_media_field(outbound_job)
     suffix = Path(str(field_file.name or "")).suffix or None
+    working_copies = configured_working_copy_cache()
+    if working_copies is not None:
+        with working_copies.acquire(
+            field_file.storage, field_file.name, suffix=suffix
+        ) as local_path:
+            yield local_path, media_role
+        return
     with ensure_local_file(field_file, suffix=suffix) as local_path:
         yield local_path, media_role
 
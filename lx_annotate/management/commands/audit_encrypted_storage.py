@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+from argparse import ArgumentParser, ArgumentTypeError
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from lx_annotate.storage.audit import AuditResult, AuditState, audit_file
+from lx_annotate.storage.encrypted import EncryptedStorage
+from lx_annotate.storage.encryption import load_master_key
+from lx_annotate.storage.vault_scan import (
+    MEBIBYTE,
+    ThroughputLimiter,
+    ThroughputMeter,
+    VaultEntry,
+    run_ordered,
+    skip_reason,
+    walk_vault,
+)
+
+
+def _sample_fraction(value: str) -> float:
+    fraction = float(value)
+    if not 0 < fraction <= 1:
+        raise ArgumentTypeError("sample must be in (0, 1]")
+    return fraction
+
+
+def default_state_path() -> Path:
+    from django.conf import settings
+
+    return Path(settings.APP_DATA_DIR) / "maintenance" / "storage_audit.sqlite3"
+
+
+def default_report_path() -> Path:
+    from django.conf import settings
+
+    return Path(settings.APP_DATA_DIR) / "maintenance" / "storage_audit_report.json"
+
+
+def _write_report(path: Path, report: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class Command(BaseCommand):
+    help = (
+        "Authenticate the AES-GCM chunks of encrypted managed payloads and "
+        "report corrupt files."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--path-prefix",
+            default="",
+            help="Optional managed-storage subtree to audit.",
+        )
+        parser.add_argument(
+            "--sample",
+            type=_sample_fraction,
+            default=1.0,
+            help=(
+                "Fraction of chunks to authenticate per file (default: 1, every "
+                "chunk). The first and last chunk are always included."
+            ),
+        )
+        parser.add_argument(
+            "--seed",
+            default=None,
+            help="Seed for chunk sampling; random per run when omitted.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Files audited in parallel (default: 4).",
+        )
+        parser.add_argument(
+            "--max-mb-per-second",
+            type=float,
+            default=0.0,
+            help="Cap on combined ciphertext read rate; 0 means no cap.",
+        )
+        parser.add_argument(
+            "--state",
+            default=None,
+            help=(
+                "SQLite record of verified files (default: "
+                "<APP_DATA_DIR>/maintenance/storage_audit.sqlite3)."
+            ),
+        )
+        parser.add_argument(
+            "--report",
+            default=None,
+            help=(
+                "JSON report path (default: "
+                "<APP_DATA_DIR>/maintenance/storage_audit_report.json)."
+            ),
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Audit files again even if they are unchanged since they passed.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        storage = default_storage
+        if not isinstance(storage, EncryptedStorage):
+            raise CommandError(
+                "Encrypted storage is not active. Current default storage is "
+                f"{storage.__class__.__module__}.{storage.__class__.__name__}."
+            )
+
+        root = Path(storage.location).resolve()
+        path_prefix = str(options["path_prefix"]).strip().strip("/")
+        scan_root = (root / path_prefix).resolve() if path_prefix else root
+
+        if root != scan_root and root not in scan_root.parents:
+            raise CommandError(
+                f"path-prefix '{path_prefix}' escapes the managed storage root {root}"
+            )
+
+        if not scan_root.exists():
+            raise CommandError(f"Managed storage path does not exist: {scan_root}")
+
+        master_key = load_master_key()
+        fraction = float(options["sample"])
+        seed = options.get("seed") or os.urandom(8).hex()
+        workers = max(int(options.get("workers") or 1), 1)
+        limiter = ThroughputLimiter(
+            float(options.get("max_mb_per_second") or 0) * MEBIBYTE
+        )
+        state = AuditState(options.get("state") or default_state_path())
+        report_path = Path(options.get("report") or default_report_path())
+        full = bool(options.get("full"))
+
+        counters = {"checked": 0, "unchanged": 0, "skipped": 0, "chunks": 0}
+        corrupt: list[dict] = []
+        unencrypted: list[str] = []
+        meter = ThroughputMeter()
+        started_at = _now()
+
+        def pending_entries():
+            for entry in walk_vault(root, scan_root):
+                if entry.is_symlink or skip_reason(entry.relative_name):
+                    counters["skipped"] += 1
+                elif not full and state.is_verified(
+                    entry.path,
+                    size=entry.size,
+                    mtime_ns=entry.mtime_ns,
+                    fraction=fraction,
+                ):
+                    counters["unchanged"] += 1
+                else:
+                    yield entry
+
+        def audit(entry: VaultEntry) -> AuditResult | None:
+            if not storage.is_encrypted(entry.relative_name):
+                return None
+            return audit_file(
+                storage,
+                entry.relative_name,
+                master_key=master_key,
+                fraction=fraction,
+                rng=random.Random(f"{seed}:{entry.relative_name}"),
+                limiter=limiter,
+            )
+
+        try:
+            for entry, future in run_ordered(audit, pending_entries(), workers=workers):
+                result = future.result()
+                if result is None:
+                    unencrypted.append(entry.relative_name)
+                    self.stdout.write(f"Not encrypted: {entry.relative_name}")
+                    continue
+                counters["checked"] += 1
+                counters["chunks"] += result.checked_chunks
+                meter.add(result.bytes_read)
+                if result.ok:
+                    state.record(
+                        entry.path,
+                        size=entry.size,
+                        mtime_ns=entry.mtime_ns,
+                        fraction=fraction,
+                    )
+                    continue
+                state.forget(entry.path)
+                corrupt.append(
+                    {
+                        "name": entry.relative_name,
+                        "chunk": result.chunk,
+                        "error": result.error,
+                    }
+                )
+                self.stderr.write(
+                    f"Corrupt encrypted payload: {entry.relative_name}: {result.error}"
+                )
+            state.prune()
+        finally:
+            state.close()
+
+        _write_report(
+            report_path,
+            {
+                "root": str(scan_root),
+                "started_at": started_at,
+                "finished_at": _now(),
+                "sample_fraction": fraction,
+                "seed": seed,
+                "files_checked": counters["checked"],
+                "files_unchanged": counters["unchanged"],
+                "files_skipped": counters["skipped"],
+                "chunks_checked": counters["chunks"],
+                "bytes_read": meter.bytes,
+                "corrupt": corrupt,
+                "unencrypted": unencrypted,
+            },
+        )
+
+        summary = (
+            f"Encrypted storage audit complete. checked={counters['checked']} "
+            f"unchanged={counters['unchanged']} skipped={counters['skipped']} "
+            f"unencrypted={len(unencrypted)} corrupt={len(corrupt)} "
+            f"chunks={counters['chunks']} root={scan_root} report={report_path} "
+            f"{meter.summary()}"
+        )
+        if corrupt:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
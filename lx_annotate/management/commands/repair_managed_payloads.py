@@ -7,32 +7,55 @@ from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand, CommandError
 
 from lx_annotate.storage.encrypted import EncryptedStorage
+from lx_annotate.storage.vault_scan import (
+    ScanCheckpoint,
+    ThroughputMeter,
+    VaultEntry,
+    run_ordered,
+    skip_reason,
+    walk_vault,
+)
 
-DERIVED_OR_TEMP_DIR_NAMES = {
-    ".lx-annotate-rsync-partial",
-    "_processing",
-    "streamable_videos",
-    "transcoding",
-}
+OUTCOME_ENCRYPTED = "already_encrypted"
+OUTCOME_REPAIRED = "repaired"
+OUTCOME_WOULD_REPAIR = "would_repair"
+OUTCOME_SYMLINK = "symlink"
 
 
-def _skip_reason(relative_name: str) -> str | None:
-    """
-    Return why a managed-storage path must not be repaired in place.
+class CorruptPayloadError(Exception):
+    pass
 
-    FieldFile payloads are canonical encrypted storage. Streamable files are
-    explicit protected plaintext artifacts for nginx and must never be rewritten
-    by this command. Temporary/partial files are not canonical payloads either.
-    """
-    relative_path = Path(relative_name)
-    if any(part in DERIVED_OR_TEMP_DIR_NAMES for part in relative_path.parts):
-        return "derived_or_temp_directory"
 
-    name = relative_path.name
-    if name.startswith(".") or name.startswith("~") or name.endswith(".tmp"):
-        return "temporary_artifact"
+def _check_payload(storage, entry: VaultEntry, *, dry_run: bool) -> str:
+    """
+    Classify one walked entry and repair it unless ``dry_run``.
 
-    return None
+    Returns an outcome constant or a ``skip_reason``. Runs on worker threads,
+    so it must not write to stdout.
+    """
+    if entry.is_symlink:
+        return OUTCOME_SYMLINK
+    reason = skip_reason(entry.relative_name)
+    if reason is not None:
+        return reason
+    relative_name = entry.relative_name
+    if storage.is_encrypted(relative_name):
+        try:
+            storage.get_plaintext_size(relative_name)
+        except Exception as exc:
+            raise CorruptPayloadError(str(exc)) from exc
+        return OUTCOME_ENCRYPTED
+    if dry_run:
+        return OUTCOME_WOULD_REPAIR
+    storage.repair_plaintext_file(relative_name)
+    return OUTCOME_REPAIRED
+
+
+def default_checkpoint_path() -> Path:
+    from django.conf import settings
+
+    # Outside APP_STORAGE_DIR so the checkpoint is never scanned as a payload.
+    return Path(settings.APP_DATA_DIR) / "maintenance" / "repair_managed_payloads.json"
 
 
 class Command(BaseCommand):
@@ -52,6 +75,25 @@ class Command(BaseCommand):
             action="store_true",
             help="Report plaintext files that would be repaired without rewriting them.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Files checked or repaired in parallel (default: 4).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help=(
+                "Progress file for resumable runs (default: "
+                "<APP_DATA_DIR>/maintenance/repair_managed_payloads.json)."
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted run from its checkpoint.",
+        )
 
     def handle(self, *args, **options) -> None:
         storage = default_storage
@@ -74,48 +116,86 @@ class Command(BaseCommand):
             raise CommandError(f"Managed storage path does not exist: {scan_root}")
 
         dry_run = bool(options["dry_run"])
-        repaired = 0
-        already_encrypted = 0
-        skipped = 0
-
-        for path in sorted(scan_root.rglob("*")):
-            if path.is_symlink():
-                skipped += 1
-                self.stdout.write(f"Skipping symlink: {path}")
-                continue
-            if not path.is_file():
-                continue
-
-            relative_name = path.relative_to(root).as_posix()
-            reason = _skip_reason(relative_name)
-            if reason is not None:
-                skipped += 1
-                self.stdout.write(f"Skipping {reason}: {relative_name}")
-                continue
-
-            if storage.is_encrypted(relative_name):
+        workers = max(int(options.get("workers") or 1), 1)
+        checkpoint = ScanCheckpoint(
+            options.get("checkpoint") or default_checkpoint_path(),
+            scope={
+                "command": "repair_managed_payloads",
+                "root": str(root),
+                "path_prefix": path_prefix,
+                "dry_run": dry_run,
+            },
+        )
+        counters = {"repaired": 0, "already_encrypted": 0, "skipped": 0}
+        position = ""
+        if options.get("resume"):
+            saved = checkpoint.load()
+            if saved is None:
+                raise CommandError(f"No matching checkpoint at {checkpoint.path}")
+            position, saved_counters = saved
+            counters.update(saved_counters)
+            self.stdout.write(f"Resuming after: {position or '<start>'}")
+
+        meter = ThroughputMeter()
+        results = run_ordered(
+            lambda entry: _check_payload(storage, entry, dry_run=dry_run),
+            walk_vault(root, scan_root, resume_after=position),
+            workers=workers,
+        )
+        try:
+            for entry, future in results:
                 try:
-                    storage.get_plaintext_size(relative_name)
-                except Exception as exc:
+                    outcome = future.result()
+                except CorruptPayloadError as exc:
+                    self._stop(checkpoint, position, counters)
                     raise CommandError(
                         "Encrypted managed payload is corrupt and was not repaired: "
-                        f"{relative_name}: {exc}"
+                        f"{entry.relative_name}: {exc}"
                     ) from exc
-                already_encrypted += 1
-                continue
-
-            if dry_run:
-                repaired += 1
-                self.stdout.write(f"Would repair plaintext payload: {relative_name}")
-                continue
-
-            storage.repair_plaintext_file(relative_name)
-            repaired += 1
-            self.stdout.write(f"Repaired plaintext payload: {relative_name}")
+                except Exception:
+                    self._stop(checkpoint, position, counters)
+                    raise
+                if outcome == OUTCOME_SYMLINK:
+                    counters["skipped"] += 1
+                    self.stdout.write(f"Skipping symlink: {entry.path}")
+                elif outcome == OUTCOME_ENCRYPTED:
+                    meter.add(entry.size)
+                    counters["already_encrypted"] += 1
+                elif outcome == OUTCOME_WOULD_REPAIR:
+                    meter.add(entry.size)
+                    counters["repaired"] += 1
+                    self.stdout.write(
+                        f"Would repair plaintext payload: {entry.relative_name}"
+                    )
+                elif outcome == OUTCOME_REPAIRED:
+                    meter.add(entry.size)
+                    counters["repaired"] += 1
+                    self.stdout.write(
+                        f"Repaired plaintext payload: {entry.relative_name}"
+                    )
+                else:
+                    counters["skipped"] += 1
+                    self.stdout.write(f"Skipping {outcome}: {entry.relative_name}")
+                position = entry.relative_name
+                checkpoint.save(position, counters)
+        except KeyboardInterrupt:
+            self._stop(checkpoint, position, counters)
+            raise CommandError(
+                f"Interrupted; rerun with --resume to continue after {position}"
+            )
+        finally:
+            results.close()
+        checkpoint.clear()
 
         summary = (
-            f"Managed payload repair complete. repaired={repaired} "
-            f"already_encrypted={already_encrypted} skipped={skipped} "
-            f"root={scan_root}"
+            f"Managed payload repair complete. repaired={counters['repaired']} "
+            f"already_encrypted={counters['already_encrypted']} "
+            f"skipped={counters['skipped']} "
+            f"root={scan_root} {meter.summary()}"
         )
         self.stdout.write(self.style.SUCCESS(summary))
+
+    @staticmethod
+    def _stop(checkpoint: ScanCheckpoint, position: str, counters: dict) -> None:
+        if position:
+            checkpoint.save(position, counters, force=True)
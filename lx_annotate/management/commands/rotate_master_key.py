@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import threading
+from argparse import ArgumentParser
+from pathlib import Path
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from lx_annotate.storage.audit import audit_file
+from lx_annotate.storage.encrypted import EncryptedStorage
+from lx_annotate.storage.encryption import load_master_key
+from lx_annotate.storage.key_rotation import (
+    OUTCOME_CURRENT,
+    OUTCOME_REENCRYPTED,
+    OUTCOME_WOULD_REENCRYPT,
+    KeyRotationError,
+    RotationVerificationError,
+    decode_master_key,
+    key_id,
+    rotate_file,
+)
+from lx_annotate.storage.vault_scan import (
+    ScanCheckpoint,
+    ThroughputMeter,
+    VaultEntry,
+    run_ordered,
+    skip_reason,
+    walk_vault,
+)
+
+OUTCOME_SKIPPED = "skipped"
+
+
+class RotationAborted(Exception):
+    pass
+
+
+def default_maintenance_dir() -> Path:
+    from django.conf import settings
+
+    return Path(settings.APP_DATA_DIR) / "maintenance"
+
+
+def _read_key_file(path: str) -> bytes:
+    try:
+        return decode_master_key(Path(path).expanduser().read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise CommandError(f"Cannot read key file {path}: {exc}") from exc
+    except KeyRotationError as exc:
+        raise CommandError(f"Invalid key in {path}: {exc}") from exc
+
+
+class _FirstWriteGate:
+    """
+    Serialises writes until one re-encrypted file has been read back.
+
+    If the storage backend cannot open the first copy with the new key, the
+    original is kept and the rotation stops before any other file is touched.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.passed = False
+        self.failed = False
+
+
+class Command(BaseCommand):
+    help = (
+        "Rotate the storage master key by re-encrypting each encrypted file "
+        "under a fresh data key wrapped with the new master key."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--old-key-file",
+            required=True,
+            help="File holding the previous urlsafe-base64 master key.",
+        )
+        parser.add_argument(
+            "--new-key-file",
+            default=None,
+            help="File holding the new master key (default: the configured key).",
+        )
+        parser.add_argument(
+            "--path-prefix",
+            default="",
+            help="Optional managed-storage subtree to rotate.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count files that would be re-encrypted without writing them.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Files re-encrypted in parallel (default: 8).",
+        )
+        parser.add_argument(
+            "--verify-all",
+            action="store_true",
+            help=(
+                "Read every re-encrypted file back with the new key before it "
+                "replaces the original. By default only the first one is read back."
+            ),
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=None,
+            help=(
+                "Progress file for resumable runs (default: "
+                "<APP_DATA_DIR>/maintenance/rotate_master_key.json)."
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted run from its checkpoint.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        storage = default_storage
+        if not isinstance(storage, EncryptedStorage):
+            raise CommandError(
+                "Encrypted storage is not active. Current default storage is "
+                f"{storage.__class__.__module__}.{storage.__class__.__name__}."
+            )
+
+        root = Path(storage.location).resolve()
+        path_prefix = str(options["path_prefix"]).strip().strip("/")
+        scan_root = (root / path_prefix).resolve() if path_prefix else root
+
+        if root != scan_root and root not in scan_root.parents:
+            raise CommandError(
+                f"path-prefix '{path_prefix}' escapes the managed storage root {root}"
+            )
+
+        if not scan_root.exists():
+            raise CommandError(f"Managed storage path does not exist: {scan_root}")
+
+        old_key = _read_key_file(options["old_key_file"])
+        new_key = (
+            _read_key_file(options["new_key_file"])
+            if options.get("new_key_file")
+            else load_master_key()
+        )
+        if old_key == new_key:
+            raise CommandError("The old and the new master key are the same.")
+
+        dry_run = bool(options["dry_run"])
+        verify_all = bool(options.get("verify_all"))
+        workers = max(int(options.get("workers") or 1), 1)
+        maintenance_dir = default_maintenance_dir()
+
+        checkpoint = ScanCheckpoint(
+            options.get("checkpoint") or maintenance_dir / "rotate_master_key.json",
+            scope={
+                "command": "rotate_master_key",
+                "root": str(root),
+                "path_prefix": path_prefix,
+                "old_key": key_id(old_key),
+                "new_key": key_id(new_key),
+                "dry_run": dry_run,
+            },
+        )
+        counters = {"reencrypted": 0, "already_current": 0, "skipped": 0, "failed": 0}
+        position = ""
+        if options.get("resume"):
+            saved = checkpoint.load()
+            if saved is None:
+                raise CommandError(f"No matching checkpoint at {checkpoint.path}")
+            position, saved_counters = saved
+            counters.update(saved_counters)
+            self.stdout.write(f"Resuming after: {position or '<start>'}")
+
+        gate = _FirstWriteGate()
+
+        def readable_with_new_key(path: Path) -> bool:
+            # fraction=0 reads only the first and the last chunk.
+            name = path.relative_to(root).as_posix()
+            return audit_file(storage, name, master_key=new_key, fraction=0).ok
+
+        def rotate(entry: VaultEntry, verify: bool) -> str:
+            return rotate_file(
+                entry.path,
+                old_key,
+                new_key,
+                dry_run=dry_run,
+                verify=readable_with_new_key if verify else None,
+            )
+
+        def process(entry: VaultEntry) -> str:
+            if entry.is_symlink or skip_reason(entry.relative_name):
+                return OUTCOME_SKIPPED
+            if not storage.is_encrypted(entry.relative_name):
+                return OUTCOME_SKIPPED
+            if gate.passed or dry_run:
+                return rotate(entry, verify_all)
+            with gate.lock:
+                if gate.failed:
+                    raise RotationAborted("an earlier file failed verification")
+                if not gate.passed:
+                    try:
+                        outcome = rotate(entry, True)
+                    except RotationVerificationError as exc:
+                        gate.failed = True
+                        raise RotationAborted(str(exc)) from exc
+                    gate.passed = outcome == OUTCOME_REENCRYPTED
+                    return outcome
+            return rotate(entry, verify_all)
+
+        meter = ThroughputMeter()
+        results = run_ordered(
+            process,
+            walk_vault(root, scan_root, resume_after=position),
+            workers=workers,
+        )
+        try:
+            for entry, future in results:
+                try:
+                    outcome = future.result()
+                except RotationAborted as exc:
+                    self._stop(checkpoint, position, counters)
+                    raise CommandError(f"Key rotation stopped: {exc}") from exc
+                except KeyRotationError as exc:
+                    counters["failed"] += 1
+                    self.stderr.write(f"Cannot rotate {entry.relative_name}: {exc}")
+                    outcome = None
+                except Exception:
+                    self._stop(checkpoint, position, counters)
+                    raise
+                if outcome == OUTCOME_SKIPPED:
+                    counters["skipped"] += 1
+                elif outcome == OUTCOME_CURRENT:
+                    meter.add(entry.size)
+                    counters["already_current"] += 1
+                elif outcome in (OUTCOME_REENCRYPTED, OUTCOME_WOULD_REENCRYPT):
+                    meter.add(entry.size)
+                    counters["reencrypted"] += 1
+                position = entry.relative_name
+                checkpoint.save(position, counters)
+        except KeyboardInterrupt:
+            self._stop(checkpoint, position, counters)
+            raise CommandError(
+                f"Interrupted; rerun with --resume to continue after {position}"
+            )
+        finally:
+            results.close()
+        checkpoint.clear()
+
+        label = "would_reencrypt" if dry_run else "reencrypted"
+        summary = (
+            f"Master key rotation complete. {label}={counters['reencrypted']} "
+            f"already_current={counters['already_current']} "
+            f"skipped={counters['skipped']} failed={counters['failed']} "
+            f"new_key={key_id(new_key)} root={scan_root} {meter.summary()}"
+        )
+        if counters["failed"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    @staticmethod
+    def _stop(checkpoint: ScanCheckpoint, position: str, counters: dict) -> None:
+        if position:
+            checkpoint.save(position, counters, force=True)
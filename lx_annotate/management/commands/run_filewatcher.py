@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import struct
 import subprocess
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from itertools import chain
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
@@ -8,6 +12,22 @@ from django.core.files import File
 from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand, CommandError
 
+from lx_annotate.storage.parallel import iter_parallel_decrypted_chunks
+from lx_annotate.storage.read_ahead import DEFAULT_BLOCK_SIZE, ReadAheadFile
+from lx_annotate.storage.working_copies import configured_working_copy_cache
+from lx_annotate.watcher.settings import env_bool, env_int
+
+# Below this size the read-ahead thread costs more than the overlap saves.
+READ_AHEAD_MIN_BYTES = 8 * 1024 * 1024
+# Decrypted prefix inspected to decide whether FFmpeg can read from a pipe.
+FFMPEG_PROBE_BYTES = 64 * 1024
+MP4_SUFFIXES = {".3gp", ".m4v", ".mov", ".mp4"}
+
+
+def configured_read_ahead_depth() -> int:
+    """Intake chunks read ahead of the storage backend; ``0`` disables it."""
+    return env_int("WATCHER_INTAKE_READ_AHEAD_CHUNKS", 4, minimum=0)
+
 
 def process_intake_file(
     intake_file: str | Path,
@@ -20,7 +40,8 @@ def process_intake_file(
 
     The intake file is allowed to be a raw filesystem path because it lives in the
     plaintext intake zone. Once saved through Django storage, the original intake
-    file is deleted.
+    file is deleted. Large files are read ahead on a background thread so disk
+    reads overlap with the storage backend's encryption and writes.
     """
     storage = storage_backend or default_storage
     intake_path = Path(intake_file)
@@ -28,8 +49,20 @@ def process_intake_file(
         raise FileNotFoundError(f"Intake file not found: {intake_path}")
 
     destination_name = target_name or intake_path.name
+    depth = configured_read_ahead_depth()
     with intake_path.open("rb") as handle:
-        saved_name = storage.save(destination_name, File(handle, name=destination_name))
+        if depth and intake_path.stat().st_size >= READ_AHEAD_MIN_BYTES:
+            block_size = getattr(storage, "chunk_size", None) or DEFAULT_BLOCK_SIZE
+            with ReadAheadFile(
+                handle, block_size=block_size, depth=depth, name=destination_name
+            ) as reader:
+                saved_name = storage.save(
+                    destination_name, File(reader, name=destination_name)
+                )
+        else:
+            saved_name = storage.save(
+                destination_name, File(handle, name=destination_name)
+            )
 
     intake_path.unlink(missing_ok=False)
     return saved_name
@@ -40,14 +73,18 @@ def stream_managed_file_chunks(
     *,
     storage_backend=None,
     chunk_size: int = 1024 * 1024,
+    workers: int | None = None,
 ):
     """
     Yield decrypted managed-media chunks without performing unbounded reads.
+
+    ``workers`` decrypts chunks of the file in parallel; it defaults to
+    ``LX_ANNOTATE_STORAGE_CRYPTO_WORKERS``.
     """
     storage = storage_backend or default_storage
-    with storage.open(storage_name, "rb") as handle:
-        for chunk in handle.chunks(chunk_size):
-            yield chunk
+    yield from iter_parallel_decrypted_chunks(
+        storage, storage_name, workers=workers, chunk_size=chunk_size
+    )
 
 
 def extract_frames_with_ffmpeg(
@@ -55,12 +92,36 @@ def extract_frames_with_ffmpeg(
     *,
     storage_backend=None,
     ffmpeg_args: list[str] | None = None,
+    streaming: bool | None = None,
 ) -> None:
     """
-    Materialize managed media into a short-lived temp file for FFmpeg.
+    Run FFmpeg on managed media without leaving plaintext behind.
+
+    By default the decrypted chunks are piped into FFmpeg's stdin, so no temp
+    space is needed and decoding starts with the first chunk. MP4/MOV files
+    whose ``moov`` atom sits after ``mdat`` cannot be decoded from a pipe; they,
+    and every file when ``streaming`` is false (``WATCHER_FFMPEG_STDIN=0``), are
+    materialized into a short-lived temp file. With
+    ``LX_ANNOTATE_WORKING_COPY_CACHE_MB`` set, that fallback reads a shared
+    working copy instead, so repeated runs on one video decrypt it once.
     """
     storage = storage_backend or default_storage
     suffix = Path(storage_name).suffix or ".bin"
+    if streaming is None:
+        streaming = configured_ffmpeg_streaming()
+    if streaming:
+        chunks = stream_managed_file_chunks(storage_name, storage_backend=storage)
+        with closing(chunks):
+            head = _peek_chunks(chunks, FFMPEG_PROBE_BYTES)
+            if _pipe_friendly(suffix, b"".join(head)):
+                _pipe_to_ffmpeg(chain(head, chunks), ffmpeg_args)
+                return
+
+    working_copies = configured_working_copy_cache()
+    if working_copies is not None:
+        with working_copies.acquire(storage, storage_name, suffix=suffix) as path:
+            _run_ffmpeg(path, ffmpeg_args)
+        return
     with NamedTemporaryFile(
         prefix="lx_annotate_tmp_",
         suffix=suffix,
@@ -74,15 +135,95 @@ def extract_frames_with_ffmpeg(
             ):
                 tmp_file.write(chunk)
             tmp_file.flush()
-
-            command = ["ffmpeg", "-i", str(tmp_path)]
-            if ffmpeg_args:
-                command.extend(ffmpeg_args)
-            subprocess.run(command, check=True)
+            _run_ffmpeg(tmp_path, ffmpeg_args)
         finally:
             tmp_path.unlink(missing_ok=True)
 
 
+def configured_ffmpeg_streaming() -> bool:
+    return env_bool("WATCHER_FFMPEG_STDIN", True)
+
+
+def mp4_moov_before_mdat(head: bytes) -> bool | None:
+    """
+    Walk the top-level boxes of an ISO-BMFF file prefix.
+
+    Returns ``True`` when ``moov`` comes before ``mdat`` (decodable from a
+    pipe), ``False`` when ``mdat`` comes first, and ``None`` when ``head`` is
+    not enough to tell or is not an MP4 box structure.
+    """
+    offset = 0
+    while offset + 8 <= len(head):
+        size, kind = struct.unpack_from(">I4s", head, offset)
+        if any(byte < 0x20 or byte > 0x7E for byte in kind):
+            return None
+        if kind == b"moov":
+            return True
+        if kind == b"mdat":
+            return False
+        header_size = 8
+        if size == 1:
+            if offset + 16 > len(head):
+                return None
+            size = struct.unpack_from(">Q", head, offset + 8)[0]
+            header_size = 16
+        if size < header_size:
+            # Zero means "to the end of the file"; anything else is corrupt.
+            return None
+        offset += size
+    return None
+
+
+def _pipe_friendly(suffix: str, head: bytes) -> bool:
+    if suffix.lower() not in MP4_SUFFIXES:
+        return True
+    return mp4_moov_before_mdat(head) is True
+
+
+def _peek_chunks(chunks: Iterator[bytes], minimum: int) -> list[bytes]:
+    head: list[bytes] = []
+    buffered = 0
+    for chunk in chunks:
+        head.append(chunk)
+        buffered += len(chunk)
+        if buffered >= minimum:
+            break
+    return head
+
+
+def _pipe_to_ffmpeg(chunks: Iterable[bytes], ffmpeg_args: list[str] | None) -> None:
+    command = ["ffmpeg", "-i", "pipe:0"]
+    if ffmpeg_args:
+        command.extend(ffmpeg_args)
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    assert process.stdin is not None
+    try:
+        for chunk in chunks:
+            try:
+                process.stdin.write(chunk)
+            except BrokenPipeError:
+                # FFmpeg stops reading once it has what it needs (-frames:v 1).
+                break
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    returncode = process.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+def _run_ffmpeg(input_path: Path, ffmpeg_args: list[str] | None) -> None:
+    command = ["ffmpeg", "-i", str(input_path)]
+    if ffmpeg_args:
+        command.extend(ffmpeg_args)
+    subprocess.run(command, check=True)
+
+
 class Command(BaseCommand):
     help = "Run the lx-annotate file watcher service."
 
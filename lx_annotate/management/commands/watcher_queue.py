@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import time
+from argparse import ArgumentParser
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lx_annotate.watcher.priority import (
+    MEBIBYTE,
+    configured_queue_snapshot_path,
+    estimate_start_times,
+    read_queue_snapshot,
+)
+
+STALE_SNAPSHOT_SECONDS = 60
+
+
+def _duration(seconds: float) -> str:
+    seconds = max(int(seconds), 0)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the files waiting in the file watcher lanes with estimated start times."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--snapshot",
+            default="",
+            help="Queue snapshot written by the watcher; defaults to "
+            "WATCHER_QUEUE_SNAPSHOT_PATH or <APP_DATA_DIR>/watcher/queue.json.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the schedule as JSON.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        snapshot_path = (
+            Path(str(options["snapshot"]))
+            if options.get("snapshot")
+            else configured_queue_snapshot_path()
+        )
+        try:
+            snapshot = read_queue_snapshot(snapshot_path)
+        except FileNotFoundError as exc:
+            raise CommandError(
+                f"No watcher queue snapshot at {snapshot_path}; is the file "
+                "watcher running?"
+            ) from exc
+        except (OSError, ValueError, TypeError) as exc:
+            raise CommandError(f"Unreadable watcher queue snapshot: {exc}") from exc
+
+        now = time.time()
+        schedule = estimate_start_times(
+            workers=snapshot.get("workers", {}),
+            running=snapshot["running"],
+            pending=snapshot["pending"],
+            now=now,
+        )
+
+        if options.get("json"):
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "generated_at": snapshot.get("generated_at"),
+                        "running": [asdict(item) for item in snapshot["running"]],
+                        "pending": [
+                            {
+                                **asdict(item.queued),
+                                "position": item.position,
+                                "estimated_start": item.estimated_start,
+                            }
+                            for item in schedule
+                        ],
+                    },
+                    indent=2,
+                )
+            )
+            return
+
+        age = now - float(snapshot.get("generated_at") or 0)
+        self.stdout.write(
+            f"Watcher queue snapshot {snapshot_path} ({_duration(age)} old)"
+        )
+        if age > STALE_SNAPSHOT_SECONDS:
+            self.stdout.write(
+                self.style.WARNING("Snapshot is stale; the watcher may not be running.")
+            )
+
+        for item in snapshot["running"]:
+            started_at = item.started_at or now
+            self.stdout.write(
+                f"  running  {item.lane:<14} {item.kind:<7} "
+                f"{item.size / MEBIBYTE:>9.1f} MB  "
+                f"for {_duration(now - started_at):<8} {item.path}"
+            )
+        if not schedule:
+            self.stdout.write(self.style.SUCCESS("No files waiting."))
+            return
+
+        self.stdout.write(
+            f"  {'#':>4}  {'lane':<14} {'kind':<7} {'size':>12}  "
+            f"{'waited':<8} {'starts':<17} path"
+        )
+        for item in schedule:
+            queued = item.queued
+            clock = datetime.fromtimestamp(item.estimated_start).strftime("%H:%M:%S")
+            starts = f"{clock} (+{_duration(item.estimated_start - now)})"
+            self.stdout.write(
+                f"  {item.position:>4}  {queued.lane:<14} {queued.kind:<7} "
+                f"{queued.size / MEBIBYTE:>9.1f} MB  "
+                f"{_duration(now - queued.submitted_at):<8} {starts:<17} "
+                f"{queued.path}"
+            )
@@ -230,6 +230,27 @@ ENDOREG_HUB_TRANSFER_MAX_UPLOAD_BYTES = max(
     int(os.getenv("ENDOREG_HUB_TRANSFER_MAX_UPLOAD_BYTES", str(50 * 1024**3))),
     1,
 )
+# Threads used to decrypt spans of managed files in parallel; 1 reads sequentially.
+LX_ANNOTATE_STORAGE_CRYPTO_WORKERS = max(
+    int(os.getenv("LX_ANNOTATE_STORAGE_CRYPTO_WORKERS", "1")),
+    1,
+)
+# Sidecar SQLite store of encrypted-file chunk indexes; empty uses APP_DATA_DIR.
+LX_ANNOTATE_CHUNK_INDEX_PATH = str(
+    os.getenv("LX_ANNOTATE_CHUNK_INDEX_PATH", "") or ""
+).strip()
+# Shared decrypted working copies for ffmpeg and hub uploads; 0 MB disables.
+LX_ANNOTATE_WORKING_COPY_CACHE_MB = max(
+    int(os.getenv("LX_ANNOTATE_WORKING_COPY_CACHE_MB", "0")),
+    0,
+)
+LX_ANNOTATE_WORKING_COPY_DIR = str(
+    os.getenv("LX_ANNOTATE_WORKING_COPY_DIR", "") or ""
+).strip()
+LX_ANNOTATE_WORKING_COPY_TTL_SECONDS = max(
+    int(os.getenv("LX_ANNOTATE_WORKING_COPY_TTL_SECONDS", "600")),
+    0,
+)
 LX_ANNOTATE_HUB_EXPORT_AUTO_QUEUE = os.getenv(
     "LX_ANNOTATE_HUB_EXPORT_AUTO_QUEUE", "0"
 ).strip().lower() in {"1", "true", "yes", "on"}
@@ -350,6 +371,10 @@ CELERY_TASK_ROUTES = {
         "queue": CELERY_PIPELINE_QUEUE,
         "routing_key": CELERY_PIPELINE_QUEUE,
     },
+    "lx_annotate.ingest_watcher_file": {
+        "queue": CELERY_PIPELINE_QUEUE,
+        "routing_key": CELERY_PIPELINE_QUEUE,
+    },
     "endoreg_db.refresh_audit_ledger_integrity_status": {
         "queue": CELERY_MAINTENANCE_QUEUE,
         "routing_key": CELERY_MAINTENANCE_QUEUE,
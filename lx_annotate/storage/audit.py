@@ -0,0 +1,238 @@
+"""Authenticate stored ciphertext across the managed-storage vault.
+
+``verify_encrypted_storage`` proves that new writes are encrypted, but says
+nothing about payloads already on disk. Bit rot, truncated copies or a
+restore from a damaged backup only show up when someone opens the file. The
+audit authenticates every chunk record of a file, or a random sample of them,
+with ``iter_decrypted_byte_range``, so AES-GCM checks the tag of each record
+in the selected plaintext ranges and any failure marks the file corrupt.
+
+The framing walk runs first, so a broken length prefix is reported before
+anything is decrypted. Every read, the walks included, goes through the
+throughput limiter. Results of clean files are kept in a small SQLite store
+keyed by path, size and mtime; later runs skip files that have not changed
+since they were verified.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .encryption import iter_decrypted_byte_range, read_header, unwrap_file_dek
+from .index_cache import ChunkIndexError, walk_chunk_index
+from .vault_scan import ThroughputLimiter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verified_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sample_fraction REAL NOT NULL,
+    verified_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class AuditResult:
+    """Outcome of auditing one managed file."""
+
+    relative_name: str
+    chunk_count: int = 0
+    checked_chunks: int = 0
+    bytes_read: int = 0
+    error: str | None = None
+    chunk: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def select_chunks(chunk_count: int, fraction: float, rng: random.Random) -> list[int]:
+    """
+    Pick the chunks to authenticate, in file order.
+
+    ``fraction >= 1`` selects every chunk. A sample always includes the first
+    and the last chunk, where truncation and header damage show up.
+    """
+    if chunk_count <= 0:
+        return []
+    if fraction >= 1:
+        return list(range(chunk_count))
+    wanted = max(math.ceil(chunk_count * fraction), min(chunk_count, 2))
+    chosen = {0, chunk_count - 1}
+    middle = range(1, chunk_count - 1)
+    extra = min(max(wanted - len(chosen), 0), len(middle))
+    chosen.update(rng.sample(middle, extra))
+    return sorted(chosen)
+
+
+def chunk_runs(chunks: list[int]) -> list[tuple[int, int]]:
+    """Group sorted chunk numbers into inclusive ``(first, last)`` runs."""
+    runs: list[tuple[int, int]] = []
+    for chunk in chunks:
+        if runs and runs[-1][1] == chunk - 1:
+            runs[-1] = (runs[-1][0], chunk)
+        else:
+            runs.append((chunk, chunk))
+    return runs
+
+
+class _MeteredReader:
+    """Raw encrypted file that charges every read to a limiter."""
+
+    def __init__(self, raw, limiter: ThroughputLimiter | None) -> None:
+        self.raw = raw
+        self.name = getattr(raw, "name", "encrypted file")
+        self.limiter = limiter
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        if self.limiter is not None:
+            self.limiter.consume(len(data))
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+
+def audit_file(
+    storage,
+    relative_name: str,
+    *,
+    master_key: bytes,
+    fraction: float = 1.0,
+    rng: random.Random | None = None,
+    limiter: ThroughputLimiter | None = None,
+) -> AuditResult:
+    """
+    Authenticate the selected chunks of ``relative_name`` with ``master_key``.
+
+    Each run of adjacent selected chunks is one ``iter_decrypted_byte_range``
+    call, which walks the framing again before it decrypts, so a sparse
+    sample costs a walk per run. Never raises for a damaged file; the failure
+    is returned in the result.
+    """
+    try:
+        raw = storage.open_encrypted(relative_name)
+    except OSError as exc:
+        return AuditResult(relative_name, error=f"{type(exc).__name__}: {exc}")
+
+    with raw:
+        source = _MeteredReader(raw, limiter)
+        try:
+            index = walk_chunk_index(source)
+        except ChunkIndexError as exc:
+            return AuditResult(
+                relative_name, bytes_read=source.bytes_read, error=str(exc)
+            )
+        except OSError as exc:
+            return AuditResult(
+                relative_name,
+                bytes_read=source.bytes_read,
+                error=f"{type(exc).__name__}: {exc}",
+            )
+
+        chunks = select_chunks(
+            index.chunk_count, fraction, rng or random.Random(relative_name)
+        )
+        checked = 0
+        chunk = None
+        try:
+            source.seek(0)
+            header, _header_bytes = read_header(source)
+            unwrap_file_dek(header, master_key)
+            for first, last in chunk_runs(chunks):
+                chunk = first
+                source.seek(0)
+                # One chunk per block, so the block count names the bad record.
+                for _plaintext in iter_decrypted_byte_range(
+                    source,
+                    master_key=master_key,
+                    start=index.plaintext_start(first),
+                    end=index.plaintext_start(last) + index.plaintext_lengths[last] - 1,
+                    output_chunk_size=index.chunk_size,
+                ):
+                    checked += 1
+                    chunk += 1
+        except Exception as exc:
+            return AuditResult(
+                relative_name,
+                chunk_count=index.chunk_count,
+                checked_chunks=checked,
+                bytes_read=source.bytes_read,
+                error=(
+                    f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+                ),
+                chunk=chunk,
+            )
+    return AuditResult(
+        relative_name,
+        chunk_count=index.chunk_count,
+        checked_chunks=checked,
+        bytes_read=source.bytes_read,
+    )
+
+
+class AuditState:
+    """
+    SQLite record of files that passed an audit.
+
+    A row only counts while the file keeps the size and mtime it had when it
+    was verified, and only for samples at least as large as the one recorded.
+    Used from a single thread.
+    """
+
+    def __init__(self, db_path: Path | str) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.db_path), isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def is_verified(
+        self, path: Path | str, *, size: int, mtime_ns: int, fraction: float
+    ) -> bool:
+        row = self._connection.execute(
+            "SELECT sample_fraction FROM verified_files "
+            "WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (str(path), size, mtime_ns),
+        ).fetchone()
+        return row is not None and row[0] >= min(fraction, 1.0)
+
+    def record(
+        self, path: Path | str, *, size: int, mtime_ns: int, fraction: float
+    ) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO verified_files "
+            "(path, size, mtime_ns, sample_fraction, verified_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (str(path), size, mtime_ns, min(fraction, 1.0), time.time()),
+        )
+
+    def forget(self, path: Path | str) -> None:
+        self._connection.execute(
+            "DELETE FROM verified_files WHERE path = ?", (str(path),)
+        )
+
+    def prune(self) -> int:
+        """Drop rows of files that no longer exist; returns the count."""
+        rows = self._connection.execute("SELECT path FROM verified_files").fetchall()
+        gone = [(path,) for (path,) in rows if not os.path.exists(path)]
+        self._connection.executemany("DELETE FROM verified_files WHERE path = ?", gone)
+        return len(gone)
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,352 @@
+"""Persistent chunk index for encrypted managed files.
+
+Finding the chunk that holds a plaintext offset means walking every
+ciphertext length prefix of an ``AESGCM-chunked-v1`` file, which for a 10 GB
+video is about ten thousand seeks. ``EncryptedStorage`` keeps the result of
+``build_chunk_index`` in memory only, in ``_index_cache`` under an
+``IndexCacheKey``, and only for the last file it indexed. This module keeps
+that result in a small SQLite sidecar keyed by path, size and mtime, so it
+survives restarts; a rewritten file no longer matches its row and is walked
+again on the next lookup. ``storage_chunk_index`` hands the persisted index
+back to the storage as an ``IndexCacheValue``, so ``get_plaintext_size`` and
+the size check of ``iter_decrypted_range`` do not walk the file. Decryption
+stays in endoreg-db.
+
+Only the framing is recorded (the encoded header and the ciphertext and
+plaintext length of every chunk). The header holds the wrapped DEK, never the
+DEK itself; no key material and no plaintext is stored.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import BinaryIO
+
+from .encrypted import IndexCacheKey, IndexCacheValue
+from .encryption import (
+    CHUNK_LENGTH_STRUCT,
+    HEADER_LENGTH_STRUCT,
+    MAGIC,
+    EncryptedChunkIndexEntry,
+    EncryptedFileHeader,
+    build_chunk_index,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_indexes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    header_bytes BLOB NOT NULL,
+    ciphertext_lengths BLOB NOT NULL,
+    plaintext_lengths BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class ChunkIndexError(ValueError):
+    """The file is not a well-formed encrypted managed file."""
+
+
+def configured_index_cache_path() -> Path:
+    from django.conf import settings
+
+    configured = str(getattr(settings, "LX_ANNOTATE_CHUNK_INDEX_PATH", "") or "")
+    if configured.strip():
+        return Path(configured.strip()).expanduser()
+    # Not under APP_STORAGE_DIR: that is the vault, and maintenance commands
+    # would treat the sidecar as a managed payload.
+    return Path(settings.APP_DATA_DIR) / "storage_index" / "chunk_index.sqlite3"
+
+
+@dataclass(frozen=True)
+class ChunkIndex:
+    """
+    Layout of one encrypted file, as ``build_chunk_index`` reports it.
+
+    ``data_offset`` is where the first chunk record starts; each record is a
+    length prefix followed by that many ciphertext bytes.
+    """
+
+    header_bytes: bytes
+    ciphertext_lengths: array
+    plaintext_lengths: array
+    header: EncryptedFileHeader = field(init=False, repr=False, compare=False)
+    _plaintext_ends: list[int] = field(init=False, repr=False, compare=False)
+    _record_ends: list[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "header", EncryptedFileHeader.from_bytes(self.header_bytes)
+        )
+        object.__setattr__(
+            self, "_plaintext_ends", list(accumulate(self.plaintext_lengths))
+        )
+        object.__setattr__(
+            self,
+            "_record_ends",
+            list(
+                accumulate(
+                    (
+                        CHUNK_LENGTH_STRUCT.size + length
+                        for length in self.ciphertext_lengths
+                    ),
+                    initial=self.data_offset,
+                )
+            )[1:],
+        )
+
+    @classmethod
+    def from_entries(
+        cls, header_bytes: bytes, entries: list[EncryptedChunkIndexEntry]
+    ) -> ChunkIndex:
+        return cls(
+            header_bytes=header_bytes,
+            ciphertext_lengths=array("I", (e.ciphertext_length for e in entries)),
+            plaintext_lengths=array("I", (e.plaintext_length for e in entries)),
+        )
+
+    @property
+    def data_offset(self) -> int:
+        return len(MAGIC) + HEADER_LENGTH_STRUCT.size + len(self.header_bytes)
+
+    @property
+    def chunk_size(self) -> int:
+        return self.header.chunk_size
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.ciphertext_lengths)
+
+    @property
+    def plaintext_size(self) -> int:
+        return self._plaintext_ends[-1] if self._plaintext_ends else 0
+
+    @property
+    def file_size(self) -> int:
+        return self._record_ends[-1] if self._record_ends else self.data_offset
+
+    def chunk_for_offset(self, offset: int) -> int:
+        """Number of the chunk holding plaintext byte ``offset``."""
+        if not 0 <= offset < self.plaintext_size:
+            raise IndexError(f"offset {offset} outside 0..{self.plaintext_size}")
+        return bisect.bisect_right(self._plaintext_ends, offset)
+
+    def plaintext_start(self, chunk: int) -> int:
+        return self._plaintext_ends[chunk - 1] if chunk else 0
+
+    def ciphertext_offset(self, chunk: int) -> int:
+        """Offset of the length prefix of ``chunk`` in the file."""
+        return self._record_ends[chunk - 1] if chunk else self.data_offset
+
+    def entry(self, chunk: int) -> EncryptedChunkIndexEntry:
+        return EncryptedChunkIndexEntry(
+            counter=chunk,
+            ciphertext_offset=self.ciphertext_offset(chunk) + CHUNK_LENGTH_STRUCT.size,
+            ciphertext_length=self.ciphertext_lengths[chunk],
+            plaintext_offset=self.plaintext_start(chunk),
+            plaintext_length=self.plaintext_lengths[chunk],
+        )
+
+    def cache_value(self) -> IndexCacheValue:
+        """The index in the shape ``build_chunk_index`` returns it."""
+        return (
+            self.header,
+            self.header_bytes,
+            [self.entry(chunk) for chunk in range(self.chunk_count)],
+            self.plaintext_size,
+        )
+
+
+def walk_chunk_index(source: BinaryIO) -> ChunkIndex:
+    """
+    Read the framing of an open encrypted file without decrypting anything.
+
+    Every byte is read through ``source`` from its start, so a wrapper that
+    meters reads sees the whole walk.
+    """
+    name = getattr(source, "name", "encrypted file")
+    source.seek(0)
+    try:
+        _header, header_bytes, entries, _size = build_chunk_index(source)
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ChunkIndexError(f"{name}: {exc}") from exc
+    index = ChunkIndex.from_entries(header_bytes, entries)
+    # build_chunk_index seeks over each record, so a short last record only
+    # shows up against the file size.
+    if index.file_size != source.seek(0, os.SEEK_END):
+        raise ChunkIndexError(f"{name} has a truncated chunk record")
+    return index
+
+
+class ChunkIndexCache:
+    """
+    Thread-safe SQLite store of chunk indexes keyed by path, size and mtime.
+
+    ``db_path=None`` keeps the cache in memory for the life of the process.
+    """
+
+    def __init__(self, db_path: Path | str | None = None) -> None:
+        self.db_path = Path(db_path) if db_path is not None else None
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        database = ":memory:"
+        if self.db_path is not None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                database = str(self.db_path)
+            except OSError as exc:
+                logger.warning(
+                    "Chunk index directory unavailable (%s); "
+                    "falling back to an in-memory cache",
+                    exc,
+                )
+        connection = sqlite3.connect(
+            database, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        if database != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS chunk_indexes")
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._connection = connection
+        return connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get(self, path: str | Path) -> ChunkIndex:
+        """Return the index of ``path``, walking the file only on a miss."""
+        return self.lookup(path)[1]
+
+    def lookup(self, path: str | Path) -> tuple[os.stat_result, ChunkIndex]:
+        """Return the index of ``path`` with the stat it is keyed by."""
+        key = str(Path(path).resolve())
+        stat_result = os.stat(key)
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT header_bytes, ciphertext_lengths, plaintext_lengths "
+                    "FROM chunk_indexes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (key, stat_result.st_size, stat_result.st_mtime_ns),
+                )
+                .fetchone()
+            )
+            if row is not None:
+                self.hits += 1
+                ciphertext_lengths = array("I")
+                ciphertext_lengths.frombytes(row[1])
+                plaintext_lengths = array("I")
+                plaintext_lengths.frombytes(row[2])
+                return stat_result, ChunkIndex(
+                    bytes(row[0]), ciphertext_lengths, plaintext_lengths
+                )
+            self.misses += 1
+
+        with open(key, "rb") as handle:
+            index = walk_chunk_index(handle)
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO chunk_indexes "
+                "(path, size, mtime_ns, header_bytes, ciphertext_lengths, "
+                "plaintext_lengths, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    stat_result.st_size,
+                    stat_result.st_mtime_ns,
+                    index.header_bytes,
+                    index.ciphertext_lengths.tobytes(),
+                    index.plaintext_lengths.tobytes(),
+                    time.time(),
+                ),
+            )
+        return stat_result, index
+
+    def invalidate(self, path: str | Path) -> None:
+        key = str(Path(path).resolve())
+        with self._lock:
+            self._connect().execute("DELETE FROM chunk_indexes WHERE path = ?", (key,))
+
+    def prune(self) -> int:
+        """Drop rows whose file is gone or was rewritten; returns the count."""
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT path, size, mtime_ns FROM chunk_indexes"
+            ).fetchall()
+            stale = []
+            for path, size, mtime_ns in rows:
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    stale.append((path,))
+                    continue
+                if (stat_result.st_size, stat_result.st_mtime_ns) != (size, mtime_ns):
+                    stale.append((path,))
+            connection.executemany("DELETE FROM chunk_indexes WHERE path = ?", stale)
+        return len(stale)
+
+
+_default_cache: ChunkIndexCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def default_chunk_index_cache() -> ChunkIndexCache:
+    """Process-wide cache at ``LX_ANNOTATE_CHUNK_INDEX_PATH``."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ChunkIndexCache(configured_index_cache_path())
+        return _default_cache
+
+
+def storage_chunk_index(storage, name: str) -> ChunkIndex:
+    """
+    Chunk index of the managed file ``name``, handed to the storage as well.
+
+    ``EncryptedStorage`` looks the index up in ``_index_cache`` under the same
+    ``IndexCacheKey`` it would store a fresh walk under, so seeding it makes
+    ``get_plaintext_size`` and ``iter_decrypted_range`` use the persisted
+    index. Like the storage itself, only the latest file is kept there.
+    """
+    backend = getattr(storage, "wrapped", storage)
+    path = Path(backend.path(name))
+    stat_result, index = default_chunk_index_cache().lookup(path)
+    memory_cache = getattr(backend, "_index_cache", None)
+    if isinstance(memory_cache, dict):
+        cache_key: IndexCacheKey = (
+            str(path),
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+        )
+        if cache_key not in memory_cache:
+            memory_cache.clear()
+            memory_cache[cache_key] = index.cache_value()
+    return index
@@ -0,0 +1,167 @@
+"""Master-key rotation for encrypted managed files.
+
+Every encrypted file carries its own data key (DEK), wrapped with the master
+key in the header. The chunks are authenticated with the encoded header as
+associated data, so the header cannot be rewrapped on its own: a new
+``wrapped_dek`` changes the header bytes and every chunk tag with them.
+Rotation therefore re-encrypts the file: ``encrypt_stream`` reads the
+plaintext from a ``DecryptedStream`` over the old file and writes it under a
+fresh header with the new key and the same chunk size. Rewrapping only the
+header, and reading with both keys while a rotation runs, need a header
+version whose chunk AAD leaves out the wrapped DEK; ``AESGCM-chunked-v1`` has
+none.
+
+The new file is written to a unique temp file next to the original and
+replaces it with ``os.replace`` once it is synced, so an interrupted rotation
+leaves either the old or the new file and never a mix. Files whose DEK already unwraps
+with the new key are recognised and left alone, so a rotation can be rerun
+or resumed at any point.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import os
+import shutil
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO
+
+from cryptography.exceptions import InvalidTag
+
+from .encryption import (
+    DecryptedStream,
+    EncryptedFileHeader,
+    encrypt_stream,
+    read_header,
+    unwrap_file_dek,
+)
+
+OUTCOME_REENCRYPTED = "reencrypted"
+OUTCOME_CURRENT = "already_current"
+OUTCOME_WOULD_REENCRYPT = "would_reencrypt"
+
+
+class KeyRotationError(ValueError):
+    """A file could not be rotated to the new key."""
+
+
+class RotationVerificationError(KeyRotationError):
+    """A re-encrypted file did not read back; the original was kept."""
+
+
+def decode_master_key(text: str) -> bytes:
+    """Decode urlsafe-base64 key material as ``LX_ANNOTATE_MASTER_KEY`` does."""
+    try:
+        key = base64.urlsafe_b64decode(text.strip())
+    except (binascii.Error, ValueError) as exc:
+        raise KeyRotationError("master key is not urlsafe-base64") from exc
+    if len(key) not in (16, 24, 32):
+        raise KeyRotationError("master key must decode to 16, 24 or 32 bytes")
+    return key
+
+
+def key_id(key: bytes) -> str:
+    """Short, non-reversible identifier of a key for logs and checkpoints."""
+    return hashlib.sha256(b"lx-annotate-master-key:" + key).hexdigest()[:16]
+
+
+def read_file_header(path: Path | str) -> EncryptedFileHeader:
+    """Return the parsed header of an encrypted file."""
+    with open(path, "rb") as handle:
+        try:
+            header, _header_bytes = read_header(handle)
+        except (ValueError, KeyError, TypeError) as exc:
+            raise KeyRotationError(f"{path}: {exc}") from exc
+    return header
+
+
+def unwraps_with(header: EncryptedFileHeader, master_key: bytes) -> bool:
+    try:
+        unwrap_file_dek(header, master_key)
+    except (InvalidTag, ValueError):
+        return False
+    return True
+
+
+def reencrypt_stream(
+    source: BinaryIO,
+    destination: BinaryIO,
+    *,
+    old_key: bytes,
+    new_key: bytes,
+) -> EncryptedFileHeader:
+    """
+    Copy an encrypted file from ``source`` to ``destination`` under ``new_key``.
+
+    The copy gets a fresh DEK and nonce prefix and keeps the chunk size, so
+    the plaintext is split into the same chunks. Every old chunk is
+    authenticated on the way.
+    """
+    header, _header_bytes = read_header(source)
+    source.seek(0)
+    return encrypt_stream(
+        DecryptedStream(source, master_key=old_key),
+        destination,
+        master_key=new_key,
+        chunk_size=header.chunk_size,
+    )
+
+
+def rotate_file(
+    path: Path | str,
+    old_key: bytes,
+    new_key: bytes,
+    *,
+    dry_run: bool = False,
+    verify: Callable[[Path], bool] | None = None,
+) -> str:
+    """
+    Re-encrypt one encrypted file from ``old_key`` to ``new_key``.
+
+    ``verify`` is called with the path of the re-encrypted copy before it
+    replaces the original; if it returns false the copy is discarded and
+    ``RotationVerificationError`` is raised.
+    """
+    path = Path(path)
+    header = read_file_header(path)
+    if unwraps_with(header, new_key):
+        return OUTCOME_CURRENT
+    if not unwraps_with(header, old_key):
+        raise KeyRotationError("wrapped DEK opens with neither the old nor the new key")
+    if dry_run:
+        return OUTCOME_WOULD_REENCRYPT
+
+    before = os.stat(path)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".rotate.tmp", dir=path.parent
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as target, open(path, "rb") as source:
+            try:
+                reencrypt_stream(source, target, old_key=old_key, new_key=new_key)
+            except (InvalidTag, ValueError) as exc:
+                raise KeyRotationError(
+                    f"{path} does not decrypt with the old key: "
+                    f"{exc or type(exc).__name__}"
+                ) from exc
+            target.flush()
+            os.fsync(target.fileno())
+        shutil.copymode(path, tmp_path)
+        if verify is not None and not verify(tmp_path):
+            raise RotationVerificationError(
+                f"{path} was not readable with the new key after re-encryption; "
+                "the original was kept"
+            )
+        after = os.stat(path)
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            raise KeyRotationError(f"{path} changed during rotation")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return OUTCOME_REENCRYPTED
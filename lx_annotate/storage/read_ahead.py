@@ -0,0 +1,155 @@
+"""Read-ahead file wrapper for streaming large intake files into storage.
+
+``EncryptedStorage`` reads, encrypts and writes one chunk at a time on the
+calling thread, so the disk sits idle while a chunk is encrypted and the CPU
+sits idle while the next chunk is read. ``ReadAheadFile`` moves the reads onto
+a background thread that keeps a bounded number of chunks queued, so the next
+chunk is already in memory when the storage backend asks for it. AES-GCM and
+file reads both release the GIL, which lets the two stages overlap.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import queue
+import threading
+from typing import BinaryIO
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_DEPTH = 4
+
+_EOF = object()
+
+
+class ReadAheadFile(io.RawIOBase):
+    """
+    Forward-only binary reader fed by a background thread.
+
+    At most ``depth`` blocks of ``block_size`` bytes are held in memory. The
+    wrapper does not close ``source``; the caller owns it.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        *,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        depth: int = DEFAULT_DEPTH,
+        name: str | None = None,
+    ) -> None:
+        super().__init__()
+        self.source = source
+        self.block_size = max(int(block_size), 1)
+        self.name = name or getattr(source, "name", None)
+        self.size = _source_size(source)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(int(depth), 1))
+        self._stop = threading.Event()
+        self._buffer = b""
+        self._offset = 0
+        self._position = 0
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._fill, name="read-ahead", daemon=True
+        )
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # Django's File.chunks() rewinds before reading; allow that no-op only.
+        if whence == io.SEEK_SET and offset == self._position:
+            return self._position
+        raise io.UnsupportedOperation("ReadAheadFile only reads forward")
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return self.readall()
+        if size == 0:
+            return b""
+        if self._offset >= len(self._buffer) and not self._next_block():
+            return b""
+        available = len(self._buffer) - self._offset
+        if self._offset == 0 and available <= size:
+            # Hand a queued block over without copying it.
+            data = self._buffer
+        else:
+            data = self._buffer[self._offset : self._offset + size]
+        self._offset += len(data)
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def readall(self) -> bytes:
+        parts = [self._buffer[self._offset :]]
+        self._offset = len(self._buffer)
+        while self._next_block():
+            parts.append(self._buffer)
+            self._offset = len(self._buffer)
+        data = b"".join(parts)
+        self._position += len(data)
+        return data
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            # Unblock the reader if it is waiting for queue space.
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            self._thread.join()
+        super().close()
+
+    def _next_block(self) -> bool:
+        if self._eof:
+            return False
+        item = self._queue.get()
+        if item is _EOF:
+            self._eof = True
+            self._buffer, self._offset = b"", 0
+            return False
+        if isinstance(item, BaseException):
+            self._eof = True
+            raise item
+        self._buffer, self._offset = item, 0
+        return True
+
+    def _fill(self) -> None:
+        try:
+            while not self._stop.is_set():
+                block = self.source.read(self.block_size)
+                if not block:
+                    break
+                self._put(block)
+        except BaseException as exc:  # surfaced to the consumer in read()
+            self._put(exc)
+            return
+        self._put(_EOF)
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def _source_size(source: BinaryIO) -> int | None:
+    try:
+        return os.fstat(source.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
@@ -0,0 +1,137 @@
+"""HTTP ``Range`` responses for managed media.
+
+Serving vault media used to mean decrypting the whole file into a plaintext
+temp copy first. ``managed_media_response`` streams only the requested byte
+range instead: encrypted files are read with ``iter_decrypted_range``, which
+decrypts only the chunks that overlap the range. The persistent chunk index
+is handed to the storage first, so sizing a file does not walk it once it has
+been indexed; ``iter_decrypted_byte_range`` still walks the length prefixes
+once per request before it seeks to the first chunk.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .index_cache import storage_chunk_index
+
+STREAM_BLOCK_SIZE = 512 * 1024
+
+_RANGE_RE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+class RangeNotSatisfiable(ValueError):
+    """The requested range starts beyond the end of the file."""
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single ``Range: bytes=`` header into an inclusive ``(start, end)``.
+
+    Returns ``None`` when the header is absent or is one we may ignore and
+    answer with the full body (other units, multiple ranges, malformed specs).
+    """
+    match = _RANGE_RE.match(header or "")
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix_length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def _is_encrypted(storage, name: str) -> bool:
+    is_encrypted = getattr(storage, "is_encrypted", None)
+    return is_encrypted is not None and is_encrypted(name)
+
+
+def managed_media_size(storage, name: str) -> int:
+    """Plaintext size of ``name``; encrypted files are sized from the index."""
+    if _is_encrypted(storage, name):
+        return storage_chunk_index(storage, name).plaintext_size
+    return storage.size(name)
+
+
+def iter_managed_range(
+    storage,
+    name: str,
+    start: int,
+    end: int,
+    *,
+    block_size: int = STREAM_BLOCK_SIZE,
+) -> Iterator[bytes]:
+    """Yield plaintext bytes ``start..end`` (inclusive) of ``name``."""
+    if _is_encrypted(storage, name):
+        storage_chunk_index(storage, name)
+        yield from storage.iter_decrypted_range(
+            name, start=start, end=end, chunk_size=block_size
+        )
+        return
+
+    handle = storage.open(name, "rb")
+    try:
+        if start:
+            handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = handle.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        handle.close()
+
+
+def managed_media_response(
+    request,
+    storage,
+    name: str,
+    *,
+    content_type: str | None = None,
+) -> HttpResponse:
+    """Answer ``request`` with ``name`` as a full (200) or partial (206) body."""
+    size = managed_media_size(storage, name)
+    content_type = (
+        content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+    )
+    try:
+        byte_range = parse_byte_range(request.META.get("HTTP_RANGE"), size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    start, end = byte_range if byte_range is not None else (0, size - 1)
+    if size == 0:
+        response = HttpResponse(b"", content_type=content_type)
+    else:
+        response = StreamingHttpResponse(
+            iter_managed_range(storage, name, start, end),
+            status=206 if byte_range is not None else 200,
+            content_type=content_type,
+        )
+    if byte_range is not None:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(end - start + 1 if size else 0)
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = f'inline; filename="{Path(name).name}"'
+    response["Cache-Control"] = "private, no-store"
+    return response
@@ -0,0 +1,287 @@
+"""Streaming, parallel and resumable walks over the managed-storage vault.
+
+Maintenance commands that touch every payload (repair, audit, key rotation)
+share these pieces:
+
+- ``walk_vault`` streams the tree with ``os.scandir`` in a stable depth-first,
+  name-sorted order, holding only one directory listing per level in memory.
+  Given the last finished path it skips everything up to and including it,
+  pruning whole directories, so an interrupted run resumes where it stopped.
+- ``run_ordered`` runs a function over the walk on a thread pool with a
+  bounded window and yields results in walk order, so output stays
+  deterministic and the checkpoint can only advance past finished files.
+- ``ScanCheckpoint`` stores the resume position and counters in a small JSON
+  file that is replaced atomically.
+- ``ThroughputLimiter`` caps the combined read rate of the workers so a scan
+  can run next to production traffic.
+- ``skip_reason`` names the paths that are not canonical encrypted payloads.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+MEBIBYTE = 1024 * 1024
+
+DERIVED_OR_TEMP_DIR_NAMES = {
+    ".lx-annotate-rsync-partial",
+    "_processing",
+    "streamable_videos",
+    "transcoding",
+}
+
+
+@dataclass(frozen=True)
+class VaultEntry:
+    """A regular file or symlink found in the vault."""
+
+    path: Path
+    relative_name: str
+    is_symlink: bool
+    size: int
+    mtime_ns: int
+
+
+def skip_reason(relative_name: str) -> str | None:
+    """
+    Return why a managed-storage path is not a canonical encrypted payload.
+
+    FieldFile payloads are canonical encrypted storage. Streamable files are
+    explicit protected plaintext artifacts for nginx and must never be rewritten
+    or audited as ciphertext. Temporary/partial files are not canonical payloads
+    either.
+    """
+    relative_path = Path(relative_name)
+    if any(part in DERIVED_OR_TEMP_DIR_NAMES for part in relative_path.parts):
+        return "derived_or_temp_directory"
+
+    name = relative_path.name
+    if name.startswith(".") or name.startswith("~") or name.endswith(".tmp"):
+        return "temporary_artifact"
+
+    return None
+
+
+def _walk_key(relative_name: str) -> tuple[str, ...]:
+    return tuple(relative_name.split("/")) if relative_name else ()
+
+
+def walk_vault(
+    root: Path, scan_root: Path | None = None, *, resume_after: str = ""
+) -> Iterator[VaultEntry]:
+    """
+    Yield files and symlinks under ``scan_root`` in walk order.
+
+    Symlinks are yielded but never followed. ``resume_after`` is a
+    ``relative_name`` from an earlier walk; it and every entry before it are
+    skipped.
+    """
+    root = Path(root)
+    resume_key = _walk_key(resume_after)
+    start = Path(scan_root) if scan_root is not None else root
+    prefix = start.relative_to(root).as_posix() if start != root else ""
+    yield from _walk_directory(root, start, _walk_key(prefix), resume_key)
+
+
+def _walk_directory(
+    root: Path,
+    directory: Path,
+    key: tuple[str, ...],
+    resume_key: tuple[str, ...],
+) -> Iterator[VaultEntry]:
+    try:
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        entry_key = key + (entry.name,)
+        if resume_key and entry_key <= resume_key:
+            # A directory on the resume path still has unfinished entries.
+            if not (entry_key == resume_key[: len(entry_key)] and entry.is_dir()):
+                continue
+        relative_name = "/".join(entry_key)
+        if entry.is_symlink():
+            yield VaultEntry(Path(entry.path), relative_name, True, 0, 0)
+        elif entry.is_dir():
+            yield from _walk_directory(root, Path(entry.path), entry_key, resume_key)
+        elif entry.is_file():
+            try:
+                stat_result = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield VaultEntry(
+                Path(entry.path),
+                relative_name,
+                False,
+                stat_result.st_size,
+                stat_result.st_mtime_ns,
+            )
+
+
+def run_ordered(
+    function: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: int,
+    window: int | None = None,
+) -> Iterator[tuple[T, Future]]:
+    """
+    Apply ``function`` to ``items`` on ``workers`` threads.
+
+    Yields ``(item, future)`` in input order once each future is done; call
+    ``future.result()`` to get the value or re-raise the worker's exception.
+    At most ``window`` items (default ``4 * workers``) are in flight.
+    Closing the generator cancels everything not yet started.
+    """
+    workers = max(int(workers), 1)
+    window = max(window or workers * 4, 1)
+    pending: deque[tuple[T, Future]] = deque()
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="vault-scan"
+    ) as pool:
+        try:
+            iterator = iter(items)
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < window:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append((item, pool.submit(function, item)))
+                if not pending:
+                    break
+                item, future = pending.popleft()
+                future.exception()  # wait without raising
+                yield item, future
+        finally:
+            for _item, future in pending:
+                future.cancel()
+
+
+class ScanCheckpoint:
+    """
+    Resume position and counters of one vault scan, kept in a JSON file.
+
+    ``scope`` identifies the scan (command, root, options); a checkpoint
+    written for a different scope is ignored.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None,
+        *,
+        scope: dict[str, Any],
+        interval_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.scope = scope
+        self.interval_seconds = interval_seconds
+        self.clock = clock
+        self._last_saved = clock()
+
+    def load(self) -> tuple[str, dict[str, Any]] | None:
+        """Return ``(resume_after, counters)`` or ``None``."""
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if payload.get("scope") != self.scope:
+            return None
+        return str(payload.get("position") or ""), dict(payload.get("counters") or {})
+
+    def save(self, position: str, counters: dict[str, Any], *, force=False) -> bool:
+        """Write the checkpoint if forced or the interval has passed."""
+        if self.path is None:
+            return False
+        now = self.clock()
+        if not force and now - self._last_saved < self.interval_seconds:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"scope": self.scope, "position": position, "counters": counters},
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+        self._last_saved = now
+        return True
+
+    def clear(self) -> None:
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class ThroughputMeter:
+    """Files and bytes processed since ``start``."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.started_at = clock()
+        self.files = 0
+        self.bytes = 0
+
+    def add(self, size: int) -> None:
+        self.files += 1
+        self.bytes += size
+
+    def summary(self) -> str:
+        elapsed = max(self.clock() - self.started_at, 1e-9)
+        return (
+            f"files_per_second={self.files / elapsed:.1f} "
+            f"mb_per_second={self.bytes / MEBIBYTE / elapsed:.1f} "
+            f"elapsed={elapsed:.1f}s"
+        )
+
+
+class ThroughputLimiter:
+    """
+    Cap the combined read rate of all threads at ``bytes_per_second``.
+
+    Each ``consume`` reserves the next slot on a shared timeline and sleeps
+    until it starts, so bursts are smoothed out over time. A rate of ``0``
+    disables the cap.
+    """
+
+    def __init__(
+        self,
+        bytes_per_second: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.bytes_per_second = max(float(bytes_per_second), 0.0)
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = clock()
+
+    def consume(self, size: int) -> None:
+        if self.bytes_per_second <= 0 or size <= 0:
+            return
+        with self._lock:
+            now = self.clock()
+            start = max(self._next_slot, now)
+            self._next_slot = start + size / self.bytes_per_second
+        if start > now:
+            self.sleep(start - now)
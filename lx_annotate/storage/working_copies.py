@@ -0,0 +1,338 @@
+"""Shared cache of decrypted working copies of managed media.
+
+ffmpeg and the hub upload need a plaintext file on disk. Decrypting into a
+fresh temp file for every call means the same processed video is decrypted
+again each time it is touched within minutes. ``WorkingCopyCache`` keeps
+those copies in one directory (ideally on tmpfs) that every process on the
+host shares under one byte budget:
+
+- a copy is named after the storage, the file name and the source version
+  (size and mtime), so a changed source gets a new copy and the old one ages
+  out;
+- a process decrypts a copy while holding an exclusive ``flock`` on the
+  copy's lock file, so concurrent requests, from any process, decrypt once;
+- every user of a copy holds a shared ``flock`` on it (its lease). Eviction
+  takes an exclusive lock without blocking, so copies in use are never
+  evicted, and a crashed process's leases end with its file descriptors;
+- idle copies are evicted least recently used first once the directory
+  exceeds the budget, and after ``ttl_seconds`` without use. The copy's mtime
+  is its last use;
+- evicted copies are overwritten with zeros before they are unlinked.
+
+Working copies are shared, so callers must only read them.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MEBIBYTE = 1024 * 1024
+_LOCK_SUFFIX = ".lock"
+_PART_SUFFIX = ".part"
+
+
+@dataclass(frozen=True)
+class WorkingCopyStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+def _overwrite(fd: int) -> None:
+    try:
+        remaining = os.fstat(fd).st_size
+        zeros = bytes(min(remaining, MEBIBYTE))
+        os.lseek(fd, 0, os.SEEK_SET)
+        while remaining > 0:
+            remaining -= os.write(fd, zeros[: min(remaining, len(zeros))])
+        os.fsync(fd)
+    except OSError as exc:
+        logger.warning("Could not overwrite working copy: %s", exc)
+
+
+def secure_delete(path: Path) -> None:
+    """Overwrite ``path`` with zeros, flush it and unlink it."""
+    try:
+        fd = os.open(path, os.O_WRONLY)
+    except FileNotFoundError:
+        return
+    try:
+        _overwrite(fd)
+    finally:
+        os.close(fd)
+    Path(path).unlink(missing_ok=True)
+
+
+def _lock(path: Path, *, blocking: bool = True) -> int | None:
+    """
+    Take an exclusive ``flock`` on the lock file ``path``, creating it.
+
+    Lock files are unlinked when they are released, so after the lock is
+    granted the path must still name the locked file; otherwise another
+    holder removed it in between and the new file is locked instead. Returns
+    ``None`` when ``blocking`` is off and the lock is held elsewhere.
+    """
+    flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, flags)
+            current = os.stat(path)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except FileNotFoundError:
+            os.close(fd)
+            continue
+        except BaseException:
+            os.close(fd)
+            raise
+        if current.st_ino == os.fstat(fd).st_ino:
+            return fd
+        os.close(fd)
+
+
+def _unlock(path: Path, fd: int) -> None:
+    # Unlinked before it is unlocked, see ``_lock``.
+    with suppress(FileNotFoundError):
+        path.unlink()
+    os.close(fd)
+
+
+def _storage_id(storage) -> str:
+    location = getattr(storage, "location", "") or ""
+    return f"{type(storage).__module__}.{type(storage).__qualname__}:{location}"
+
+
+def _source_version(storage, name: str) -> tuple | None:
+    try:
+        return (storage.size(name), storage.get_modified_time(name).timestamp())
+    except (NotImplementedError, OSError, ValueError):
+        return None
+
+
+class WorkingCopyCache:
+    """
+    Size-bounded LRU of decrypted files in ``root``, shared by all processes
+    that use the same directory.
+
+    The budget applies to the whole directory, not to one process.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(int(max_bytes), 0)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.root.mkdir(parents=True, exist_ok=True, mode=0o700)
+        os.chmod(self.root, 0o700)
+
+    def copy_path(self, storage, name: str, *, suffix: str | None = None) -> Path:
+        """Where the copy of the current version of ``name`` lives."""
+        identity = "\0".join(
+            (_storage_id(storage), name, repr(_source_version(storage, name)))
+        )
+        digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+        return self.root / f"{digest}{suffix or ''}"
+
+    @contextmanager
+    def acquire(
+        self, storage, name: str, *, suffix: str | None = None
+    ) -> Iterator[Path]:
+        """Yield a read-only plaintext path for managed file ``name``."""
+        path = self.copy_path(storage, name, suffix=suffix)
+        lock_path = self._sidecar(path, _LOCK_SUFFIX)
+        lock_fd = _lock(lock_path)
+        try:
+            try:
+                lease = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                self._materialize(path, storage, name)
+                lease = os.open(path, os.O_RDONLY)
+                self._count("misses")
+            else:
+                self._count("hits")
+            # An evictor needs the lock file first, so this cannot fail while
+            # it is held.
+            fcntl.flock(lease, fcntl.LOCK_SH)
+            self._touch(path)
+        finally:
+            _unlock(lock_path, lock_fd)
+
+        try:
+            yield path
+        finally:
+            self._touch(path)
+            os.close(lease)
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Evict expired and over-budget idle copies; returns the count."""
+        now = self.clock()
+        copies = self._copies()
+        total = sum(size for _, _, size in copies)
+        evicted = 0
+        # Oldest first, so the budget is met by evicting least recently used.
+        for last_used, path, size in sorted(copies):
+            expired = now - last_used >= self.ttl_seconds
+            if not expired and total <= self.max_bytes:
+                break
+            if self._evict(path):
+                total -= size
+                evicted += 1
+        self._remove_abandoned_parts()
+        return evicted
+
+    def clear(self) -> None:
+        """Evict every copy that is not in use."""
+        for _, path, _ in self._copies():
+            self._evict(path)
+        self._remove_abandoned_parts()
+
+    def stats(self) -> WorkingCopyStats:
+        copies = self._copies()
+        with self._stats_lock:
+            return WorkingCopyStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(copies),
+                bytes=sum(size for _, _, size in copies),
+            )
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _sidecar(self, path: Path, suffix: str) -> Path:
+        return path.with_name(f".{path.name}{suffix}")
+
+    def _touch(self, path: Path) -> None:
+        now = self.clock()
+        with suppress(FileNotFoundError):
+            os.utime(path, (now, now))
+
+    def _copies(self) -> list[tuple[float, Path, int]]:
+        """``(last_used, path, size)`` of every finished copy."""
+        copies = []
+        for path in self.root.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                stat_result = path.lstat()
+            except FileNotFoundError:
+                continue
+            if path.is_symlink() or not path.is_file():
+                continue
+            copies.append((stat_result.st_mtime, path, stat_result.st_size))
+        return copies
+
+    def _materialize(self, path: Path, storage, name: str) -> None:
+        part = self._sidecar(path, _PART_SUFFIX)
+        # A part file under a lock we hold is left by a crashed process.
+        secure_delete(part)
+        try:
+            fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as target:
+                with storage.open(name, "rb") as source:
+                    for chunk in source.chunks(MEBIBYTE):
+                        target.write(chunk)
+            os.replace(part, path)
+        except BaseException:
+            secure_delete(part)
+            raise
+
+    def _evict(self, path: Path) -> bool:
+        """Delete ``path`` unless it is being created or is leased."""
+        lock_path = self._sidecar(path, _LOCK_SUFFIX)
+        lock_fd = _lock(lock_path, blocking=False)
+        if lock_fd is None:
+            return False
+        try:
+            try:
+                fd = os.open(path, os.O_RDWR)
+            except FileNotFoundError:
+                return False
+            try:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+                _overwrite(fd)
+                path.unlink(missing_ok=True)
+            finally:
+                os.close(fd)
+        finally:
+            _unlock(lock_path, lock_fd)
+        self._count("evictions")
+        return True
+
+    def _remove_abandoned_parts(self) -> None:
+        for part in self.root.glob(f".*{_PART_SUFFIX}"):
+            copy = part.with_name(part.name[1 : -len(_PART_SUFFIX)])
+            lock_path = self._sidecar(copy, _LOCK_SUFFIX)
+            lock_fd = _lock(lock_path, blocking=False)
+            if lock_fd is None:
+                continue
+            try:
+                secure_delete(part)
+            finally:
+                _unlock(lock_path, lock_fd)
+
+
+_default_cache: WorkingCopyCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def configured_working_copy_cache() -> WorkingCopyCache | None:
+    """
+    Process-wide cache from ``LX_ANNOTATE_WORKING_COPY_CACHE_MB``.
+
+    Returns ``None`` when the budget is ``0``; callers then decrypt into a
+    private temp file as before.
+    """
+    global _default_cache
+    from django.conf import settings
+
+    max_mb = int(getattr(settings, "LX_ANNOTATE_WORKING_COPY_CACHE_MB", 0) or 0)
+    if max_mb <= 0:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            root = str(getattr(settings, "LX_ANNOTATE_WORKING_COPY_DIR", "") or "")
+            _default_cache = WorkingCopyCache(
+                (
+                    Path(root).expanduser()
+                    if root.strip()
+                    else Path(settings.APP_DATA_DIR) / "working_copies"
+                ),
+                max_bytes=max_mb * MEBIBYTE,
+                ttl_seconds=float(
+                    getattr(settings, "LX_ANNOTATE_WORKING_COPY_TTL_SECONDS", 600)
+                ),
+            )
+        return _default_cache
@@ -78,3 +78,66 @@ def recover_stale_outbound_hub_transfer_jobs_task(
     return recover_stale_outbound_transfer_jobs(
         source_node_key=str(source_node_key),
     )
+
+
+@shared_task(
+    name="lx_annotate.ingest_watcher_file",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    track_started=True,
+)
+def ingest_watcher_file_task(
+    _task,
+    file_path: str,
+    kind: str,
+    content_hash: str = "",
+    size: int = -1,
+    mtime_ns: int = -1,
+) -> str:
+    from .watcher.ingest import (
+        INGEST_STATUS_FAILED,
+        ingest_claimed_file,
+        ingest_max_retries,
+        ingest_retry_countdown,
+        quarantine_claimed_file,
+        return_claimed_file,
+    )
+
+    # The watcher uses the claim token as task id, so every delivery and retry
+    # of this task refers to the same claim.
+    claim_token = str(_task.request.id)
+    retries = int(_task.request.retries or 0)
+    countdown = ingest_retry_countdown(retries)
+    result = ingest_claimed_file(
+        file_path=str(file_path),
+        kind=str(kind),
+        claim_token=claim_token,
+        content_hash=str(content_hash or ""),
+        size=int(size),
+        mtime_ns=int(mtime_ns),
+        retry_countdown=countdown,
+    )
+    if not result.retryable:
+        return result.status
+
+    max_retries = ingest_max_retries()
+    if retries >= max_retries:
+        if result.status == INGEST_STATUS_FAILED:
+            quarantine_claimed_file(
+                file_path=str(file_path),
+                claim_token=claim_token,
+                reason=result.error,
+                failures=retries + 1,
+            )
+            return "quarantined"
+        # Deferred imports (storage full, source not ready) are not poison:
+        # the file goes back to the watchers, whose next rescan enqueues it.
+        return_claimed_file(file_path=str(file_path), claim_token=claim_token)
+        return result.status
+
+    raise _task.retry(
+        exc=RuntimeError(result.error or result.status),
+        countdown=countdown,
+        max_retries=max_retries,
+    )
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.http import Http404
+from rest_framework.decorators import api_view, permission_classes
+
+from endoreg_db.models import VideoFile
+from endoreg_db.utils.permissions import EnvironmentAwarePermission
+
+from lx_annotate.storage.streaming import managed_media_response
+
+
+@api_view(["GET"])
+@permission_classes([EnvironmentAwarePermission])
+def processed_video_stream(request, video_id: int):
+    """Stream the anonymized video with ``Range`` support, decrypting on the fly."""
+    video = VideoFile.objects.filter(pk=video_id).first()
+    field_file = getattr(video, "processed_file", None)
+    if not field_file or not field_file.name:
+        raise Http404("Processed video not found.")
+    return managed_media_response(request, field_file.storage, field_file.name)
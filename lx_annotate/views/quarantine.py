@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from django.conf import settings
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -14,8 +12,18 @@ from rest_framework.response import Response
 
 from endoreg_db.utils.permissions import EnvironmentAwarePermission
 
+from lx_annotate.watcher.quarantine import (
+    configured_quarantine_dir,
+    is_reason_sidecar,
+    read_quarantine_reason,
+)
+
 VIDEO_EXTENSIONS = {".avi", ".m4v", ".mkv", ".mov", ".mp4", ".webm"}
 REPORT_EXTENSIONS = {".pdf"}
+DEFAULT_REASON = (
+    "Datei ist vermutlich beschädigt. "
+    "Überprüfen Sie die Datei und importieren Sie erneut!"
+)
 
 
 @dataclass(frozen=True)
@@ -25,21 +33,12 @@ class QuarantineDirectory:
     path: Path
 
 
-def _configured_path(env_name: str, fallback: Path) -> Path:
-    configured = os.getenv(env_name, "").strip()
-    return Path(configured or fallback).expanduser().resolve(strict=False)
-
-
 def _quarantine_directories() -> list[QuarantineDirectory]:
-    app_data_dir = Path(settings.APP_DATA_DIR).expanduser().resolve(strict=False)
     return [
         QuarantineDirectory(
             key="lx_annotate_quarantine",
             label="lx-annotate quarantine",
-            path=_configured_path(
-                "LX_ANNOTATE_QUARANTINE_DIR",
-                app_data_dir / "quarantine",
-            ),
+            path=configured_quarantine_dir(),
         )
     ]
 
@@ -62,7 +61,7 @@ def _read_quarantine_file(
     directory: QuarantineDirectory,
     entry: Path,
 ) -> dict[str, Any] | None:
-    if entry.is_symlink():
+    if entry.is_symlink() or is_reason_sidecar(entry):
         return None
 
     try:
@@ -74,6 +73,7 @@ def _read_quarantine_file(
         return None
 
     quarantined_at = _iso_from_timestamp(stat_result.st_ctime)
+    recorded = read_quarantine_reason(entry) or {}
     return {
         "id": f"{directory.key}:{entry.name}",
         "directory_key": directory.key,
@@ -84,7 +84,9 @@ def _read_quarantine_file(
         "quarantined_at": quarantined_at,
         "created_at": quarantined_at,
         "modified_at": _iso_from_timestamp(stat_result.st_mtime),
-        "reason": "Datei ist vermutlich beschädigt. Überprüfen Sie die Datei und importieren Sie erneut!",
+        "reason": str(recorded.get("reason") or DEFAULT_REASON),
+        "failed_attempts": recorded.get("failures"),
+        "original_name": recorded.get("original_name") or entry.name,
     }
 
 
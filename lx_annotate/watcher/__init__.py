@@ -0,0 +1,3 @@
+"""
+File watcher intake pipeline package.
+"""
@@ -0,0 +1,226 @@
+"""
+Storage admission control for inline imports.
+
+``check_storage_capacity`` looks at free space for one file at a time, so
+several large videos admitted together can each pass it and then jointly fill
+the vault. Before an import starts, the watcher reserves the file's predicted
+footprint on ``STORAGE_DIR``: the intake size times a per-kind factor
+(``WATCHER_STORAGE_FACTORS``) that covers the encrypted copy plus transcoding
+and frame artifacts. An import is admitted only while free space minus the
+unwritten part of all open reservations stays above
+``WATCHER_STORAGE_MIN_FREE_GB``.
+
+Free space already shrinks as running imports write, so only the part of a
+reservation that is not yet on disk is subtracted. The bytes written so far
+are the drop in free space since the first open reservation, capped at the
+sum of the reservations.
+
+A file that does not fit does not occupy a lane worker while it waits. It is
+kept in a waiting set, in arrival order, and every ``release`` hands the
+waiting files that fit again to ``resubmit``. The watcher also records the
+deferral in the ledger with a ``next_attempt_at`` of
+``WATCHER_STORAGE_RETRY_SECONDS``, so rescans leave the file alone until then;
+the rescan after that window only matters when free space grows for another
+reason than a finished import.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .settings import env_bool, env_float, env_weights
+
+logger = logging.getLogger(__name__)
+
+GIBIBYTE = 1024**3
+DEFAULT_FACTORS = {"video": 3.0, "report": 1.5, "pseudonymized": 2.0}
+# Encryption header, chunk tags and database-side files of a small import.
+PER_FILE_OVERHEAD_BYTES = 1024 * 1024
+DEFAULT_RETRY_SECONDS = 600.0
+
+
+def disk_free_bytes(root: Path) -> int:
+    return shutil.disk_usage(root).free
+
+
+@dataclass(frozen=True)
+class AdmissionStats:
+    reserved_bytes: int
+    outstanding_bytes: int
+    reservations: int
+    admitted: int
+    deferred: int
+    waiting: int
+
+
+class StorageAdmission:
+    """Reservations of predicted vault footprint against free disk space."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        factors: dict[str, float] | None = None,
+        min_free_bytes: int = 5 * GIBIBYTE,
+        free_space_probe: Callable[[Path], int] = disk_free_bytes,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+        resubmit: Callable[[str], None] | None = None,
+    ) -> None:
+        self.root = root
+        self.factors = dict(DEFAULT_FACTORS if factors is None else factors)
+        self.min_free_bytes = min_free_bytes
+        self.free_space_probe = free_space_probe
+        self.retry_seconds = retry_seconds
+        self.resubmit = resubmit
+        self._lock = threading.Lock()
+        self._reservations: dict[str, int] = {}
+        # Refused files and their predicted footprint, oldest first.
+        self._waiting: dict[str, int] = {}
+        # Free space before the open reservations started writing.
+        self._free_baseline: int | None = None
+        self._admitted = 0
+        self._deferred = 0
+
+    @classmethod
+    def from_env(
+        cls, root: Path, *, resubmit: Callable[[str], None] | None = None
+    ) -> StorageAdmission | None:
+        if not env_bool("WATCHER_STORAGE_ADMISSION", True):
+            return None
+        factors = dict(DEFAULT_FACTORS)
+        factors.update(env_weights("WATCHER_STORAGE_FACTORS"))
+        return cls(
+            root,
+            factors=factors,
+            min_free_bytes=int(
+                env_float("WATCHER_STORAGE_MIN_FREE_GB", 5.0, minimum=0.0) * GIBIBYTE
+            ),
+            retry_seconds=env_float(
+                "WATCHER_STORAGE_RETRY_SECONDS", DEFAULT_RETRY_SECONDS, minimum=0.0
+            ),
+            resubmit=resubmit,
+        )
+
+    def predicted_footprint(self, kind: str, size: int) -> int:
+        factor = max(self.factors.get(kind, 1.0), 1.0)
+        return int(max(size, 0) * factor) + PER_FILE_OVERHEAD_BYTES
+
+    def _probe(self) -> int | None:
+        try:
+            return self.free_space_probe(self.root)
+        except OSError as exc:
+            # Without a reading the per-file check in ingest still applies.
+            logger.warning("Could not read free space on %s: %s", self.root, exc)
+            return None
+
+    def _written(self, free: int) -> int:
+        """Bytes the open reservations have written so far (lock held)."""
+        if self._free_baseline is None:
+            return 0
+        reserved = sum(self._reservations.values())
+        return min(max(self._free_baseline - free, 0), reserved)
+
+    def _outstanding(self, free: int) -> int:
+        return sum(self._reservations.values()) - self._written(free)
+
+    def _fits(self, free: int | None, need: int) -> bool:
+        if free is None:
+            return True
+        return free - self._outstanding(free) - need >= self.min_free_bytes
+
+    def reserve(self, key: str, kind: str, size: int) -> bool:
+        """
+        Reserve the footprint of ``key`` if it fits now.
+
+        Returns ``False`` without waiting when it does not and puts ``key`` in
+        the waiting set. Reserving a key again after its file grew only needs
+        room for the difference; if that does not fit, the earlier reservation
+        stays until the caller releases it.
+        """
+        need = self.predicted_footprint(kind, size)
+        with self._lock:
+            extra = need - self._reservations.get(key, 0)
+            if key in self._reservations and extra <= 0:
+                return True
+            free = self._probe()
+            if free is not None and not self._fits(free, extra):
+                self._deferred += 1
+                self._waiting[key] = need
+                logger.info(
+                    "%s needs %.1f GB on %s; %.1f GB free, %.1f GB still to "
+                    "be written by running imports",
+                    key,
+                    need / GIBIBYTE,
+                    self.root,
+                    free / GIBIBYTE,
+                    self._outstanding(free) / GIBIBYTE,
+                )
+                return False
+            if free is not None and self._free_baseline is None:
+                self._free_baseline = free
+            self._waiting.pop(key, None)
+            if key not in self._reservations:
+                self._admitted += 1
+            self._reservations[key] = need
+            return True
+
+    def release(self, key: str) -> None:
+        """
+        End the reservation of ``key`` and resubmit the waiting files that
+        fit into the space it leaves.
+        """
+        with self._lock:
+            if key not in self._reservations:
+                return
+            free = self._probe()
+            if free is not None and self._free_baseline is not None:
+                # The finished import takes its written bytes out of the
+                # baseline, so they are not credited to the others.
+                written = self._written(free)
+                written_by_others = written - min(self._reservations[key], written)
+                self._free_baseline = free + written_by_others
+            del self._reservations[key]
+            if not self._reservations:
+                self._free_baseline = None
+            ready = self._take_ready(free)
+        if self.resubmit is not None:
+            for waiting_key in ready:
+                self.resubmit(waiting_key)
+
+    def _take_ready(self, free: int | None) -> list[str]:
+        """Pop the waiting keys that fit together, oldest first (lock held)."""
+        ready = []
+        planned = 0
+        for waiting_key, need in list(self._waiting.items()):
+            if not self._fits(free, planned + need):
+                # Later, smaller files do not overtake the oldest one.
+                break
+            planned += need
+            ready.append(waiting_key)
+            del self._waiting[waiting_key]
+        return ready
+
+    def forget(self, key: str) -> None:
+        """Drop ``key`` from the waiting set, e.g. when its file is gone."""
+        with self._lock:
+            self._waiting.pop(key, None)
+
+    def stats(self) -> AdmissionStats:
+        with self._lock:
+            free = self._probe() if self._reservations else None
+            reserved = sum(self._reservations.values())
+            return AdmissionStats(
+                reserved_bytes=reserved,
+                outstanding_bytes=(
+                    reserved if free is None else self._outstanding(free)
+                ),
+                reservations=len(self._reservations),
+                admitted=self._admitted,
+                deferred=self._deferred,
+                waiting=len(self._waiting),
+            )
@@ -0,0 +1,164 @@
+"""
+Group ready report files into batches for bulk PDF drops.
+
+When a hospital system exports thousands of reports at once, per-file
+overhead dominates: center resolution, a duplicate lookup and ledger commits
+for every file. With ``WATCHER_REPORT_BATCH_SIZE`` set, report files that
+passed their readiness check are collected here and imported together once
+the batch is full or ``WATCHER_REPORT_BATCH_SECONDS`` have passed since its
+first file arrived.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .settings import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+
+def configured_batch_size() -> int:
+    return env_int("WATCHER_REPORT_BATCH_SIZE", 0, minimum=0)
+
+
+def configured_batch_seconds() -> float:
+    return env_float("WATCHER_REPORT_BATCH_SECONDS", 2.0, minimum=0.0)
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """A ready report and the lease its watcher holds on it."""
+
+    path: str
+    lease_token: str
+
+
+@dataclass
+class ReportBatchContext:
+    """Work done once per batch and shared by its files."""
+
+    center: Any
+    content_hashes: dict[str, str] = field(default_factory=dict)
+    imported_hashes: set[str] = field(default_factory=set)
+
+
+class ReportBatcher:
+    """
+    Collect batch items and hand each full or expired batch to ``emit``.
+
+    ``emit`` runs on the batcher thread and must not block on the import
+    itself; the watcher submits the batch to the report lane.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[list[BatchItem]], None],
+        *,
+        max_size: int,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        autostart: bool = True,
+    ) -> None:
+        self.emit = emit
+        self.max_size = max(max_size, 1)
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.autostart = autostart
+        self._items: list[BatchItem] = []
+        self._deadline: float | None = None
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def add(self, item: BatchItem) -> None:
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("report batcher is stopped")
+            self._items.append(item)
+            if self._deadline is None:
+                self._deadline = self.clock() + self.window_seconds
+            full = len(self._items) >= self.max_size
+            if not full:
+                self._ensure_thread()
+                self._condition.notify()
+                return
+            batch = self._take_locked()
+        self._emit(batch)
+
+    def flush_due(self, now: float | None = None) -> int:
+        """Emit the open batch if its window has passed; returns its size."""
+        with self._condition:
+            current = self.clock() if now is None else now
+            if self._deadline is None or current < self._deadline:
+                return 0
+            batch = self._take_locked()
+        self._emit(batch)
+        return len(batch)
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._items)
+
+    def stop(self) -> list[BatchItem]:
+        """Stop batching and return the items of the unsent batch."""
+        with self._condition:
+            self._stopped = True
+            remaining = self._take_locked()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        return remaining
+
+    def _take_locked(self) -> list[BatchItem]:
+        batch, self._items = self._items, []
+        self._deadline = None
+        return batch
+
+    def _emit(self, batch: list[BatchItem]) -> None:
+        if not batch:
+            return
+        try:
+            self.emit(batch)
+        except Exception as exc:
+            logger.error("Could not submit report batch of %s: %s", len(batch), exc)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._stopped or not self.autostart:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="watcher-report-batch", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and self._deadline is None:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                assert self._deadline is not None
+                delay = self._deadline - self.clock()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+            self.flush_due()
+
+
+def configured_report_batcher(
+    emit: Callable[[list[BatchItem]], None],
+) -> ReportBatcher | None:
+    max_size = configured_batch_size()
+    if max_size < 2:
+        return None
+    return ReportBatcher(
+        emit, max_size=max_size, window_seconds=configured_batch_seconds()
+    )
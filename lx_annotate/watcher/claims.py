@@ -0,0 +1,352 @@
+"""
+Claim markers (leases) for intake files on shared intake mounts.
+
+A claim is a small JSON file next to the intake file, created with
+``O_CREAT | O_EXCL`` so exactly one watcher on a shared intake mount wins it.
+In Celery ingest mode its token doubles as the Celery task id, which makes the
+ingest task keyed per file: a worker only ingests a file whose claim carries
+its own task id. Inline watchers take the active claim directly, so several
+watcher hosts can split one intake directory.
+
+States::
+
+    report.pdf.lock          queued: claimed by a watcher, task enqueued
+    report.pdf.ingest.lock   active: a watcher or worker is ingesting the file
+
+Both names end in ``.lock`` and are therefore ignored by the watcher itself.
+
+Claims are leases: the holder renews the marker mtime through a
+:class:`ClaimKeeper` while it holds the claim. A marker that was not renewed
+within ``WATCHER_LEASE_TTL_SECONDS``, or whose owner process on this host is
+gone, is stale and is broken by the next watcher or worker that wants the file.
+
+Between Celery retries nobody holds the claim. ``requeue_claim`` therefore
+dates the queued marker forward to the retry time, so the lease runs out one
+TTL after the retry was due, and the marker names the task, not the worker
+process, as its owner.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from .settings import env_float
+
+logger = logging.getLogger(__name__)
+
+QUEUED_CLAIM_SUFFIX = ".lock"
+ACTIVE_CLAIM_SUFFIX = ".ingest.lock"
+DEFAULT_LEASE_TTL_SECONDS = 120.0
+
+
+@dataclass(frozen=True)
+class Claim:
+    token: str
+    owner: str
+    claimed_at: float
+
+
+def lease_ttl_seconds() -> float:
+    return env_float(
+        "WATCHER_LEASE_TTL_SECONDS", DEFAULT_LEASE_TTL_SECONDS, minimum=1.0
+    )
+
+
+def queued_claim_path(path: Path) -> Path:
+    return path.with_name(path.name + QUEUED_CLAIM_SUFFIX)
+
+
+def active_claim_path(path: Path) -> Path:
+    return path.with_name(path.name + ACTIVE_CLAIM_SUFFIX)
+
+
+def _claim_path(path: Path, active: bool) -> Path:
+    return active_claim_path(path) if active else queued_claim_path(path)
+
+
+def claim_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def ingest_task_id(
+    kind: str,
+    path: Path,
+    stat_result: os.stat_result,
+    content_hash: str = "",
+) -> str:
+    """
+    Stable task id for one version of one intake file.
+
+    Re-enqueuing the same file yields the same id, so redeliveries and
+    repeated claims resolve to the same claim token.
+    """
+    if content_hash:
+        key = f"{kind}:{content_hash}"
+    else:
+        key = f"{kind}:{path.name}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+    return "watcher-ingest-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:40]
+
+
+def new_lease_token() -> str:
+    return f"watcher-lease-{uuid.uuid4().hex}"
+
+
+def _read(marker: Path) -> Claim | None:
+    try:
+        payload = json.loads(marker.read_text(encoding="utf-8"))
+        return Claim(
+            token=str(payload["token"]),
+            owner=str(payload.get("owner", "")),
+            claimed_at=float(payload.get("claimed_at", 0.0)),
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Unreadable claim marker %s: %s", marker, exc)
+        return None
+
+
+def read_claim(path: Path, *, active: bool = False) -> Claim | None:
+    return _read(_claim_path(path, active))
+
+
+def _owner_is_gone(owner: str) -> bool:
+    """Whether ``owner`` names a process on this host that no longer runs."""
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def _is_stale(marker: Path, ttl: float) -> bool:
+    try:
+        renewed_at = marker.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    if time.time() - renewed_at > ttl:
+        return True
+    claim = _read(marker)
+    return claim is not None and _owner_is_gone(claim.owner)
+
+
+def _break_if_stale(marker: Path, ttl: float) -> bool:
+    """
+    Remove ``marker`` if its lease ran out; ``True`` if it was removed.
+
+    The marker is first renamed to a unique hidden name, so of several
+    watchers breaking the same lease only one succeeds.
+    """
+    if not _is_stale(marker, ttl):
+        return False
+    graveyard = marker.with_name(f".{marker.name}.{uuid.uuid4().hex}.stale")
+    try:
+        os.rename(marker, graveyard)
+    except FileNotFoundError:
+        return False
+    claim = _read(graveyard)
+    if not _is_stale(graveyard, ttl):
+        # Renewed between the check and the rename: put it back.
+        try:
+            os.link(graveyard, marker)
+        except FileExistsError:
+            pass
+        graveyard.unlink(missing_ok=True)
+        return False
+    graveyard.unlink(missing_ok=True)
+    logger.warning(
+        "Reclaimed stale claim %s held by %s",
+        marker,
+        claim.owner if claim is not None else "unknown owner",
+    )
+    return True
+
+
+def is_claimed(path: Path, *, ttl: float | None = None) -> bool:
+    """Whether ``path`` carries a claim that has not gone stale."""
+    ttl = lease_ttl_seconds() if ttl is None else ttl
+    return any(
+        marker.exists() and not _is_stale(marker, ttl)
+        for marker in (queued_claim_path(path), active_claim_path(path))
+    )
+
+
+def _create(marker: Path, token: str, *, owner: str | None = None) -> bool:
+    payload = json.dumps(
+        {
+            "token": token,
+            "owner": claim_owner() if owner is None else owner,
+            "claimed_at": time.time(),
+        }
+    ).encode("utf-8")
+    try:
+        descriptor = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except FileExistsError:
+        return False
+    try:
+        os.write(descriptor, payload)
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+    return True
+
+
+def claim_file(
+    path: Path,
+    token: str,
+    *,
+    active: bool = False,
+    ttl: float | None = None,
+) -> bool:
+    """
+    Claim ``path``; ``False`` if anyone holds a live claim on it.
+
+    Stale claims are broken first. ``active=True`` takes the active claim
+    directly, for watchers that ingest the file themselves.
+    """
+    ttl = lease_ttl_seconds() if ttl is None else ttl
+    queued, running = queued_claim_path(path), active_claim_path(path)
+    for marker in (running, queued):
+        _break_if_stale(marker, ttl)
+    if running.exists():
+        return False
+    target, other = (running, queued) if active else (queued, running)
+    if not _create(target, token):
+        return False
+    if other.exists():
+        # Someone took the other state between our check and the create.
+        target.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def activate_claim(path: Path, token: str) -> bool:
+    """
+    Move a queued claim carrying ``token`` to the active state.
+
+    The active marker is created exclusively and carries the caller as
+    owner, so two deliveries of the same task cannot both start ingest.
+    """
+    claim = read_claim(path)
+    if claim is None or claim.token != token:
+        return False
+    if not _create(active_claim_path(path), token):
+        return False
+    queued_claim_path(path).unlink(missing_ok=True)
+    return True
+
+
+def requeue_claim(path: Path, token: str, *, hold_seconds: float = 0.0) -> bool:
+    """
+    Return an active claim to the queued state before a task retry.
+
+    The queued lease is held for ``hold_seconds`` plus the TTL, so a retry
+    with that countdown still finds its claim.
+    """
+    claim = read_claim(path, active=True)
+    if claim is None or claim.token != token:
+        return False
+    queued = queued_claim_path(path)
+    if not _create(queued, token, owner=f"task:{token}"):
+        return False
+    if hold_seconds > 0:
+        held_until = time.time() + hold_seconds
+        os.utime(queued, (held_until, held_until))
+    active_claim_path(path).unlink(missing_ok=True)
+    return True
+
+
+def renew_claim(path: Path, token: str, *, active: bool) -> bool:
+    """Extend the lease on a claim carrying ``token``; ``False`` if it is gone."""
+    marker = _claim_path(path, active)
+    claim = _read(marker)
+    if claim is None or claim.token != token:
+        return False
+    try:
+        os.utime(marker)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def release_claim(path: Path, token: str) -> None:
+    for active in (True, False):
+        claim = read_claim(path, active=active)
+        if claim is None or claim.token != token:
+            continue
+        _claim_path(path, active).unlink(missing_ok=True)
+
+
+class ClaimKeeper:
+    """
+    Renew the claims held by this process until they are released.
+
+    A daemon thread renews every held claim three times per lease TTL. Claims
+    that disappeared or changed hands are dropped silently.
+    """
+
+    def __init__(self, *, ttl_seconds: float | None = None) -> None:
+        self.ttl_seconds = lease_ttl_seconds() if ttl_seconds is None else ttl_seconds
+        self._held: dict[tuple[str, bool], str] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def hold(self, path: Path, token: str, *, active: bool) -> None:
+        with self._lock:
+            self._held[(str(path), active)] = token
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="watcher-claims", daemon=True
+                )
+                self._thread.start()
+
+    def drop(self, path: Path, *, active: bool) -> None:
+        with self._lock:
+            self._held.pop((str(path), active), None)
+
+    def held(self) -> int:
+        with self._lock:
+            return len(self._held)
+
+    def renew_all(self) -> int:
+        with self._lock:
+            held = list(self._held.items())
+        renewed = 0
+        for (path, active), token in held:
+            try:
+                still_held = renew_claim(Path(path), token, active=active)
+            except OSError as exc:
+                logger.warning("Could not renew claim on %s: %s", path, exc)
+                continue
+            if still_held:
+                renewed += 1
+                continue
+            with self._lock:
+                if self._held.get((path, active)) == token:
+                    del self._held[(path, active)]
+        return renewed
+
+    def stop(self) -> None:
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.ttl_seconds / 3):
+            self.renew_all()
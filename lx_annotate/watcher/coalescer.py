@@ -0,0 +1,165 @@
+"""
+Debounce file-system events before they reach the watcher lanes.
+
+Scanners and copy tools create, write, rename and touch a file in quick
+succession. Every event for a path inside the debounce window is merged into
+one readiness candidate, so a bulk drop of hundreds of PDFs submits each file
+once instead of once per event.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .settings import env_float
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_SECONDS = 1.0
+
+
+def configured_debounce_seconds() -> float:
+    return env_float("WATCHER_DEBOUNCE_SECONDS", DEFAULT_DEBOUNCE_SECONDS, minimum=0.0)
+
+
+@dataclass(frozen=True)
+class CoalescerStats:
+    raw_events: int
+    coalesced_events: int
+    pending: int
+
+
+class EventCoalescer:
+    """
+    Merge events per path and emit each path once its window has passed.
+
+    ``add`` opens (or extends) the window of a path, ``touch`` only extends
+    an open window, ``settle`` emits a pending path right away (its writer
+    closed it), and ``discard`` drops a path whose file went away. With a
+    window of zero, candidates are emitted straight from ``add``.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[str], None],
+        *,
+        window_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        autostart: bool = True,
+    ) -> None:
+        self.emit = emit
+        self.window_seconds = (
+            configured_debounce_seconds() if window_seconds is None else window_seconds
+        )
+        self.clock = clock
+        self.autostart = autostart
+        self._pending: dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._raw_events = 0
+        self._coalesced_events = 0
+
+    def add(self, path: str) -> None:
+        """Record an event that makes ``path`` a readiness candidate."""
+        if self.window_seconds <= 0:
+            with self._condition:
+                self._raw_events += 1
+                self._coalesced_events += 1
+            self._emit(path)
+            return
+        with self._condition:
+            self._raw_events += 1
+            self._pending.pop(path, None)
+            self._pending[path] = self.clock() + self.window_seconds
+            self._ensure_thread()
+            self._condition.notify()
+
+    def touch(self, path: str) -> None:
+        """Record an event that only matters for an already pending path."""
+        with self._condition:
+            self._raw_events += 1
+            if path in self._pending:
+                del self._pending[path]
+                self._pending[path] = self.clock() + self.window_seconds
+
+    def settle(self, path: str) -> None:
+        """Record a close event; a pending ``path`` is emitted immediately."""
+        with self._condition:
+            self._raw_events += 1
+            if self._pending.pop(path, None) is None:
+                return
+            self._coalesced_events += 1
+        self._emit(path)
+
+    def discard(self, path: str) -> None:
+        with self._condition:
+            self._raw_events += 1
+            self._pending.pop(path, None)
+
+    def flush_due(self) -> int:
+        """Emit every path whose window has passed; returns how many."""
+        now = self.clock()
+        with self._condition:
+            # Windows are extended by re-inserting, so the dict stays ordered
+            # by deadline.
+            due = []
+            for path, deadline in self._pending.items():
+                if deadline > now:
+                    break
+                due.append(path)
+            for path in due:
+                del self._pending[path]
+            self._coalesced_events += len(due)
+        for path in due:
+            self._emit(path)
+        return len(due)
+
+    def stats(self) -> CoalescerStats:
+        with self._condition:
+            return CoalescerStats(
+                raw_events=self._raw_events,
+                coalesced_events=self._coalesced_events,
+                pending=len(self._pending),
+            )
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def _emit(self, path: str) -> None:
+        try:
+            self.emit(path)
+        except Exception as exc:
+            logger.error("Could not submit coalesced event for %s: %s", path, exc)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._stopped or not self.autostart:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="watcher-debounce", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and not self._pending:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                next_deadline = next(iter(self._pending.values()))
+                delay = next_deadline - self.clock()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+            self.flush_due()
@@ -0,0 +1,119 @@
+"""
+SHA-256 of intake files computed while the watcher waits for them.
+
+The readiness wait polls a file until it is complete anyway; hashing the bytes
+that arrived since the previous poll lets the watcher know the content hash
+the moment the file is ready, without a second full read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ContentHash:
+    sha256: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        return (self.size, self.mtime_ns, self.inode) == (
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+            stat_result.st_ino,
+        )
+
+
+class IncrementalHasher:
+    """
+    Hash a file that may still be growing.
+
+    Each ``update`` reads only bytes appended since the previous call. The
+    digest starts over when the file is replaced, truncated, or modified
+    without growing; writers that patch earlier bytes in place must use the
+    atomic handoff (temp name + rename) described in the watcher README.
+    """
+
+    def __init__(self, path: Path, *, chunk_size: int = HASH_CHUNK_SIZE) -> None:
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._digest = hashlib.sha256()
+        self._offset = 0
+        self._identity: tuple[int, int] | None = None
+        self._last_mtime_ns = -1
+        self.bytes_hashed = 0
+
+    def update(self, _path: Path | None = None) -> None:
+        """Hash newly appended bytes; never raises for filesystem errors."""
+        try:
+            self._update()
+        except OSError as exc:
+            logger.debug("Incremental hash of %s paused: %s", self.path, exc)
+
+    def finish(self) -> ContentHash | None:
+        """
+        Return the digest of the complete file, or ``None`` if the file
+        changed while the final bytes were read.
+        """
+        try:
+            self._update()
+            stat_result = os.stat(self.path)
+        except OSError as exc:
+            logger.debug("Incremental hash of %s failed: %s", self.path, exc)
+            return None
+        if (
+            self._identity != (stat_result.st_dev, stat_result.st_ino)
+            or stat_result.st_size != self._offset
+            or stat_result.st_mtime_ns != self._last_mtime_ns
+        ):
+            return None
+        return ContentHash(
+            sha256=self._digest.hexdigest(),
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            inode=stat_result.st_ino,
+        )
+
+    def _reset(self) -> None:
+        self._digest = hashlib.sha256()
+        self._offset = 0
+
+    def _update(self) -> None:
+        with open(self.path, "rb") as handle:
+            stat_result = os.fstat(handle.fileno())
+            identity = (stat_result.st_dev, stat_result.st_ino)
+            if (
+                identity != self._identity
+                or stat_result.st_size < self._offset
+                or (
+                    stat_result.st_size == self._offset
+                    and stat_result.st_mtime_ns != self._last_mtime_ns
+                    and self._offset > 0
+                )
+            ):
+                if self._identity is not None:
+                    logger.debug("Restarting hash of rewritten file %s", self.path)
+                self._reset()
+                self._identity = identity
+
+            handle.seek(self._offset)
+            remaining = stat_result.st_size - self._offset
+            while remaining > 0:
+                chunk = handle.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                self._digest.update(chunk)
+                self._offset += len(chunk)
+                self.bytes_hashed += len(chunk)
+                remaining -= len(chunk)
+            self._last_mtime_ns = os.fstat(handle.fileno()).st_mtime_ns
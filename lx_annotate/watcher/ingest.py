@@ -0,0 +1,163 @@
+"""
+Celery-side ingest of intake files claimed by a watcher.
+
+With ``WATCHER_INGEST_MODE=celery`` the watcher only detects, stabilises and
+claims files; ``lx_annotate.ingest_watcher_file`` tasks on
+``CELERY_PIPELINE_QUEUE`` run the actual import on any worker host that
+mounts the intake directories.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from .claims import ClaimKeeper, activate_claim, release_claim, requeue_claim
+from .ledger import (
+    OUTCOME_DEFERRED,
+    OUTCOME_DUPLICATE,
+    OUTCOME_FAILED,
+    OUTCOME_SUCCEEDED,
+)
+from .quarantine import RetryPolicy, quarantine_file
+from .settings import env_str
+
+logger = logging.getLogger(__name__)
+
+INGEST_MODE_INLINE = "inline"
+INGEST_MODE_CELERY = "celery"
+
+INGEST_STATUS_SUCCEEDED = "succeeded"
+INGEST_STATUS_DUPLICATE = "duplicate"
+INGEST_STATUS_MISSING = "missing"
+INGEST_STATUS_CLAIMED_ELSEWHERE = "claimed_elsewhere"
+INGEST_STATUS_FAILED = "failed"
+INGEST_STATUS_DEFERRED = "deferred"
+
+
+def configured_ingest_mode() -> str:
+    mode = env_str("WATCHER_INGEST_MODE", INGEST_MODE_INLINE).lower()
+    if mode not in {INGEST_MODE_INLINE, INGEST_MODE_CELERY}:
+        logger.warning("Unknown WATCHER_INGEST_MODE=%s; using inline ingest", mode)
+        return INGEST_MODE_INLINE
+    return mode
+
+
+def ingest_max_retries() -> int:
+    return RetryPolicy.from_env().max_failures - 1
+
+
+def ingest_retry_countdown(retries: int) -> int:
+    return min(30 * (2**retries), 15 * 60)
+
+
+@dataclass(frozen=True)
+class ClaimedIngestResult:
+    status: str
+    error: str = ""
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in {INGEST_STATUS_FAILED, INGEST_STATUS_DEFERRED}
+
+
+_claims_lock = threading.Lock()
+_claims: ClaimKeeper | None = None
+
+
+def _worker_claims() -> ClaimKeeper:
+    """Renews the claims of the imports running in this worker process."""
+    global _claims
+    with _claims_lock:
+        if _claims is None:
+            _claims = ClaimKeeper()
+        return _claims
+
+
+def _unchanged(path: Path, size: int, mtime_ns: int) -> bool:
+    """Whether ``path`` still has the size and mtime the watcher hashed."""
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return False
+    return (stat_result.st_size, stat_result.st_mtime_ns) == (size, mtime_ns)
+
+
+def ingest_claimed_file(
+    *,
+    file_path: str,
+    kind: str,
+    claim_token: str,
+    content_hash: str = "",
+    size: int = -1,
+    mtime_ns: int = -1,
+    retry_countdown: float = 0.0,
+) -> ClaimedIngestResult:
+    """
+    Import one claimed intake file; safe to call repeatedly for the same task.
+
+    The file is only imported while its queued claim carries ``claim_token``;
+    the claim is switched to active for the duration of the import. After a
+    retryable failure the claim is queued again and held for
+    ``retry_countdown`` seconds, the delay of the task's next attempt.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        # Imported (and moved away) by an earlier delivery of this task.
+        release_claim(path, claim_token)
+        return ClaimedIngestResult(INGEST_STATUS_MISSING)
+    if not activate_claim(path, claim_token):
+        logger.info("Skipping %s: claim is held by another task", path)
+        return ClaimedIngestResult(INGEST_STATUS_CLAIMED_ELSEWHERE)
+
+    from ..file_watcher import ingest_intake_file
+
+    if content_hash and not _unchanged(path, size, mtime_ns):
+        content_hash = ""
+    claims = _worker_claims()
+    claims.hold(path, claim_token, active=True)
+    requeue = False
+    try:
+        result = ingest_intake_file(kind, path, content_hash=content_hash)
+        if result.outcome == OUTCOME_SUCCEEDED:
+            return ClaimedIngestResult(INGEST_STATUS_SUCCEEDED)
+        if result.outcome == OUTCOME_DUPLICATE:
+            return ClaimedIngestResult(INGEST_STATUS_DUPLICATE)
+        requeue = True
+        if result.outcome == OUTCOME_DEFERRED:
+            return ClaimedIngestResult(INGEST_STATUS_DEFERRED, result.error)
+        if result.outcome == OUTCOME_FAILED:
+            return ClaimedIngestResult(INGEST_STATUS_FAILED, result.error)
+        return ClaimedIngestResult(
+            INGEST_STATUS_FAILED, f"unexpected outcome {result.outcome}"
+        )
+    finally:
+        claims.drop(path, active=True)
+        if requeue and path.exists():
+            requeue_claim(path, claim_token, hold_seconds=retry_countdown)
+        else:
+            release_claim(path, claim_token)
+
+
+def return_claimed_file(*, file_path: str, claim_token: str) -> None:
+    """Give up the claim so the next watcher rescan enqueues the file again."""
+    release_claim(Path(file_path), claim_token)
+
+
+def quarantine_claimed_file(
+    *,
+    file_path: str,
+    claim_token: str,
+    reason: str,
+    failures: int,
+) -> None:
+    path = Path(file_path)
+    try:
+        if path.exists():
+            quarantine_file(path, reason=reason or "Import failed", failures=failures)
+    except OSError as exc:
+        logger.error("Could not quarantine %s: %s", path, exc)
+    finally:
+        release_claim(path, claim_token)
@@ -0,0 +1,305 @@
+"""
+Per-kind worker lanes for watcher intake.
+
+Each intake kind (video, report, pseudonymized) gets its own queue and worker
+threads so a long video import cannot block report or pseudonymized files.
+Within a lane, files start in the order of their priority rank (see
+``priority``).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .priority import DurationEstimator, IntakeRank, QueuedFile
+from .settings import env_int
+
+logger = logging.getLogger(__name__)
+
+LANE_VIDEO = "video"
+LANE_REPORT = "report"
+LANE_PSEUDONYMIZED = "pseudonymized"
+LANE_CONTROL = "control"
+INTAKE_LANES = (LANE_VIDEO, LANE_REPORT, LANE_PSEUDONYMIZED)
+
+LANE_WORKER_ENV = {
+    LANE_VIDEO: "WATCHER_VIDEO_WORKERS",
+    LANE_REPORT: "WATCHER_REPORT_WORKERS",
+    LANE_PSEUDONYMIZED: "WATCHER_PSEUDONYMIZED_WORKERS",
+}
+
+
+def configured_lane_workers() -> dict[str, int]:
+    workers = {
+        lane: env_int(env_name, 1, minimum=1)
+        for lane, env_name in LANE_WORKER_ENV.items()
+    }
+    workers[LANE_CONTROL] = 1
+    return workers
+
+
+@dataclass(frozen=True)
+class LaneSnapshot:
+    name: str
+    max_workers: int
+    queued: int
+    running: int
+    completed: int
+    failed: int
+
+
+@dataclass
+class _LaneTask:
+    future: Future
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    rank: IntakeRank | None = None
+    started_at: float | None = None
+
+
+class WorkerLane:
+    """
+    Priority queue drained by a fixed number of daemon worker threads.
+
+    Ranked tasks start in rank-key order; unranked tasks (housekeeping) are
+    queued ahead of them in submit order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_workers: int = 1,
+        estimator: DurationEstimator | None = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.name = name
+        self.max_workers = max_workers
+        self.estimator = estimator
+        self._condition = threading.Condition()
+        self._pending: list[tuple[float, int, _LaneTask]] = []
+        self._sequence = itertools.count()
+        self._active: dict[int, _LaneTask] = {}
+        self._threads: list[threading.Thread] = []
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return self.submit_ranked(None, fn, *args, **kwargs)
+
+    def submit_ranked(
+        self,
+        rank: IntakeRank | None,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Future:
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError(f"cannot submit to lane {self.name} after shutdown")
+            key = rank.key if rank is not None else float("-inf")
+            heapq.heappush(
+                self._pending,
+                (key, next(self._sequence), _LaneTask(future, fn, args, kwargs, rank)),
+            )
+            self._ensure_workers()
+            self._condition.notify()
+        return future
+
+    def queued_files(self) -> tuple[list[QueuedFile], list[QueuedFile]]:
+        """Ranked files running and waiting in this lane, waiting in start order."""
+        with self._condition:
+            running = [task for task in self._active.values() if task.rank]
+            pending = [entry[2] for entry in sorted(self._pending) if entry[2].rank]
+        return (
+            [self._queued_file(task) for task in running],
+            [self._queued_file(task) for task in pending],
+        )
+
+    def _queued_file(self, task: _LaneTask) -> QueuedFile:
+        rank = task.rank
+        assert rank is not None
+        estimate = (
+            self.estimator.estimate(rank.kind, rank.size)
+            if self.estimator is not None
+            else 0.0
+        )
+        return QueuedFile(
+            lane=self.name,
+            path=rank.path,
+            kind=rank.kind,
+            size=rank.size,
+            center_key=rank.center_key,
+            submitted_at=rank.submitted_at,
+            estimate_seconds=estimate,
+            started_at=task.started_at,
+        )
+
+    def snapshot(self) -> LaneSnapshot:
+        with self._condition:
+            return LaneSnapshot(
+                name=self.name,
+                max_workers=self.max_workers,
+                queued=len(self._pending),
+                running=self._running,
+                completed=self._completed,
+                failed=self._failed,
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _ensure_workers(self) -> None:
+        # Workers are started lazily so constructing a handler never spawns
+        # threads before the main-thread OCR preload has run.
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"FileProcessor-{self.name}_{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_task(self) -> tuple[int, _LaneTask] | None:
+        with self._condition:
+            while not self._pending and not self._shutdown:
+                self._condition.wait()
+            if not self._pending:
+                return None
+            _key, sequence, task = heapq.heappop(self._pending)
+            task.started_at = time.time()
+            self._active[sequence] = task
+            self._running += 1
+            return sequence, task
+
+    def _worker_loop(self) -> None:
+        while True:
+            next_task = self._next_task()
+            if next_task is None:
+                return
+            sequence, task = next_task
+
+            failed = False
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    try:
+                        result = task.fn(*task.args, **task.kwargs)
+                    except BaseException as exc:
+                        failed = True
+                        task.future.set_exception(exc)
+                        logger.error(
+                            "Unhandled error in %s lane worker: %s",
+                            self.name,
+                            exc,
+                            exc_info=True,
+                        )
+                    else:
+                        task.future.set_result(result)
+            finally:
+                if (
+                    task.rank is not None
+                    and task.started_at is not None
+                    and self.estimator is not None
+                ):
+                    self.estimator.record(
+                        task.rank.kind,
+                        task.rank.size,
+                        time.time() - task.started_at,
+                    )
+                with self._condition:
+                    self._active.pop(sequence, None)
+                    self._running -= 1
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+
+
+class IntakeLaneExecutor:
+    """
+    Executor facade that routes each submission to the lane of its file.
+
+    ``submit(fn, file_path)`` is classified by ``classify(file_path)``; calls
+    without a path argument (rescans, housekeeping) run on the control lane.
+    When ``rank`` is given, intake submissions are ordered by
+    ``rank(file_path)`` within their lane.
+    """
+
+    def __init__(
+        self,
+        *,
+        classify: Callable[[str], str],
+        lane_workers: dict[str, int] | None = None,
+        rank: Callable[[str], IntakeRank | None] | None = None,
+    ) -> None:
+        workers = configured_lane_workers()
+        workers.update(lane_workers or {})
+        self._classify = classify
+        self._rank = rank
+        self.estimator = DurationEstimator()
+        self.lanes: dict[str, WorkerLane] = {
+            name: WorkerLane(name, max_workers=max_workers, estimator=self.estimator)
+            for name, max_workers in workers.items()
+        }
+
+    def lane_for(self, *args: Any) -> str:
+        if args and isinstance(args[0], (str, Path)):
+            lane_name = self._classify(str(args[0]))
+            if lane_name in self.lanes:
+                return lane_name
+        return LANE_CONTROL
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        lane_name = self.lane_for(*args)
+        rank = None
+        if self._rank is not None and lane_name != LANE_CONTROL:
+            rank = self._rank(str(args[0]))
+        return self.lanes[lane_name].submit_ranked(rank, fn, *args, **kwargs)
+
+    def queued_files(self) -> tuple[list[QueuedFile], list[QueuedFile]]:
+        running: list[QueuedFile] = []
+        pending: list[QueuedFile] = []
+        for lane in self.lanes.values():
+            lane_running, lane_pending = lane.queued_files()
+            running.extend(lane_running)
+            pending.extend(lane_pending)
+        return running, pending
+
+    def snapshot(self) -> dict[str, LaneSnapshot]:
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
+
+    def queue_depth(self) -> int:
+        return sum(
+            snapshot.queued
+            for name, snapshot in self.snapshot().items()
+            if name != LANE_CONTROL
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        for lane in self.lanes.values():
+            lane.shutdown(wait=False)
+        if wait:
+            for lane in self.lanes.values():
+                lane.shutdown(wait=True)
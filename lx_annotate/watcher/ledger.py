@@ -0,0 +1,455 @@
+"""
+Durable ledger of intake files the watcher has already decided on.
+
+The ledger is a small SQLite index next to the application data. It replaces
+the in-memory ``processed_files`` set so restarts and periodic rescans only
+look at files whose path, size or mtime the ledger has not seen yet.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .settings import env_float, env_str
+
+logger = logging.getLogger(__name__)
+
+OUTCOME_PROCESSING = "processing"
+OUTCOME_SUCCEEDED = "succeeded"
+OUTCOME_FAILED = "failed"
+OUTCOME_DEFERRED = "deferred"
+OUTCOME_INTERRUPTED = "interrupted"
+OUTCOME_QUARANTINED = "quarantined"
+OUTCOME_DUPLICATE = "duplicate"
+OUTCOME_ENQUEUED = "enqueued"
+
+# Entries in these states are not picked up again while the file is unchanged.
+SETTLED_OUTCOMES = frozenset(
+    {OUTCOME_PROCESSING, OUTCOME_SUCCEEDED, OUTCOME_QUARANTINED, OUTCOME_DUPLICATE}
+)
+
+SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS intake_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL DEFAULT '',
+    outcome TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    first_seen_at REAL NOT NULL,
+    last_attempt_at REAL,
+    updated_at REAL NOT NULL,
+    next_attempt_at REAL
+);
+CREATE INDEX IF NOT EXISTS intake_files_updated_at ON intake_files (updated_at);
+"""
+_COLUMNS = (
+    "path",
+    "size",
+    "mtime_ns",
+    "content_hash",
+    "outcome",
+    "attempts",
+    "failures",
+    "last_error",
+    "first_seen_at",
+    "last_attempt_at",
+    "updated_at",
+    "next_attempt_at",
+)
+
+
+def configured_ledger_path() -> Path:
+    configured = env_str("WATCHER_LEDGER_PATH", "")
+    if configured:
+        return Path(configured).expanduser()
+
+    from django.conf import settings
+
+    return Path(settings.APP_DATA_DIR) / "watcher" / "intake_ledger.sqlite3"
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    outcome: str
+    attempts: int
+    failures: int
+    last_error: str
+    first_seen_at: float
+    last_attempt_at: float | None
+    updated_at: float
+    next_attempt_at: float | None = None
+
+    def matches(self, stat_result: os.stat_result | None) -> bool:
+        if stat_result is None:
+            return True
+        if self.size < 0:
+            return True
+        return (self.size, self.mtime_ns) == (
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+        )
+
+
+def _stat_or_none(path: str) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class IntakeLedger:
+    """
+    Thread-safe SQLite ledger with an in-memory index of all live entries.
+
+    Lookups never touch SQLite; only state changes are written through.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str | None = None,
+        *,
+        retention_seconds: float | None = None,
+        compact_interval_seconds: float = 3600.0,
+    ) -> None:
+        self.db_path = Path(db_path) if db_path is not None else None
+        self.retention_seconds = (
+            retention_seconds
+            if retention_seconds is not None
+            else env_float("WATCHER_LEDGER_RETENTION_DAYS", 30.0, minimum=0.0) * 86400
+        )
+        self.compact_interval_seconds = compact_interval_seconds
+        self._lock = threading.RLock()
+        self._connection: sqlite3.Connection | None = None
+        self._entries: dict[str, LedgerEntry] = {}
+        self._last_compacted_at = 0.0
+        self._in_transaction = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        database = ":memory:"
+        if self.db_path is not None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                database = str(self.db_path)
+            except OSError as exc:
+                logger.warning(
+                    "Watcher ledger directory unavailable (%s); "
+                    "falling back to an in-memory ledger",
+                    exc,
+                )
+
+        connection = sqlite3.connect(
+            database,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        if database != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        # Rows still marked as processing belong to a run that did not finish.
+        connection.execute(
+            "UPDATE intake_files SET outcome = ? WHERE outcome = ?",
+            (OUTCOME_INTERRUPTED, OUTCOME_PROCESSING),
+        )
+        rows = connection.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM intake_files"
+        ).fetchall()
+        self._entries = {row[0]: LedgerEntry(*row) for row in rows}
+        self._connection = connection
+        logger.info(
+            "Watcher ledger loaded: %s entries from %s", len(self._entries), database
+        )
+        self._compact_locked(time.time())
+        return connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several state changes into one SQLite commit.
+
+        Used for batch bookkeeping; other threads wait on the ledger lock until
+        the block ends, so keep imports themselves outside of it.
+        """
+        with self._lock:
+            connection = self._connect()
+            if self._in_transaction:
+                yield
+                return
+            entries = dict(self._entries)
+            connection.execute("BEGIN")
+            self._in_transaction = True
+            try:
+                yield
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                self._entries = entries
+                raise
+            finally:
+                self._in_transaction = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return len(self._entries)
+
+    def paths(self) -> Iterator[str]:
+        with self._lock:
+            self._connect()
+            return iter(list(self._entries))
+
+    def lookup(self, file_path: str | Path) -> LedgerEntry | None:
+        with self._lock:
+            self._connect()
+            return self._entries.get(str(file_path))
+
+    def is_settled(
+        self,
+        file_path: str | Path,
+        stat_result: os.stat_result | None = None,
+    ) -> bool:
+        entry = self.lookup(file_path)
+        if entry is None or entry.outcome not in SETTLED_OUTCOMES:
+            return False
+        if stat_result is None:
+            stat_result = _stat_or_none(str(file_path))
+        return entry.matches(stat_result)
+
+    def retry_pending(
+        self,
+        file_path: str | Path,
+        stat_result: os.stat_result | None = None,
+        *,
+        now: float | None = None,
+    ) -> bool:
+        """
+        Whether an unchanged failed or deferred file is still inside its
+        backoff window.
+        """
+        entry = self.lookup(file_path)
+        if entry is None or entry.outcome not in (OUTCOME_FAILED, OUTCOME_DEFERRED):
+            return False
+        if entry.next_attempt_at is None:
+            return False
+        if entry.next_attempt_at <= (time.time() if now is None else now):
+            return False
+        if stat_result is None:
+            stat_result = _stat_or_none(str(file_path))
+        return entry.matches(stat_result)
+
+    def record_started(
+        self,
+        file_path: str | Path,
+        stat_result: os.stat_result | None = None,
+    ) -> LedgerEntry:
+        key = str(file_path)
+        if stat_result is None:
+            stat_result = _stat_or_none(key)
+        size = stat_result.st_size if stat_result else -1
+        mtime_ns = stat_result.st_mtime_ns if stat_result else -1
+        now = time.time()
+
+        with self._lock:
+            self._connect()
+            previous = self._entries.get(key)
+            if previous is not None and previous.matches(stat_result):
+                entry = replace(
+                    previous,
+                    size=size,
+                    mtime_ns=mtime_ns,
+                    outcome=OUTCOME_PROCESSING,
+                    attempts=previous.attempts + 1,
+                    last_attempt_at=now,
+                    updated_at=now,
+                    next_attempt_at=None,
+                )
+            else:
+                entry = LedgerEntry(
+                    path=key,
+                    size=size,
+                    mtime_ns=mtime_ns,
+                    content_hash="",
+                    outcome=OUTCOME_PROCESSING,
+                    attempts=1,
+                    failures=0,
+                    last_error="",
+                    first_seen_at=now,
+                    last_attempt_at=now,
+                    updated_at=now,
+                )
+            self._write_locked(entry)
+            return entry
+
+    def record_outcome(
+        self,
+        file_path: str | Path,
+        outcome: str,
+        *,
+        error: str = "",
+        content_hash: str = "",
+        next_attempt_at: float | None = None,
+    ) -> LedgerEntry | None:
+        """
+        Store the outcome of the current attempt.
+
+        Failed outcomes count towards ``failures``; a success clears it.
+        """
+        key = str(file_path)
+        with self._lock:
+            self._connect()
+            previous = self._entries.get(key)
+            if previous is None:
+                return None
+            failures = previous.failures
+            if outcome == OUTCOME_FAILED:
+                failures += 1
+            elif outcome == OUTCOME_SUCCEEDED:
+                failures = 0
+            entry = replace(
+                previous,
+                outcome=outcome,
+                failures=failures,
+                last_error=str(error or "")[:2000],
+                content_hash=content_hash or previous.content_hash,
+                updated_at=time.time(),
+                next_attempt_at=next_attempt_at,
+            )
+            self._write_locked(entry)
+            return entry
+
+    def set_content_hash(self, file_path: str | Path, content_hash: str) -> None:
+        if not content_hash:
+            return
+        with self._lock:
+            self._connect()
+            previous = self._entries.get(str(file_path))
+            if previous is None or previous.content_hash == content_hash:
+                return
+            self._write_locked(replace(previous, content_hash=content_hash))
+
+    def discard(self, file_path: str | Path) -> None:
+        key = str(file_path)
+        with self._lock:
+            connection = self._connect()
+            if self._entries.pop(key, None) is not None:
+                connection.execute("DELETE FROM intake_files WHERE path = ?", (key,))
+
+    def compact(self, *, now: float | None = None) -> int:
+        with self._lock:
+            self._connect()
+            return self._compact_locked(time.time() if now is None else now)
+
+    def compact_if_due(self) -> int:
+        now = time.time()
+        with self._lock:
+            if now - self._last_compacted_at < self.compact_interval_seconds:
+                return 0
+            self._connect()
+            return self._compact_locked(now)
+
+    def _compact_locked(self, now: float) -> int:
+        """
+        Drop old entries that can no longer influence a watcher decision.
+
+        Succeeded and quarantined entries are only dropped once their file has
+        left intake; otherwise an unchanged file would be imported again.
+        """
+        self._last_compacted_at = now
+        cutoff = now - self.retention_seconds
+        stale = [
+            entry.path
+            for entry in self._entries.values()
+            if entry.updated_at < cutoff
+            and entry.outcome != OUTCOME_PROCESSING
+            and (
+                entry.outcome not in SETTLED_OUTCOMES or not os.path.exists(entry.path)
+            )
+        ]
+        if not stale:
+            return 0
+
+        assert self._connection is not None
+        self._connection.execute("BEGIN")
+        try:
+            self._connection.executemany(
+                "DELETE FROM intake_files WHERE path = ?",
+                [(path,) for path in stale],
+            )
+            self._connection.execute("COMMIT")
+        except Exception:
+            self._connection.execute("ROLLBACK")
+            raise
+        for path in stale:
+            self._entries.pop(path, None)
+        logger.info("Watcher ledger compacted: removed %s entries", len(stale))
+        return len(stale)
+
+    def _write_locked(self, entry: LedgerEntry) -> None:
+        assert self._connection is not None
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO intake_files ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+            tuple(getattr(entry, column) for column in _COLUMNS),
+        )
+        self._entries[entry.path] = entry
+
+
+class LedgerPathSet:
+    """
+    Set-like view of ledger paths the watcher should currently skip.
+
+    Contains settled files and failed files still waiting out their backoff.
+    Keeps the historical ``handler.processed_files`` interface working on top
+    of the durable ledger.
+    """
+
+    def __init__(self, ledger: IntakeLedger) -> None:
+        self._ledger = ledger
+
+    def __contains__(self, file_path: object) -> bool:
+        if not isinstance(file_path, (str, Path)):
+            return False
+        stat_result = _stat_or_none(str(file_path))
+        return self._ledger.is_settled(
+            file_path, stat_result
+        ) or self._ledger.retry_pending(file_path, stat_result)
+
+    def __iter__(self) -> Iterator[str]:
+        return (path for path in self._ledger.paths() if path in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def add(self, file_path: str | Path) -> None:
+        self._ledger.record_started(file_path)
+
+    def discard(self, file_path: str | Path) -> None:
+        self._ledger.discard(file_path)
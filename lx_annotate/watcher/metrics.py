@@ -0,0 +1,329 @@
+"""
+Watcher metrics in the Prometheus text exposition format.
+
+Metrics are served from ``WATCHER_METRICS_PORT`` on ``WATCHER_METRICS_HOST``
+(default ``127.0.0.1``) and/or written to ``WATCHER_METRICS_FILE`` on every
+health check, for the node exporter textfile collector. Both are off unless
+configured.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from .settings import env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STABILITY_WAIT_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900)
+INGEST_DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(v))}"' for name, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        return self.header() + self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """Mirror a running total that is counted elsewhere."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.label_names:
+            values = [((), 0)]
+        return [
+            f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self.set_total(value, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        *,
+        buckets: Iterable[float],
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, observations = self._series.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(counts):
+                counts[index] += 1
+            self._series[key] = (counts, total + value, observations + 1)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+        return series[2] if series is not None else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), total, observations))
+                for key, (counts, total, observations) in self._series.items()
+            )
+        lines = []
+        for key, (counts, total, observations) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_labels(self.label_names, key, le=_number(float(bound)))}"
+                    f" {cumulative}"
+                )
+            lines.append(
+                f"{self.name}_bucket{_labels(self.label_names, key, le='+Inf')}"
+                f" {observations}"
+            )
+            lines.append(
+                f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}"
+            )
+            lines.append(
+                f"{self.name}_count{_labels(self.label_names, key)} {observations}"
+            )
+        return lines
+
+
+class WatcherMetrics:
+    """All metrics of one watcher process."""
+
+    def __init__(self) -> None:
+        self.lane_queue_depth = Gauge(
+            "lx_watcher_lane_queue_depth", "Files waiting in a lane.", ["lane"]
+        )
+        self.lane_running = Gauge(
+            "lx_watcher_lane_running", "Files being processed in a lane.", ["lane"]
+        )
+        self.stability_wait_seconds = Histogram(
+            "lx_watcher_stability_wait_seconds",
+            "Time from pick-up until a file was ready for ingest.",
+            ["kind"],
+            buckets=STABILITY_WAIT_BUCKETS,
+        )
+        self.ingest_duration_seconds = Histogram(
+            "lx_watcher_ingest_duration_seconds",
+            "Duration of one ingest attempt.",
+            ["kind", "outcome"],
+            buckets=INGEST_DURATION_BUCKETS,
+        )
+        self.ingested_bytes = Counter(
+            "lx_watcher_ingested_bytes_total",
+            "Bytes of intake files imported successfully.",
+            ["kind"],
+        )
+        self.retries = Counter(
+            "lx_watcher_retries_total",
+            "Failed imports scheduled for another attempt.",
+            ["kind"],
+        )
+        self.quarantined = Counter(
+            "lx_watcher_quarantined_total",
+            "Files moved to quarantine after repeated failures.",
+            ["kind"],
+        )
+        self.duplicates_skipped = Counter(
+            "lx_watcher_duplicates_skipped_total",
+            "Intake files skipped because their content was already imported.",
+            ["kind"],
+        )
+        self.observer_restarts = Counter(
+            "lx_watcher_observer_restarts_total",
+            "Restarts of a dead file-system observer.",
+        )
+        self.events = Counter(
+            "lx_watcher_events_total",
+            "File-system events, before (raw) and after (coalesced) debouncing.",
+            ["stage"],
+        )
+        self.storage_reserved_bytes = Gauge(
+            "lx_watcher_storage_reserved_bytes",
+            "Predicted vault footprint of running imports not yet written.",
+        )
+        self.storage_deferred = Counter(
+            "lx_watcher_storage_deferred_total",
+            "Imports deferred because their predicted footprint did not fit.",
+        )
+        self.report_batch_files_per_second = Gauge(
+            "lx_watcher_report_batch_files_per_second",
+            "Throughput of the most recent report batch.",
+        )
+        self.working_copy_requests = Counter(
+            "lx_watcher_working_copy_requests_total",
+            "Decrypted working-copy requests served from cache (hit) or not (miss).",
+            ["result"],
+        )
+        self.working_copy_evictions = Counter(
+            "lx_watcher_working_copy_evictions_total",
+            "Decrypted working copies evicted and securely deleted.",
+        )
+        self.working_copy_bytes = Gauge(
+            "lx_watcher_working_copy_bytes",
+            "Bytes of decrypted working copies currently cached.",
+        )
+        self._collectors: list[Callable[[], None]] = []
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before rendering."""
+        self._collectors.append(collector)
+
+    def metrics(self) -> list[_Metric]:
+        return [value for value in vars(self).values() if isinstance(value, _Metric)]
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as exc:
+                logger.debug("Watcher metrics collector failed: %s", exc)
+        lines: list[str] = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: Path) -> None:
+        """Atomically replace ``path`` with the current metrics."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+class MetricsServer:
+    """Serve ``/metrics`` from a daemon thread."""
+
+    def __init__(self, metrics: WatcherMetrics, *, host: str, port: int) -> None:
+        registry = metrics
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in {"/", "/metrics"}:
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("Metrics request: " + format, *args)
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="watcher-metrics", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1])
+
+    def start(self) -> None:
+        self._thread.start()
+        logger.info("Serving watcher metrics on port %s", self.port)
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def configured_metrics_server(metrics: WatcherMetrics) -> MetricsServer | None:
+    port = env_int("WATCHER_METRICS_PORT", 0, minimum=0)
+    if not port:
+        return None
+    return MetricsServer(
+        metrics, host=env_str("WATCHER_METRICS_HOST", "127.0.0.1"), port=port
+    )
+
+
+def configured_metrics_file() -> Path | None:
+    configured = env_str("WATCHER_METRICS_FILE", "")
+    return Path(configured).expanduser() if configured else None
@@ -0,0 +1,230 @@
+"""
+Keep the local Ollama model resident while report intake needs it.
+
+Unloading the model after every report (``keep_alive: 0``) makes each
+following report pay the full model load again. The residency manager loads
+the model when report work starts, keeps it loaded for as long as report
+lanes have queued or running work, and unloads it only after
+``WATCHER_LLM_IDLE_SECONDS`` without report work, or earlier when available
+memory drops below ``WATCHER_LLM_MIN_AVAILABLE_MB``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+
+from .settings import env_bool, env_float, env_str
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_BASE_URL = "http://localhost:11434"
+DEFAULT_LLM_MODEL = "llama3.2:1b"
+LOAD_TIMEOUT_SECONDS = 300.0
+UNLOAD_TIMEOUT_SECONDS = 5.0
+LOAD_RETRY_SECONDS = 60.0
+
+
+def available_memory_mb(meminfo: Path = Path("/proc/meminfo")) -> float | None:
+    """``MemAvailable`` in MiB, or ``None`` where it cannot be read."""
+    try:
+        for line in meminfo.read_text(encoding="ascii").splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+@dataclass(frozen=True)
+class ResidencyStats:
+    loaded: bool
+    loads: int
+    unloads: int
+    load_failures: int
+    load_seconds: float
+    active_users: int
+
+
+class ModelResidencyManager:
+    """
+    Load and unload one Ollama model on behalf of the watcher.
+
+    ``in_use()`` wraps a report import: it loads the model if needed and
+    marks it busy. ``tick()`` runs on the watcher health check and decides
+    whether to unload.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str = DEFAULT_LLM_BASE_URL,
+        model: str = DEFAULT_LLM_MODEL,
+        idle_seconds: float = 300.0,
+        min_available_mb: float = 0.0,
+        memory_probe: Callable[[], float | None] = available_memory_mb,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.idle_seconds = idle_seconds
+        self.min_available_mb = min_available_mb
+        self.memory_probe = memory_probe
+        self.clock = clock
+        self._lock = threading.Lock()
+        # Serialises load and unload requests; held without ``_lock`` so a
+        # slow load never blocks the health check.
+        self._transition_lock = threading.Lock()
+        self._loaded = False
+        self._active_users = 0
+        self._last_used = clock()
+        self._load_blocked_until = 0.0
+        self._loads = 0
+        self._unloads = 0
+        self._load_failures = 0
+        self._load_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> ModelResidencyManager | None:
+        """The configured manager, or ``None`` unless Ollama is the LLM provider."""
+        if not env_bool("LLM_ENABLED", False):
+            return None
+        if env_str("LLM_PROVIDER", "").lower() != "ollama":
+            return None
+        return cls(
+            base_url=env_str("LLM_BASE_URL", DEFAULT_LLM_BASE_URL),
+            model=env_str("LLM_MODEL", DEFAULT_LLM_MODEL),
+            idle_seconds=env_float("WATCHER_LLM_IDLE_SECONDS", 300.0, minimum=0.0),
+            min_available_mb=env_float(
+                "WATCHER_LLM_MIN_AVAILABLE_MB", 0.0, minimum=0.0
+            ),
+        )
+
+    def _post(self, keep_alive: int, timeout: float) -> None:
+        response = requests.post(
+            f"{self.base_url}/api/generate",
+            json={"model": self.model, "keep_alive": keep_alive},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+
+    def ensure_loaded(self) -> bool:
+        """Load the model unless it is resident; ``False`` if loading failed."""
+        with self._transition_lock:
+            with self._lock:
+                now = self._last_used = self.clock()
+                if self._loaded:
+                    return True
+                if now < self._load_blocked_until:
+                    return False
+            started = time.monotonic()
+            try:
+                # keep_alive -1 keeps the model until this manager unloads it.
+                self._post(-1, LOAD_TIMEOUT_SECONDS)
+            except requests.RequestException as exc:
+                with self._lock:
+                    self._load_failures += 1
+                    self._load_blocked_until = now + LOAD_RETRY_SECONDS
+                logger.warning("Could not load LLM model %s: %s", self.model, exc)
+                return False
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._loaded = True
+                self._loads += 1
+                self._load_seconds += elapsed
+            logger.info("Loaded LLM model %s in %.1fs", self.model, elapsed)
+            return True
+
+    @contextmanager
+    def in_use(self) -> Iterator[None]:
+        with self._lock:
+            self._active_users += 1
+        try:
+            self.ensure_loaded()
+            yield
+        finally:
+            with self._lock:
+                self._active_users -= 1
+                self._last_used = self.clock()
+            self._pin()
+
+    def _pin(self) -> None:
+        """
+        Re-assert ``keep_alive: -1`` after report work.
+
+        Ollama applies the keep-alive of the most recent request, so the
+        report's own LLM calls would otherwise hand the model back to the
+        server's default expiry.
+        """
+        with self._transition_lock:
+            with self._lock:
+                if not self._loaded:
+                    return
+            try:
+                self._post(-1, LOAD_TIMEOUT_SECONDS)
+            except requests.RequestException as exc:
+                logger.debug("Could not pin LLM model %s: %s", self.model, exc)
+
+    def unload(self, reason: str) -> bool:
+        with self._transition_lock:
+            return self._unload(reason)
+
+    def _unload(self, reason: str) -> bool:
+        with self._lock:
+            if not self._loaded or self._active_users:
+                return False
+        try:
+            self._post(0, UNLOAD_TIMEOUT_SECONDS)
+        except requests.RequestException as exc:
+            logger.warning("Could not unload LLM model %s: %s", self.model, exc)
+            return False
+        with self._lock:
+            self._loaded = False
+            self._unloads += 1
+        logger.info("Unloaded LLM model %s (%s)", self.model, reason)
+        return True
+
+    def tick(self, *, pending_reports: int = 0) -> None:
+        """Unload after the idle period or under memory pressure."""
+        with self._lock:
+            now = self.clock()
+            if pending_reports > 0:
+                self._last_used = now
+            if not self._loaded or self._active_users:
+                return
+            idle_for = now - self._last_used
+
+        reason = ""
+        if self.min_available_mb > 0:
+            available = self.memory_probe()
+            if available is not None and available < self.min_available_mb:
+                reason = f"{available:.0f} MiB memory available"
+        if not reason and pending_reports == 0 and idle_for >= self.idle_seconds:
+            reason = f"idle for {idle_for:.0f}s"
+        if not reason:
+            return
+        # A load or unload in progress decides the state; try again next tick.
+        if not self._transition_lock.acquire(blocking=False):
+            return
+        try:
+            self._unload(reason)
+        finally:
+            self._transition_lock.release()
+
+    def stats(self) -> ResidencyStats:
+        with self._lock:
+            return ResidencyStats(
+                loaded=self._loaded,
+                loads=self._loads,
+                unloads=self._unloads,
+                load_failures=self._load_failures,
+                load_seconds=self._load_seconds,
+                active_users=self._active_users,
+            )
@@ -0,0 +1,226 @@
+"""
+Priority order for files waiting in a watcher lane.
+
+Each queued file gets a rank key; lower keys start first::
+
+    key = (kind_offset + size_mb * seconds_per_mb) / center_weight
+          + aging_factor * submitted_at
+
+``kind_offset`` and ``size_mb * seconds_per_mb`` are the head start a small
+report gets over a large video, in seconds of waiting. Because every queued
+file ages at the same rate, the aging term is fixed at submit time: a file
+whose cost is ``C`` can only be overtaken during its first ``C / aging_factor``
+seconds in the queue, so nothing starves.
+
+The watcher writes its lanes to a JSON snapshot on every health check;
+``manage.py watcher_queue`` reads it and prints the estimated start times.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .settings import env_float, env_str, env_weights
+
+logger = logging.getLogger(__name__)
+
+KIND_REPORT = "report"
+KIND_VIDEO = "video"
+
+DEFAULT_KIND_OFFSETS = {KIND_REPORT: 0.0, KIND_VIDEO: 300.0}
+DEFAULT_ESTIMATE_SECONDS = {KIND_REPORT: 30.0, KIND_VIDEO: 1800.0}
+MEBIBYTE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class IntakeRank:
+    key: float
+    path: str
+    kind: str
+    size: int
+    center_key: str
+    submitted_at: float
+
+
+@dataclass(frozen=True)
+class PriorityPolicy:
+    kind_offsets: dict[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_KIND_OFFSETS)
+    )
+    seconds_per_mb: float = 1.0
+    center_weights: dict[str, float] = field(default_factory=dict)
+    aging_factor: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> PriorityPolicy:
+        kind_offsets = dict(DEFAULT_KIND_OFFSETS)
+        kind_offsets.update(env_weights("WATCHER_PRIORITY_KIND_OFFSETS"))
+        return cls(
+            kind_offsets=kind_offsets,
+            seconds_per_mb=env_float(
+                "WATCHER_PRIORITY_SECONDS_PER_MB", 1.0, minimum=0.0
+            ),
+            center_weights=env_weights("WATCHER_PRIORITY_CENTER_WEIGHTS"),
+            aging_factor=env_float("WATCHER_PRIORITY_AGING", 1.0, minimum=0.0),
+        )
+
+    def cost(self, kind: str, size: int, center_key: str = "") -> float:
+        weight = self.center_weights.get(center_key, 1.0)
+        if weight <= 0:
+            weight = 1.0
+        base = self.kind_offsets.get(kind, 0.0) + (
+            max(size, 0) / MEBIBYTE * self.seconds_per_mb
+        )
+        return base / weight
+
+    def rank(
+        self,
+        *,
+        path: str,
+        kind: str,
+        size: int,
+        center_key: str = "",
+        now: float | None = None,
+    ) -> IntakeRank:
+        submitted_at = time.time() if now is None else now
+        return IntakeRank(
+            key=self.cost(kind, size, center_key) + self.aging_factor * submitted_at,
+            path=path,
+            kind=kind,
+            size=size,
+            center_key=center_key,
+            submitted_at=submitted_at,
+        )
+
+
+class DurationEstimator:
+    """Moving average of import seconds per MiB, per kind."""
+
+    def __init__(self, *, smoothing: float = 0.2) -> None:
+        self.smoothing = smoothing
+        self._seconds_per_mb: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, size: int, seconds: float) -> None:
+        rate = seconds / max(size / MEBIBYTE, 1.0)
+        with self._lock:
+            previous = self._seconds_per_mb.get(kind)
+            self._seconds_per_mb[kind] = (
+                rate
+                if previous is None
+                else previous + self.smoothing * (rate - previous)
+            )
+
+    def estimate(self, kind: str, size: int) -> float:
+        with self._lock:
+            rate = self._seconds_per_mb.get(kind)
+        if rate is None:
+            return DEFAULT_ESTIMATE_SECONDS.get(kind, 60.0)
+        return rate * max(size / MEBIBYTE, 1.0)
+
+
+@dataclass(frozen=True)
+class QueuedFile:
+    lane: str
+    path: str
+    kind: str
+    size: int
+    center_key: str
+    submitted_at: float
+    estimate_seconds: float
+    started_at: float | None = None
+
+
+@dataclass(frozen=True)
+class ScheduledFile:
+    position: int
+    queued: QueuedFile
+    estimated_start: float
+
+
+def configured_queue_snapshot_path() -> Path:
+    configured = env_str("WATCHER_QUEUE_SNAPSHOT_PATH", "")
+    if configured:
+        return Path(configured).expanduser()
+
+    from django.conf import settings
+
+    return Path(settings.APP_DATA_DIR) / "watcher" / "queue.json"
+
+
+def write_queue_snapshot(
+    path: Path,
+    *,
+    workers: dict[str, int],
+    running: Iterable[QueuedFile],
+    pending: Iterable[QueuedFile],
+) -> None:
+    """Atomically replace the snapshot read by ``manage.py watcher_queue``."""
+    payload = {
+        "generated_at": time.time(),
+        "workers": workers,
+        "running": [asdict(item) for item in running],
+        "pending": [asdict(item) for item in pending],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def read_queue_snapshot(path: Path) -> dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload["running"] = [QueuedFile(**item) for item in payload.get("running", [])]
+    payload["pending"] = [QueuedFile(**item) for item in payload.get("pending", [])]
+    return payload
+
+
+def estimate_start_times(
+    *,
+    workers: dict[str, int],
+    running: Iterable[QueuedFile],
+    pending: Iterable[QueuedFile],
+    now: float,
+) -> list[ScheduledFile]:
+    """
+    Simulate each lane's workers over its pending files, in queue order.
+
+    A worker becomes free when its running file reaches its estimated
+    duration (or now, if that estimate is already exceeded).
+    """
+    free_at: dict[str, list[float]] = {
+        lane: [now] * max(count, 1) for lane, count in workers.items()
+    }
+    busy: dict[str, list[float]] = {}
+    for item in running:
+        started_at = item.started_at if item.started_at is not None else now
+        busy.setdefault(item.lane, []).append(
+            max(now, started_at + item.estimate_seconds)
+        )
+    for lane, finishing in busy.items():
+        slots = free_at.setdefault(lane, [now])
+        for index, finish in enumerate(sorted(finishing)[: len(slots)]):
+            slots[index] = finish
+
+    schedule: list[ScheduledFile] = []
+    positions: dict[str, int] = {}
+    for item in pending:
+        slots = free_at.setdefault(item.lane, [now])
+        slot = min(range(len(slots)), key=slots.__getitem__)
+        start = slots[slot]
+        slots[slot] = start + item.estimate_seconds
+        positions[item.lane] = positions.get(item.lane, 0) + 1
+        schedule.append(
+            ScheduledFile(
+                position=positions[item.lane], queued=item, estimated_start=start
+            )
+        )
+    return schedule
@@ -0,0 +1,148 @@
+"""
+Warm worker processes for OCR-heavy report and pseudonymized intake.
+
+tesserocr must be imported on an interpreter's main thread, which pins OCR to
+the watcher process and its GIL. With ``WATCHER_OCR_PROCESSES`` set, report and
+pseudonymized imports run in a pool of spawned worker processes instead; each
+worker sets up Django and preloads the OCR stack once on its own main thread
+and then serves files until it is recycled after
+``WATCHER_OCR_RECYCLE_AFTER`` imports.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from .settings import env_int
+
+logger = logging.getLogger(__name__)
+
+RESULT_COMPLETE = "complete"
+RESULT_PENDING = "pending"
+RESULT_NOT_READY = "not_ready"
+RESULT_NO_STORAGE = "no_storage"
+
+
+def configured_ocr_processes() -> int:
+    return env_int("WATCHER_OCR_PROCESSES", 0, minimum=0)
+
+
+def configured_recycle_after() -> int:
+    return env_int("WATCHER_OCR_RECYCLE_AFTER", 25, minimum=1)
+
+
+@dataclass(frozen=True)
+class PooledUploadJob:
+    """What the watcher needs from an ``UploadJob`` created in a worker."""
+
+    id: Any
+    is_complete: bool
+
+
+def _initialize_worker() -> None:
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+    from lx_annotate import file_watcher
+
+    file_watcher._preload_processing_stack()
+    logger.info("OCR worker process ready")
+
+
+def _run_ingest(kind: str, kwargs: dict[str, Any]) -> tuple[str, Any]:
+    """
+    Import one file inside a worker process.
+
+    Watcher-specific exceptions are returned as result codes because their
+    classes may not survive pickling back to the parent.
+    """
+    from lx_annotate import file_watcher
+
+    try:
+        if kind == "pseudonymized":
+            file_watcher.process_preanonymized_watcher_file(
+                file_path=kwargs["file_path"]
+            )
+            return RESULT_COMPLETE, None
+
+        center_reference = kwargs.pop("center_reference")
+        try:
+            center = file_watcher._resolve_center_by_key(center_reference)
+        except ValueError:
+            center = file_watcher._resolve_center_reference(center_reference)
+        upload_job = file_watcher.process_watcher_file(**kwargs, center=center)
+        if upload_job.is_complete:
+            return RESULT_COMPLETE, upload_job.id
+        return RESULT_PENDING, upload_job.id
+    except file_watcher.WatcherFileNotReadyError as exc:
+        return RESULT_NOT_READY, str(exc)
+    except file_watcher.InsufficientStorageError as exc:
+        return RESULT_NO_STORAGE, str(exc)
+    except Exception as exc:
+        raise RuntimeError(f"{type(exc).__name__}: {exc}") from None
+
+
+class OcrProcessPool:
+    """
+    Process pool started on first use and rebuilt when a worker dies.
+
+    Workers are spawned rather than forked, so no watcher threads or open
+    database connections leak into them.
+    """
+
+    def __init__(self, *, processes: int, recycle_after: int) -> None:
+        self.processes = processes
+        self.recycle_after = recycle_after
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initialize_worker,
+                    max_tasks_per_child=self.recycle_after,
+                )
+                logger.info(
+                    "Started %s OCR worker processes (recycled after %s files)",
+                    self.processes,
+                    self.recycle_after,
+                )
+            return self._executor
+
+    def run(self, kind: str, **kwargs: Any) -> tuple[str, Any]:
+        executor = self._pool()
+        try:
+            return executor.submit(_run_ingest, kind, kwargs).result()
+        except BrokenProcessPool as exc:
+            # A worker crashed (for example inside native OCR code); start a
+            # fresh pool for the next file and fail this one.
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError(f"OCR worker process died: {exc}") from exc
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def configured_ocr_pool() -> OcrProcessPool | None:
+    processes = configured_ocr_processes()
+    if processes < 1:
+        return None
+    return OcrProcessPool(processes=processes, recycle_after=configured_recycle_after())
@@ -0,0 +1,139 @@
+"""
+Retry backoff and poison-file quarantine for watcher intake.
+
+A file that keeps failing import is retried with exponentially growing delays
+and, after ``max_failures`` attempts, moved into the quarantine directory
+listed by ``lx_annotate.views.quarantine`` together with a reason sidecar.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .settings import env_float, env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_REASON_SUFFIX = ".reason.json"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    base_delay_seconds: float = 60.0
+    max_delay_seconds: float = 3600.0
+    max_failures: int = 5
+
+    @classmethod
+    def from_env(cls) -> RetryPolicy:
+        return cls(
+            base_delay_seconds=env_float(
+                "WATCHER_RETRY_BASE_SECONDS", 60.0, minimum=0.0
+            ),
+            max_delay_seconds=env_float(
+                "WATCHER_RETRY_MAX_SECONDS", 3600.0, minimum=0.0
+            ),
+            max_failures=env_int("WATCHER_MAX_FAILURES", 5, minimum=1),
+        )
+
+    def delay_for(self, failures: int) -> float:
+        """Delay before the next attempt after ``failures`` consecutive failures."""
+        exponent = max(failures - 1, 0)
+        # Cap the exponent so huge failure counts cannot overflow the float.
+        delay = self.base_delay_seconds * (2 ** min(exponent, 32))
+        return min(delay, self.max_delay_seconds)
+
+    def should_quarantine(self, failures: int) -> bool:
+        return failures >= self.max_failures
+
+
+def configured_quarantine_dir() -> Path:
+    configured = env_str("LX_ANNOTATE_QUARANTINE_DIR", "")
+    if configured:
+        return Path(configured).expanduser().resolve(strict=False)
+
+    from django.conf import settings
+
+    app_data_dir = Path(settings.APP_DATA_DIR).expanduser().resolve(strict=False)
+    return app_data_dir / "quarantine"
+
+
+def reason_sidecar_path(quarantined_path: Path) -> Path:
+    return quarantined_path.with_name(quarantined_path.name + QUARANTINE_REASON_SUFFIX)
+
+
+def is_reason_sidecar(path: Path) -> bool:
+    return path.name.endswith(
+        (QUARANTINE_REASON_SUFFIX, QUARANTINE_REASON_SUFFIX + ".tmp")
+    )
+
+
+def _unique_target(quarantine_dir: Path, filename: str) -> Path:
+    target = quarantine_dir / filename
+    if not target.exists():
+        return target
+    stem, suffix = os.path.splitext(filename)
+    stamp = time.strftime("%Y%m%d%H%M%S")
+    counter = 1
+    while True:
+        target = quarantine_dir / f"{stem}.{stamp}-{counter}{suffix}"
+        if not target.exists():
+            return target
+        counter += 1
+
+
+def quarantine_file(
+    source: Path,
+    *,
+    reason: str,
+    failures: int,
+    quarantine_dir: Path | None = None,
+    content_hash: str = "",
+) -> Path:
+    """
+    Move ``source`` into quarantine and record why next to it.
+
+    Returns the quarantined path. Raises ``OSError`` if the move fails; the
+    source is left in place in that case.
+    """
+    target_dir = quarantine_dir or configured_quarantine_dir()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target = _unique_target(target_dir, source.name)
+    shutil.move(str(source), str(target))
+
+    payload = {
+        "original_name": source.name,
+        "intake_directory": source.parent.name,
+        "reason": reason,
+        "failures": failures,
+        "content_hash": content_hash,
+        "quarantined_at": time.time(),
+    }
+    sidecar = reason_sidecar_path(target)
+    tmp_sidecar = sidecar.with_name(sidecar.name + ".tmp")
+    try:
+        tmp_sidecar.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_sidecar, sidecar)
+    except OSError as exc:
+        logger.warning("Could not write quarantine reason for %s: %s", target, exc)
+        tmp_sidecar.unlink(missing_ok=True)
+
+    logger.error(
+        "Quarantined %s after %s failed attempts: %s", source.name, failures, reason
+    )
+    return target
+
+
+def read_quarantine_reason(quarantined_path: Path) -> dict[str, Any] | None:
+    sidecar = reason_sidecar_path(quarantined_path)
+    try:
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
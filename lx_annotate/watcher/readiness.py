@@ -0,0 +1,316 @@
+"""
+Event-driven readiness detection for watcher intake files.
+
+inotify reports ``IN_CLOSE_WRITE`` (watchdog ``closed``) and ``IN_MOVED_TO``
+(watchdog ``moved``) once a writer is done with a file. Those events mark a
+path ready immediately; size polling is only used as a fallback for network
+mounts, polling observers and files that were dropped before the watcher ran.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .settings import env_str
+
+logger = logging.getLogger(__name__)
+
+READINESS_MODE_AUTO = "auto"
+READINESS_MODE_EVENTS = "events"
+READINESS_MODE_POLLING = "polling"
+READINESS_MODES = {
+    READINESS_MODE_AUTO,
+    READINESS_MODE_EVENTS,
+    READINESS_MODE_POLLING,
+}
+
+# Filesystems on which inotify does not see writes made by other hosts.
+NETWORK_FILESYSTEM_TYPES = frozenset(
+    {
+        "9p",
+        "afs",
+        "ceph",
+        "cifs",
+        "davfs",
+        "fuse.glusterfs",
+        "fuse.rclone",
+        "fuse.sshfs",
+        "glusterfs",
+        "gpfs",
+        "lustre",
+        "ncpfs",
+        "nfs",
+        "nfs4",
+        "smb3",
+        "smbfs",
+    }
+)
+
+_MAX_PENDING_SIGNALS = 4096
+
+
+@dataclass(frozen=True)
+class ReadySignal:
+    source: str
+    size: int
+    mtime_ns: int
+
+
+def _unescape_mount_path(value: str) -> str:
+    return (
+        value.replace("\\040", " ")
+        .replace("\\011", "\t")
+        .replace("\\012", "\n")
+        .replace("\\134", "\\")
+    )
+
+
+def read_mount_table(mounts_path: str = "/proc/self/mounts") -> list[tuple[str, str]]:
+    try:
+        raw = Path(mounts_path).read_text(encoding="utf-8")
+    except OSError:
+        return []
+
+    mounts: list[tuple[str, str]] = []
+    for line in raw.splitlines():
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        mounts.append((_unescape_mount_path(fields[1]), fields[2]))
+    return mounts
+
+
+def filesystem_type(
+    path: str | Path,
+    *,
+    mounts: list[tuple[str, str]] | None = None,
+) -> str | None:
+    candidate = Path(path).resolve(strict=False).as_posix()
+    best_match: tuple[int, str] | None = None
+    for mount_point, fs_type in mounts if mounts is not None else read_mount_table():
+        prefix = mount_point.rstrip("/") + "/"
+        if candidate != mount_point and not candidate.startswith(prefix):
+            continue
+        if best_match is None or len(mount_point) > best_match[0]:
+            best_match = (len(mount_point), fs_type)
+    return best_match[1] if best_match else None
+
+
+def is_network_filesystem(
+    path: str | Path,
+    *,
+    mounts: list[tuple[str, str]] | None = None,
+) -> bool:
+    fs_type = filesystem_type(path, mounts=mounts)
+    return fs_type is not None and fs_type.lower() in NETWORK_FILESYSTEM_TYPES
+
+
+def observer_emits_close_events(observer: object) -> bool:
+    return type(observer).__name__ == "InotifyObserver"
+
+
+class FileReadinessTracker:
+    """
+    Track close-write and moved-to events so workers can stop polling.
+
+    Event handlers call :meth:`mark_closed`/:meth:`mark_moved`; workers block in
+    :meth:`wait_until_ready`, which returns as soon as the recorded signal
+    still matches the file on disk.
+    """
+
+    def __init__(self, *, mode: str | None = None) -> None:
+        configured_mode = (
+            mode or env_str("WATCHER_READINESS_MODE", READINESS_MODE_AUTO)
+        ).lower()
+        if configured_mode not in READINESS_MODES:
+            logger.warning(
+                "Unknown WATCHER_READINESS_MODE %r, falling back to %s",
+                configured_mode,
+                READINESS_MODE_AUTO,
+            )
+            configured_mode = READINESS_MODE_AUTO
+        self.mode = configured_mode
+        self.events_available = True
+        self._condition = threading.Condition()
+        self._signals: dict[str, ReadySignal] = {}
+        self._generation = 0
+        self._event_capable_dirs: dict[str, bool] = {}
+
+    def mark_closed(self, file_path: str | Path) -> None:
+        self._record(file_path, "closed")
+
+    def mark_moved(self, file_path: str | Path) -> None:
+        self._record(file_path, "moved")
+
+    def mark_modified(self, file_path: str | Path) -> None:
+        with self._condition:
+            self._signals.pop(str(Path(file_path)), None)
+
+    def forget(self, file_path: str | Path) -> None:
+        with self._condition:
+            self._signals.pop(str(Path(file_path)), None)
+
+    def pending_signal(self, file_path: str | Path) -> ReadySignal | None:
+        with self._condition:
+            return self._signals.get(str(Path(file_path)))
+
+    def uses_events(self, path: Path) -> bool:
+        if self.mode == READINESS_MODE_POLLING or not self.events_available:
+            return False
+        if self.mode == READINESS_MODE_EVENTS:
+            return True
+
+        parent_key = str(path.parent)
+        capable = self._event_capable_dirs.get(parent_key)
+        if capable is None:
+            capable = not is_network_filesystem(path.parent)
+            self._event_capable_dirs[parent_key] = capable
+            if not capable:
+                logger.info(
+                    "Intake directory %s is on a network mount; "
+                    "using size polling for readiness",
+                    path.parent,
+                )
+        return capable
+
+    def wait_until_ready(
+        self,
+        path: Path,
+        *,
+        timeout: float = 900,
+        stable_checks_required: int = 10,
+        interval: float = 2.0,
+        on_poll: Callable[[Path], None] | None = None,
+    ) -> bool:
+        """
+        Block until ``path`` is complete.
+
+        ``on_poll`` is called with ``path`` on every polling tick so callers can
+        do incremental work (such as hashing) while the file is still growing.
+        """
+        event_driven = self.uses_events(path)
+        quiet_period = interval * stable_checks_required
+        deadline = time.monotonic() + timeout
+        next_poll = time.monotonic()
+        last_size = -1
+        stable_checks = 0
+        first_poll = True
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                logger.warning("Timed out waiting for stable file: %s", path)
+                return False
+
+            with self._condition:
+                seen_generation = self._generation
+            if event_driven and self._consume_signal(path):
+                return True
+
+            if now >= next_poll:
+                next_poll = now + interval
+                if on_poll is not None:
+                    on_poll(path)
+                try:
+                    stat_result = path.stat()
+                except OSError as exc:
+                    logger.debug("Error checking file size for %s: %s", path, exc)
+                    stat_result = None
+
+                if stat_result is not None:
+                    current_size = stat_result.st_size
+                    if (
+                        event_driven
+                        and first_poll
+                        and current_size > 0
+                        and time.time() - stat_result.st_mtime >= quiet_period
+                    ):
+                        # No writer touched the file for a full polling window
+                        # before we looked; that is the same evidence the
+                        # polling fallback would collect.
+                        logger.info(
+                            "File stable (quiescent): %s (%s bytes)",
+                            path,
+                            current_size,
+                        )
+                        return True
+                    first_poll = False
+
+                    if current_size <= 0:
+                        stable_checks = 0
+                    elif current_size == last_size:
+                        stable_checks += 1
+                        if stable_checks >= stable_checks_required:
+                            logger.info(
+                                "File stable: %s (%s bytes)", path, current_size
+                            )
+                            return True
+                    else:
+                        stable_checks = 0
+                        last_size = current_size
+                        logger.debug(
+                            "File still changing: %s (%s bytes)", path, current_size
+                        )
+
+            wait_for = min(next_poll, deadline) - time.monotonic()
+            if wait_for <= 0:
+                continue
+            with self._condition:
+                if event_driven and self._generation != seen_generation:
+                    continue
+                self._condition.wait(timeout=wait_for)
+
+    def _record(self, file_path: str | Path, source: str) -> None:
+        path = Path(file_path)
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return
+
+        signal = ReadySignal(
+            source=source,
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+        )
+        with self._condition:
+            key = str(path)
+            self._signals.pop(key, None)
+            self._signals[key] = signal
+            while len(self._signals) > _MAX_PENDING_SIGNALS:
+                self._signals.pop(next(iter(self._signals)))
+            self._generation += 1
+            self._condition.notify_all()
+
+    def _consume_signal(self, path: Path) -> bool:
+        key = str(path)
+        with self._condition:
+            signal = self._signals.get(key)
+        if signal is None:
+            return False
+
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return False
+
+        if stat_result.st_size <= 0:
+            return False
+        if (stat_result.st_size, stat_result.st_mtime_ns) != (
+            signal.size,
+            signal.mtime_ns,
+        ):
+            # The file changed again after the close/move; wait for the next one.
+            return False
+
+        with self._condition:
+            if self._signals.get(key) == signal:
+                self._signals.pop(key, None)
+        logger.info(
+            "File ready (%s): %s (%s bytes)", signal.source, path, stat_result.st_size
+        )
+        return True
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def env_str(name: str, default: str) -> str:
+    return str(os.getenv(name, default) or "").strip() or default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    raw = str(os.getenv(name, "") or "").strip().lower()
+    if not raw:
+        return default
+    return raw in TRUE_VALUES
+
+
+def env_int(name: str, default: int, *, minimum: int | None = None) -> int:
+    raw = str(os.getenv(name, "") or "").strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = default
+    if minimum is not None:
+        value = max(value, minimum)
+    return value
+
+
+def env_float(name: str, default: float, *, minimum: float | None = None) -> float:
+    raw = str(os.getenv(name, "") or "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        value = default
+    if minimum is not None:
+        value = max(value, minimum)
+    return value
+
+
+def env_weights(name: str) -> dict[str, float]:
+    """Parse ``name=value,name=value``; malformed pairs are skipped."""
+    weights: dict[str, float] = {}
+    for item in env_str(name, "").split(","):
+        key, separator, value = item.partition("=")
+        if not separator or not key.strip():
+            continue
+        try:
+            weights[key.strip()] = float(value)
+        except ValueError:
+            logger.warning("Ignoring malformed %s entry %r", name, item)
+    return weights
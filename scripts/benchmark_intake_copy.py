@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark intake-to-vault copies with and without read-ahead.
+
+Writes a synthetic intake file, evicts it from the page cache and moves it into
+a temporary ``EncryptedStorage`` vault through ``process_intake_file`` once
+with ``WATCHER_INTAKE_READ_AHEAD_CHUNKS=0`` and once with read-ahead enabled.
+Each run reports plaintext MB/s. A random master key is generated unless
+``LX_ANNOTATE_MASTER_KEY`` is set.
+
+Usage:
+    python scripts/benchmark_intake_copy.py --size-mb 2048 --depth 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lx_annotate.settings.settings_dev")
+
+MEBIBYTE = 1024 * 1024
+
+
+def _write_intake(path: Path, size_mb: int) -> None:
+    block = os.urandom(MEBIBYTE)
+    with path.open("wb") as handle:
+        for _ in range(size_mb):
+            handle.write(block)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _evict(path: Path) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    with path.open("rb") as handle:
+        os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _run(label: str, depth: int, source: Path, root: Path, args) -> float:
+    from lx_annotate.management.commands.run_filewatcher import process_intake_file
+    from lx_annotate.storage.encrypted import EncryptedStorage
+
+    os.environ["WATCHER_INTAKE_READ_AHEAD_CHUNKS"] = str(depth)
+    vault = root / f"vault-{label}"
+    storage = EncryptedStorage(location=str(vault), base_url="/media/")
+    rates = []
+    for attempt in range(args.repeat):
+        intake = root / f"intake-{label}-{attempt}.bin"
+        shutil.copyfile(source, intake)
+        _evict(intake)
+        started = time.perf_counter()
+        saved_name = process_intake_file(intake, storage_backend=storage)
+        elapsed = time.perf_counter() - started
+        rates.append(args.size_mb / elapsed)
+        storage.delete(saved_name)
+    best = max(rates)
+    print(
+        f"{label:<12} {best:8.1f} MB/s   (runs: {', '.join(f'{r:.1f}' for r in rates)})"
+    )
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=None,
+        help="Directory on the disk under test (default: system temp dir).",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.getenv("LX_ANNOTATE_MASTER_KEY") and not os.getenv(
+        "LX_ANNOTATE_MASTER_KEY_FILE"
+    ):
+        import base64
+
+        os.environ["LX_ANNOTATE_MASTER_KEY"] = base64.urlsafe_b64encode(
+            os.urandom(32)
+        ).decode("ascii")
+
+    import django
+
+    django.setup()
+
+    from lx_annotate.management.commands import run_filewatcher
+
+    run_filewatcher.READ_AHEAD_MIN_BYTES = 0
+    with tempfile.TemporaryDirectory(prefix="lx_intake_copy_", dir=args.dir) as tmp:
+        root = Path(tmp)
+        source = root / "source.bin"
+        print(f"Writing {args.size_mb} MiB synthetic intake file to {root} ...")
+        _write_intake(source, args.size_mb)
+        sequential = _run("sequential", 0, source, root, args)
+        read_ahead = _run(f"read-ahead={args.depth}", args.depth, source, root, args)
+        print(f"speedup: {read_ahead / sequential:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
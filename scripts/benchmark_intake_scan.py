@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark the periodic intake rescan against a large synthetic intake tree.
+
+Compares the previous ``Path.glob("*")`` rescan with the ``os.scandir`` based
+``IntakeScanner`` (first listing and steady-state rescans) while every file is
+already recorded in the watcher ledger, which is the situation the 10 s rescan
+loop spends most of its time in.
+
+Usage:
+    python scripts/benchmark_intake_scan.py --files 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lx_annotate.watcher.ledger import (  # noqa: E402
+    OUTCOME_SUCCEEDED,
+    IntakeLedger,
+    LedgerPathSet,
+)
+from lx_annotate.watcher.scanner import IntakeScanner, ScanRoot  # noqa: E402
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v"}
+REPORT_EXTENSIONS = {".pdf"}
+
+
+def _ignored(path: str | Path) -> bool:
+    name = os.path.basename(str(path))
+    return name.startswith((".", "~")) or name.endswith(".lock")
+
+
+def build_tree(root: Path, file_count: int) -> list[ScanRoot]:
+    video_dir = root / "video_import"
+    report_dir = root / "report_import"
+    video_dir.mkdir()
+    report_dir.mkdir()
+    for index in range(file_count):
+        if index % 5 == 0:
+            (video_dir / f"clip_{index:06d}.mp4").write_bytes(b"v")
+        else:
+            (report_dir / f"report_{index:06d}.pdf").write_bytes(b"%PDF")
+    past = time.time() - 60
+    for directory in (video_dir, report_dir):
+        os.utime(directory, (past, past))
+    return [
+        ScanRoot("video", video_dir, VIDEO_EXTENSIONS),
+        ScanRoot("report", report_dir, REPORT_EXTENSIONS),
+    ]
+
+
+def legacy_scan(roots: list[ScanRoot], processed: LedgerPathSet) -> int:
+    unseen = 0
+    for root in roots:
+        for candidate in root.directory.glob("*"):
+            if (
+                candidate.is_file()
+                and candidate.suffix.lower() in root.extensions
+                and not _ignored(candidate)
+            ):
+                if str(candidate) in processed:
+                    continue
+                unseen += 1
+    return unseen
+
+
+def scanner_scan(
+    scanner: IntakeScanner, roots: list[ScanRoot], ledger: IntakeLedger
+) -> int:
+    unseen = 0
+    for candidate in scanner.scan(roots):
+        if ledger.is_settled(candidate.path, candidate.stat):
+            continue
+        unseen += 1
+    return unseen
+
+
+def _timed(label: str, fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        unseen = fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<32} {best * 1000:10.1f} ms   unseen={unseen}")
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="lx_intake_scan_") as tmp:
+        root = Path(tmp)
+        print(f"Creating {args.files} synthetic intake files in {root} ...")
+        roots = build_tree(root, args.files)
+
+        ledger = IntakeLedger(None)
+        for scan_root in roots:
+            with os.scandir(scan_root.directory) as entries:
+                for entry in entries:
+                    ledger.record_started(entry.path, entry.stat())
+                    ledger.record_outcome(entry.path, OUTCOME_SUCCEEDED)
+        processed = LedgerPathSet(ledger)
+
+        legacy = _timed(
+            "glob rescan", lambda: legacy_scan(roots, processed), args.repeats
+        )
+        cold = _timed(
+            "scandir first listing",
+            lambda: scanner_scan(
+                IntakeScanner(ignore=_ignored, full_rescan_seconds=300), roots, ledger
+            ),
+            args.repeats,
+        )
+        warm_scanner = IntakeScanner(ignore=_ignored, full_rescan_seconds=300)
+        scanner_scan(warm_scanner, roots, ledger)
+        warm = _timed(
+            "scandir unchanged rescan",
+            lambda: scanner_scan(warm_scanner, roots, ledger),
+            args.repeats,
+        )
+        print(
+            f"speedup: first listing {legacy / cold:.1f}x, "
+            f"unchanged rescan {legacy / warm:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
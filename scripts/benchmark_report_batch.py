@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch report ingestion against the per-file path.
+
+Drops synthetic PDFs into a temporary report intake directory and imports
+them through the watcher handler twice: once file by file and once with
+``WATCHER_REPORT_BATCH_SIZE`` set. The shared ingest call is stubbed, and the
+center lookup and duplicate query sleep for ``--db-latency-ms`` per round-trip,
+so the comparison shows the per-file overhead that batching removes. The intake
+ledger is a real SQLite file.
+
+Usage:
+    python scripts/benchmark_report_batch.py --files 1000 --batch-size 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lx_annotate.settings.settings_dev")
+
+
+def _synthetic_pdf(index: int) -> bytes:
+    text = f"Synthetic report {index:06d}".encode("ascii")
+    return (
+        b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\n"
+        b"2 0 obj << /Length " + str(len(text)).encode("ascii") + b" >>\n"
+        b"stream\n" + text + b"\nendstream endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+    )
+
+
+def _run(file_watcher, intake: Path, args: argparse.Namespace, batch_size: int):
+    os.environ["WATCHER_REPORT_BATCH_SIZE"] = str(batch_size)
+    os.environ["WATCHER_LEDGER_PATH"] = str(intake.parent / f"ledger-{batch_size}.db")
+    db_latency = args.db_latency_ms / 1000
+    ingest_latency = args.ingest_ms / 1000
+    round_trips = {"center": 0, "duplicates": 0}
+
+    def resolve_center(key):
+        round_trips["center"] += 1
+        time.sleep(db_latency)
+        return SimpleNamespace(center_key=key)
+
+    def is_imported(content_hash):
+        round_trips["duplicates"] += 1
+        time.sleep(db_latency)
+        return False
+
+    def imported_hashes(content_hashes):
+        round_trips["duplicates"] += 1
+        time.sleep(db_latency)
+        return set()
+
+    def ingest(**kwargs):
+        time.sleep(ingest_latency)
+        return SimpleNamespace(is_complete=True, id="benchmark")
+
+    file_watcher._resolve_center_by_key = resolve_center
+    file_watcher.process_watcher_file = ingest
+    file_watcher._is_imported_report = is_imported
+
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    handler._imported_report_hashes = imported_hashes
+
+    paths = []
+    for index in range(args.files):
+        path = intake / f"report_{index:06d}.pdf"
+        path.write_bytes(_synthetic_pdf(index))
+        handler.readiness.mark_closed(path)
+        paths.append(path)
+
+    started = time.perf_counter()
+    try:
+        for path in paths:
+            handler._submit_file(str(path))
+        while handler.in_flight_files:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+    finally:
+        handler.shutdown()
+
+    remaining = sum(1 for path in paths if path.exists())
+    label = f"batch of {batch_size}" if batch_size > 1 else "per file"
+    print(
+        f"{label:<16} {elapsed:8.2f} s   {args.files / elapsed:8.1f} files/s   "
+        f"center lookups={round_trips['center']} "
+        f"duplicate queries={round_trips['duplicates']} left={remaining}"
+    )
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--ingest-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    import django
+
+    django.setup()
+
+    from lx_annotate import file_watcher
+
+    os.environ["WATCHER_STORAGE_ADMISSION"] = "0"
+    os.environ["WATCHER_REPORT_BATCH_SECONDS"] = "0.2"
+    with tempfile.TemporaryDirectory(prefix="lx_report_batch_") as tmp:
+        intake = Path(tmp) / "report_import"
+        intake.mkdir()
+        file_watcher.INTAKE_REPORT_DIR = intake.resolve()
+        file_watcher.is_intake_path = lambda path: True
+        print(f"Importing {args.files} synthetic PDFs from {intake} ...")
+        per_file = _run(file_watcher, intake, args, 0)
+        batched = _run(file_watcher, intake, args, args.batch_size)
+        print(f"speedup: {per_file / batched:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
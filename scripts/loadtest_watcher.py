@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Load-test the file watcher with synthetic intake traffic.
+
+Writes synthetic videos, reports and pseudonymized files into temporary intake
+directories at the configured rates and lognormal size distributions. It runs
+``FileWatcherService`` (observer, coalescer, readiness, lanes, ledger) against
+them with every ingest function stubbed out. Prints the p50/p95/p99 latency
+from a finished write to the hand-off into ingest, plus the files/s handed off.
+
+No database, network or GPU is needed, so the harness runs on a plain Linux
+box. ``--fail-p95-seconds`` turns it into a regression gate.
+
+Usage:
+    python scripts/loadtest_watcher.py --duration 60 --reports-per-minute 600 \\
+        --videos-per-minute 6 --video-size-mb 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lx_annotate.settings.settings_dev")
+
+MEBIBYTE = 1024 * 1024
+KIBIBYTE = 1024
+WRITE_BLOCK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TrafficSpec:
+    kind: str
+    per_minute: float
+    median_bytes: int
+    suffix: str
+
+
+@dataclass
+class LoadTestConfig:
+    duration_seconds: float = 30.0
+    drain_seconds: float = 120.0
+    traffic: Sequence[TrafficSpec] = ()
+    size_sigma: float = 0.5
+    write_mbps: float = 0.0
+    atomic_rename: bool = True
+    rescan_seconds: float = 10.0
+    seed: int = 0
+
+
+@dataclass
+class LoadTestResult:
+    written: dict[str, float] = field(default_factory=dict)
+    handed_off: dict[str, float] = field(default_factory=dict)
+    kinds: dict[str, str] = field(default_factory=dict)
+    sizes: dict[str, int] = field(default_factory=dict)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def latencies(self, kind: str | None = None) -> list[float]:
+        return sorted(
+            self.handed_off[path] - self.written[path]
+            for path in self.handed_off
+            if path in self.written and (kind is None or self.kinds[path] == kind)
+        )
+
+    def summary(self) -> dict[str, Any]:
+        elapsed = max(self.finished_at - self.started_at, 1e-9)
+        handed_bytes = sum(self.sizes.get(path, 0) for path in self.handed_off)
+        rows = {}
+        for kind in [*sorted(set(self.kinds.values())), None]:
+            latencies = self.latencies(kind)
+            rows[kind or "all"] = {
+                "written": sum(
+                    1 for path in self.written if kind in (None, self.kinds[path])
+                ),
+                "handed_off": len(latencies),
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+            }
+        return {
+            "elapsed_seconds": elapsed,
+            "files_per_second": len(self.handed_off) / elapsed,
+            "mb_per_second": handed_bytes / MEBIBYTE / elapsed,
+            "missing": len(set(self.written) - set(self.handed_off)),
+            "kinds": rows,
+        }
+
+
+def percentile(values: Sequence[float], pct: float) -> float | None:
+    """Nearest-rank percentile of already sorted ``values``."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+class SyntheticWriter:
+    """Write files for one traffic spec with exponential inter-arrival times."""
+
+    def __init__(
+        self,
+        spec: TrafficSpec,
+        directory: Path,
+        config: LoadTestConfig,
+        result: LoadTestResult,
+        stop: threading.Event,
+    ) -> None:
+        self.spec = spec
+        self.directory = directory
+        self.config = config
+        self.result = result
+        self.stop = stop
+        self.random = random.Random(f"{config.seed}:{spec.kind}")
+        self.block = self.random.randbytes(WRITE_BLOCK)
+        self.thread = threading.Thread(
+            target=self._run, name=f"loadtest-{spec.kind}", daemon=True
+        )
+
+    def _size(self) -> int:
+        size = self.random.lognormvariate(
+            math.log(max(self.spec.median_bytes, 1)), self.config.size_sigma
+        )
+        return max(int(size), 64)
+
+    def _write(self, index: int) -> None:
+        name = f"loadtest_{self.spec.kind}_{index:06d}{self.spec.suffix}"
+        final_path = self.directory / name
+        target = (
+            self.directory / f"{name}.part" if self.config.atomic_rename else final_path
+        )
+        size = self._size()
+        header = f"{self.spec.kind}:{index}:".encode("ascii")
+        written = 0
+        started = time.monotonic()
+        with target.open("wb") as handle:
+            handle.write(header)
+            written += len(header)
+            while written < size:
+                chunk = self.block[: min(len(self.block), size - written)]
+                handle.write(chunk)
+                written += len(chunk)
+                if self.config.write_mbps > 0:
+                    ahead = written / (self.config.write_mbps * MEBIBYTE) - (
+                        time.monotonic() - started
+                    )
+                    if ahead > 0:
+                        time.sleep(ahead)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if self.config.atomic_rename:
+            os.replace(target, final_path)
+        with self.result.lock:
+            key = str(final_path)
+            self.result.written[key] = time.monotonic()
+            self.result.kinds[key] = self.spec.kind
+            self.result.sizes[key] = written
+
+    def _run(self) -> None:
+        rate = self.spec.per_minute / 60.0
+        index = 0
+        while not self.stop.is_set():
+            if self.stop.wait(self.random.expovariate(rate)):
+                return
+            self._write(index)
+            index += 1
+
+
+@contextmanager
+def stubbed_watcher(root: Path, result: LoadTestResult) -> Iterator[Any]:
+    """Point the watcher at ``root`` and replace ingest with hand-off recorders."""
+    from lx_annotate import file_watcher
+
+    dirs = {
+        name: (root / name).resolve()
+        for name in ("video_import", "report_import", "preanonymized_import")
+    }
+    for directory in dirs.values():
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def record(path: Path | str) -> None:
+        with result.lock:
+            result.handed_off.setdefault(str(path), time.monotonic())
+
+    def ingest(*, file_path, file_type, **kwargs):
+        record(file_path)
+        # Reports complete inline; videos continue asynchronously in production.
+        return SimpleNamespace(
+            id=f"loadtest-{Path(file_path).name}",
+            is_complete=file_type != "video",
+            is_successful=True,
+            status="queued",
+            refresh_from_db=lambda **kw: None,
+        )
+
+    def ingest_pseudonymized(*, file_path, **kwargs):
+        record(file_path)
+
+    env = {
+        "WATCHER_LEDGER_PATH": str(root / "watcher" / "ledger.sqlite3"),
+        "WATCHER_QUEUE_SNAPSHOT_PATH": str(root / "watcher" / "queue.json"),
+        "WATCHER_STORAGE_ADMISSION": "0",
+        "WATCHER_INGEST_MODE": "inline",
+        "WATCHER_OCR_PROCESSES": "0",
+        "LLM_ENABLED": "0",
+    }
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, env))
+        patch = stack.enter_context
+        patch(mock.patch.object(file_watcher, "INTAKE_VIDEO_DIR", dirs["video_import"]))
+        patch(
+            mock.patch.object(file_watcher, "INTAKE_REPORT_DIR", dirs["report_import"])
+        )
+        patch(
+            mock.patch.object(
+                file_watcher,
+                "INTAKE_PREANONYMIZED_DIR",
+                dirs["preanonymized_import"],
+            )
+        )
+        patch(mock.patch.object(file_watcher, "process_watcher_file", ingest))
+        patch(
+            mock.patch.object(
+                file_watcher,
+                "process_preanonymized_watcher_file",
+                ingest_pseudonymized,
+            )
+        )
+        patch(
+            mock.patch.object(
+                file_watcher,
+                "_resolve_center_by_key",
+                lambda key: SimpleNamespace(center_key=key),
+            )
+        )
+        patch(
+            mock.patch.object(
+                file_watcher, "check_storage_capacity", lambda *args: None
+            )
+        )
+        patch(mock.patch.object(file_watcher, "_is_imported_video", _not_imported))
+        patch(mock.patch.object(file_watcher, "_is_imported_report", _not_imported))
+        handler_class = file_watcher.AutoProcessingHandler
+        patch(
+            mock.patch.object(
+                handler_class, "_imported_report_hashes", lambda self, hashes: set()
+            )
+        )
+        service = file_watcher.FileWatcherService()
+        try:
+            yield service
+        finally:
+            service.stop()
+
+
+def _not_imported(content_hash: str) -> bool:
+    return False
+
+
+def run_load_test(config: LoadTestConfig, root: Path) -> LoadTestResult:
+    result = LoadTestResult()
+    with stubbed_watcher(root, result) as service:
+        for directory in (
+            service.video_dir,
+            service.report_dir,
+            service.pseudonymized_dir,
+        ):
+            service.observer.schedule(service.handler, str(directory), recursive=False)
+        service.observer.start()
+
+        directories = {
+            "video": service.video_dir,
+            "report": service.report_dir,
+            "pseudonymized": service.pseudonymized_dir,
+        }
+        stop = threading.Event()
+        writers = [
+            SyntheticWriter(spec, directories[spec.kind], config, result, stop)
+            for spec in config.traffic
+            if spec.per_minute > 0
+        ]
+        result.started_at = time.monotonic()
+        for writer in writers:
+            writer.thread.start()
+
+        deadline = result.started_at + config.duration_seconds
+        next_rescan = result.started_at + config.rescan_seconds
+        while time.monotonic() < deadline:
+            time.sleep(min(0.2, max(deadline - time.monotonic(), 0)))
+            if time.monotonic() >= next_rescan:
+                service._health_check()
+                service._process_existing_files()
+                next_rescan += config.rescan_seconds
+        stop.set()
+        for writer in writers:
+            writer.thread.join()
+
+        drain_deadline = time.monotonic() + config.drain_seconds
+        while time.monotonic() < drain_deadline:
+            with result.lock:
+                pending = set(result.written) - set(result.handed_off)
+            if not pending:
+                break
+            time.sleep(0.05)
+            if time.monotonic() >= next_rescan:
+                service._process_existing_files()
+                next_rescan += config.rescan_seconds
+        result.finished_at = max(result.handed_off.values(), default=time.monotonic())
+    return result
+
+
+def _format_seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}s"
+
+
+def print_summary(summary: dict[str, Any]) -> None:
+    print(f"{'kind':<14} {'written':>8} {'handed':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for kind, row in summary["kinds"].items():
+        print(
+            f"{kind:<14} {row['written']:>8} {row['handed_off']:>8} "
+            f"{_format_seconds(row['p50']):>9} {_format_seconds(row['p95']):>9} "
+            f"{_format_seconds(row['p99']):>9}"
+        )
+    print(
+        f"throughput: {summary['files_per_second']:.2f} files/s, "
+        f"{summary['mb_per_second']:.1f} MB/s over "
+        f"{summary['elapsed_seconds']:.1f}s; missing={summary['missing']}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--drain", type=float, default=120.0)
+    parser.add_argument("--videos-per-minute", type=float, default=2.0)
+    parser.add_argument("--reports-per-minute", type=float, default=120.0)
+    parser.add_argument("--pseudonymized-per-minute", type=float, default=0.0)
+    parser.add_argument("--video-size-mb", type=float, default=20.0)
+    parser.add_argument("--report-size-kb", type=float, default=200.0)
+    parser.add_argument(
+        "--size-sigma",
+        type=float,
+        default=0.5,
+        help="Sigma of the lognormal size distribution around each median.",
+    )
+    parser.add_argument(
+        "--write-mbps",
+        type=float,
+        default=0.0,
+        help="Throttle each writer to this rate; 0 writes as fast as possible.",
+    )
+    parser.add_argument(
+        "--direct-writes",
+        action="store_true",
+        help="Write final names directly instead of renaming a .part file.",
+    )
+    parser.add_argument("--rescan-seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument(
+        "--fail-p95-seconds",
+        type=float,
+        default=0.0,
+        help="Exit with status 1 when the overall p95 latency exceeds this.",
+    )
+    args = parser.parse_args(argv)
+
+    import django
+
+    django.setup()
+
+    config = LoadTestConfig(
+        duration_seconds=args.duration,
+        drain_seconds=args.drain,
+        traffic=[
+            TrafficSpec(
+                "video",
+                args.videos_per_minute,
+                int(args.video_size_mb * MEBIBYTE),
+                ".mp4",
+            ),
+            TrafficSpec(
+                "report",
+                args.reports_per_minute,
+                int(args.report_size_kb * KIBIBYTE),
+                ".pdf",
+            ),
+            TrafficSpec(
+                "pseudonymized",
+                args.pseudonymized_per_minute,
+                int(args.report_size_kb * KIBIBYTE),
+                ".pdf",
+            ),
+        ],
+        size_sigma=args.size_sigma,
+        write_mbps=args.write_mbps,
+        atomic_rename=not args.direct_writes,
+        rescan_seconds=args.rescan_seconds,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory(prefix="lx_watcher_load_") as tmp:
+        summary = run_load_test(config, Path(tmp)).summary()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+    p95 = summary["kinds"]["all"]["p95"]
+    if summary["missing"] or (
+        args.fail_p95_seconds > 0 and p95 is not None and p95 > args.fail_p95_seconds
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+
+
+def _video_lookup(video):
+    return SimpleNamespace(first=lambda: video)
+
+
+@override_settings(
+    ROOT_URLCONF="lx_annotate.urls",
+    DEBUG=True,
+    ALLOWED_HOSTS=["testserver", "localhost", "127.0.0.1"],
+)
+def test_processed_video_stream_serves_byte_range(client, monkeypatch, tmp_path):
+    from lx_annotate.views import managed_media
+
+    storage = FileSystemStorage(location=str(tmp_path))
+    payload = bytes(range(256)) * 64
+    name = storage.save("videos/processed.mp4", ContentFile(payload))
+    video = SimpleNamespace(processed_file=SimpleNamespace(name=name, storage=storage))
+    monkeypatch.setattr(
+        managed_media.VideoFile.objects,
+        "filter",
+        lambda **kwargs: _video_lookup(video),
+    )
+
+    response = client.get(
+        "/api/managed-media/videos/7/stream/",
+        HTTP_RANGE="bytes=100-199",
+        secure=True,
+    )
+
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 100-199/{len(payload)}"
+    assert b"".join(response.streaming_content) == payload[100:200]
+
+
+@override_settings(
+    ROOT_URLCONF="lx_annotate.urls",
+    DEBUG=True,
+    ALLOWED_HOSTS=["testserver", "localhost", "127.0.0.1"],
+)
+def test_processed_video_stream_returns_404_without_processed_file(client, monkeypatch):
+    from lx_annotate.views import managed_media
+
+    monkeypatch.setattr(
+        managed_media.VideoFile.objects,
+        "filter",
+        lambda **kwargs: _video_lookup(None),
+    )
+
+    response = client.get("/api/managed-media/videos/7/stream/", secure=True)
+
+    assert response.status_code == 404
@@ -59,3 +59,35 @@ def test_quarantine_overview_lists_file_metadata_without_absolute_paths(
     assert file_payload["size"] == len(b"partial video")
     assert "path" not in file_payload
     assert str(tmp_path) not in str(file_payload)
+
+
+@override_settings(
+    ROOT_URLCONF="lx_annotate.urls",
+    DEBUG=True,
+    ALLOWED_HOSTS=["testserver", "localhost", "127.0.0.1"],
+)
+def test_quarantine_overview_reports_recorded_watcher_failure_reason(
+    client,
+    monkeypatch,
+    tmp_path,
+):
+    from lx_annotate.watcher.quarantine import quarantine_file
+
+    quarantine_dir = tmp_path / "quarantine"
+    monkeypatch.setenv("LX_ANNOTATE_QUARANTINE_DIR", str(quarantine_dir))
+    intake_dir = tmp_path / "report_import"
+    intake_dir.mkdir()
+    poison_pdf = intake_dir / "poison.pdf"
+    poison_pdf.write_bytes(b"%PDF-1.4 broken")
+    quarantine_file(poison_pdf, reason="PDF has no pages", failures=5)
+
+    with override_settings(APP_DATA_DIR=tmp_path):
+        response = client.get("/api/runtime/quarantine/", secure=True)
+
+    assert response.status_code == status.HTTP_200_OK
+    payload = response.json()
+    assert payload["count"] == 1
+    file_payload = payload["files"][0]
+    assert file_payload["filename"] == "poison.pdf"
+    assert file_payload["reason"] == "PDF has no pages"
+    assert file_payload["failed_attempts"] == 5
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def watcher_ledger_path(monkeypatch, tmp_path):
+    """Keep watcher ledger state per test instead of in the shared data dir."""
+    ledger_path = tmp_path / "watcher" / "intake_ledger.sqlite3"
+    monkeypatch.setenv("WATCHER_LEDGER_PATH", str(ledger_path))
+    return ledger_path
+
+
+@pytest.fixture(autouse=True)
+def watcher_queue_snapshot_path(monkeypatch, tmp_path):
+    snapshot_path = tmp_path / "watcher" / "queue.json"
+    monkeypatch.setenv("WATCHER_QUEUE_SNAPSHOT_PATH", str(snapshot_path))
+    return snapshot_path
+
+
+@pytest.fixture(autouse=True)
+def watcher_storage_admission(monkeypatch):
+    """Do not hold test imports on the free space of the machine running them."""
+    monkeypatch.setenv("WATCHER_STORAGE_ADMISSION", "0")
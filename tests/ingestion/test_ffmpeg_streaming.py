@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import struct
+import subprocess
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from lx_annotate.management.commands import run_filewatcher
+from lx_annotate.management.commands.run_filewatcher import (
+    extract_frames_with_ffmpeg,
+    mp4_moov_before_mdat,
+)
+
+
+def _box(kind: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _large_box(kind: bytes, size: int) -> bytes:
+    return struct.pack(">I4sQ", 1, kind, size)
+
+
+class FakeStdin:
+    def __init__(self, accept: int | None = None) -> None:
+        self.data = bytearray()
+        self.accept = accept
+        self.closed = False
+
+    def write(self, chunk: bytes) -> int:
+        if self.accept is not None and len(self.data) >= self.accept:
+            raise BrokenPipeError
+        self.data.extend(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeProcess:
+    instances: list[FakeProcess] = []
+
+    def __init__(self, command, stdin=None, returncode=0, accept=None) -> None:
+        self.command = command
+        self.stdin = FakeStdin(accept)
+        self.returncode = returncode
+        self.killed = False
+        FakeProcess.instances.append(self)
+
+    def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        self.killed = True
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileSystemStorage(location=str(tmp_path / "vault"))
+
+
+@pytest.fixture(autouse=True)
+def fake_popen(monkeypatch):
+    FakeProcess.instances = []
+    monkeypatch.setattr(subprocess, "Popen", FakeProcess)
+    return FakeProcess
+
+
+@pytest.mark.parametrize(
+    ("head", "expected"),
+    [
+        (_box(b"ftyp", b"isom") + _box(b"moov") + _box(b"mdat"), True),
+        (_box(b"ftyp", b"isom") + _box(b"free") + _box(b"mdat"), False),
+        (_box(b"ftyp", b"isom") + _large_box(b"wide", 1 << 20), None),
+        (_box(b"ftyp", b"isom")[:6], None),
+        (b"\x00\x00\x00\x10\x01\x02\x03\x04garbage!", None),
+    ],
+)
+def test_mp4_moov_position(head, expected):
+    assert mp4_moov_before_mdat(head) is expected
+
+
+def test_faststart_mp4_is_piped_into_ffmpeg_stdin(storage, monkeypatch):
+    payload = _box(b"ftyp", b"isom") + _box(b"moov", b"m" * 100) + b"x" * 300_000
+    name = storage.save("videos/faststart.mp4", ContentFile(payload))
+    monkeypatch.setattr(
+        subprocess, "run", lambda *a, **k: pytest.fail("temp-file fallback used")
+    )
+
+    extract_frames_with_ffmpeg(
+        name, storage_backend=storage, ffmpeg_args=["-frames:v", "1", "out.png"]
+    )
+
+    (process,) = FakeProcess.instances
+    assert process.command == ["ffmpeg", "-i", "pipe:0", "-frames:v", "1", "out.png"]
+    assert bytes(process.stdin.data) == payload
+    assert process.stdin.closed
+
+
+def test_ffmpeg_closing_the_pipe_early_is_not_an_error(storage, monkeypatch):
+    name = storage.save("videos/clip.mkv", ContentFile(b"\x1aE\xdf\xa3" * 600_000))
+    monkeypatch.setattr(
+        subprocess,
+        "Popen",
+        lambda command, stdin=None: FakeProcess(command, stdin, accept=1),
+    )
+
+    extract_frames_with_ffmpeg(name, storage_backend=storage)
+
+    assert len(FakeProcess.instances[0].stdin.data) < 600_000 * 4
+
+
+def test_ffmpeg_failure_on_pipe_raises(storage, monkeypatch):
+    name = storage.save("videos/clip.webm", ContentFile(b"webm"))
+    monkeypatch.setattr(
+        subprocess,
+        "Popen",
+        lambda command, stdin=None: FakeProcess(command, stdin, returncode=1),
+    )
+
+    with pytest.raises(subprocess.CalledProcessError):
+        extract_frames_with_ffmpeg(name, storage_backend=storage)
+
+
+def test_mdat_first_mp4_falls_back_to_seekable_temp_file(storage, monkeypatch):
+    payload = _box(b"ftyp", b"isom") + _box(b"mdat", b"d" * 1000) + _box(b"moov")
+    name = storage.save("videos/moov-at-end.mp4", ContentFile(payload))
+    commands = []
+
+    def fake_run(command, check):
+        commands.append(command)
+        with open(command[2], "rb") as handle:
+            assert handle.read() == payload
+
+    monkeypatch.setattr(run_filewatcher.subprocess, "run", fake_run)
+
+    extract_frames_with_ffmpeg(name, storage_backend=storage)
+
+    assert FakeProcess.instances == []
+    assert commands and commands[0][2] != "pipe:0"
+
+
+def test_streaming_can_be_disabled(storage, monkeypatch):
+    monkeypatch.setenv("WATCHER_FFMPEG_STDIN", "0")
+    name = storage.save("videos/clip.mkv", ContentFile(b"mkv"))
+    commands = []
+    monkeypatch.setattr(
+        run_filewatcher.subprocess,
+        "run",
+        lambda command, check: commands.append(command),
+    )
+
+    extract_frames_with_ffmpeg(name, storage_backend=storage)
+
+    assert FakeProcess.instances == []
+    assert len(commands) == 1
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from lx_annotate.watcher.admission import (
+    GIBIBYTE,
+    PER_FILE_OVERHEAD_BYTES,
+    StorageAdmission,
+)
+
+
+def _admission(free_bytes, **kwargs):
+    return StorageAdmission(
+        Path("/vault"),
+        factors={"video": 3.0, "report": 1.0},
+        min_free_bytes=GIBIBYTE,
+        free_space_probe=lambda root: free_bytes,
+        **kwargs,
+    )
+
+
+def test_predicted_footprint_applies_kind_factor():
+    admission = _admission(0)
+
+    assert admission.predicted_footprint("video", GIBIBYTE) == (
+        3 * GIBIBYTE + PER_FILE_OVERHEAD_BYTES
+    )
+    assert admission.predicted_footprint("unknown", 100) == (
+        100 + PER_FILE_OVERHEAD_BYTES
+    )
+
+
+def test_file_that_does_not_fit_is_refused_without_waiting():
+    admission = _admission(10 * GIBIBYTE)
+    assert admission.reserve("first.mp4", "video", 2 * GIBIBYTE)
+
+    assert not admission.reserve("second.mp4", "video", 2 * GIBIBYTE)
+    admission.release("first.mp4")
+    assert admission.reserve("second.mp4", "video", 2 * GIBIBYTE)
+
+    stats = admission.stats()
+    assert stats.reservations == 1
+    assert stats.admitted == 2
+    assert stats.deferred == 1
+
+
+def test_bytes_already_written_are_not_counted_twice():
+    free = {"bytes": 12 * GIBIBYTE}
+    admission = StorageAdmission(
+        Path("/vault"),
+        factors={"video": 3.0, "report": 1.0},
+        min_free_bytes=GIBIBYTE,
+        free_space_probe=lambda root: free["bytes"],
+    )
+    assert admission.reserve("first.mp4", "video", 3 * GIBIBYTE)
+
+    # The first import has written its whole footprint.
+    free["bytes"] = 3 * GIBIBYTE
+    assert admission.stats().outstanding_bytes == PER_FILE_OVERHEAD_BYTES
+    assert admission.reserve("second.pdf", "report", GIBIBYTE // 2)
+
+    admission.release("first.mp4")
+    stats = admission.stats()
+    assert stats.reservations == 1
+    assert stats.outstanding_bytes == GIBIBYTE // 2 + PER_FILE_OVERHEAD_BYTES
+    assert not admission.reserve("third.pdf", "report", GIBIBYTE + GIBIBYTE // 2)
+
+
+def test_handler_defers_report_that_does_not_fit(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    calls = []
+    monkeypatch.setattr(
+        file_watcher, "process_watcher_file", lambda **kwargs: calls.append(kwargs)
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    handler.storage_admission = _admission(0)
+    report_path = file_watcher.INTAKE_REPORT_DIR / "too-large-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 too large")
+
+    try:
+        handler.readiness.mark_closed(report_path)
+        handler._process_file(str(report_path))
+
+        assert calls == []
+        assert report_path.exists()
+        assert handler.storage_admission.stats().reservations == 0
+        # Rescans leave it alone; a released reservation resubmits it.
+        assert handler.is_known_file(str(report_path))
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
+
+
+def test_release_resubmits_waiting_files_that_fit_in_arrival_order():
+    resubmitted = []
+    admission = _admission(10 * GIBIBYTE, resubmit=resubmitted.append)
+    assert admission.reserve("running.mp4", "video", 2 * GIBIBYTE)
+    assert not admission.reserve("first.mp4", "video", 2 * GIBIBYTE)
+    assert not admission.reserve("second.pdf", "report", 3 * GIBIBYTE)
+    assert admission.stats().waiting == 2
+
+    admission.release("running.mp4")
+
+    assert resubmitted == ["first.mp4"]
+    assert admission.stats().waiting == 1
+    assert admission.reserve("first.mp4", "video", 2 * GIBIBYTE)
+
+
+def test_reserving_a_grown_file_only_needs_room_for_the_difference():
+    admission = _admission(10 * GIBIBYTE)
+    assert admission.reserve("growing.mp4", "video", GIBIBYTE)
+    assert admission.reserve("growing.mp4", "video", 2 * GIBIBYTE)
+    assert not admission.reserve("growing.mp4", "video", 4 * GIBIBYTE)
+
+    stats = admission.stats()
+    assert stats.reservations == 1
+    assert stats.reserved_bytes == admission.predicted_footprint("video", 2 * GIBIBYTE)
+    assert stats.admitted == 1
+    assert stats.waiting == 1
+
+
+def test_deferred_file_is_not_waited_on_and_backs_off_in_the_ledger(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    handler.storage_admission = _admission(0, retry_seconds=600)
+    waited = []
+    monkeypatch.setattr(
+        handler, "_wait_for_file_stable", lambda path: waited.append(path)
+    )
+    video_path = file_watcher.INTAKE_VIDEO_DIR / "too-large-video.mp4"
+    video_path.write_bytes(b"video")
+
+    try:
+        handler._process_file(str(video_path))
+
+        assert waited == []
+        entry = handler.ledger.lookup(str(video_path))
+        assert entry.outcome == "deferred"
+        assert entry.next_attempt_at > time.time() + 500
+        assert handler.is_known_file(str(video_path))
+        assert handler.storage_admission.stats().waiting == 1
+    finally:
+        video_path.unlink(missing_ok=True)
+        handler.shutdown()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from types import SimpleNamespace
+
+from lx_annotate.watcher.batching import BatchItem, ReportBatcher
+from lx_annotate.watcher.ledger import OUTCOME_DUPLICATE, OUTCOME_SUCCEEDED
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_batch_is_emitted_when_full():
+    batches = []
+    batcher = ReportBatcher(
+        batches.append, max_size=2, window_seconds=60, autostart=False
+    )
+
+    batcher.add(BatchItem("/intake/a.pdf", "t1"))
+    assert batches == []
+    batcher.add(BatchItem("/intake/b.pdf", "t2"))
+
+    assert [[item.path for item in batch] for batch in batches] == [
+        ["/intake/a.pdf", "/intake/b.pdf"]
+    ]
+    assert batcher.pending == 0
+
+
+def test_partial_batch_is_emitted_after_window():
+    clock = FakeClock()
+    batches = []
+    batcher = ReportBatcher(
+        batches.append, max_size=10, window_seconds=2, clock=clock, autostart=False
+    )
+    batcher.add(BatchItem("/intake/a.pdf", "t1"))
+
+    clock.now = 1.0
+    assert batcher.flush_due() == 0
+    clock.now = 2.5
+    assert batcher.flush_due() == 1
+    assert len(batches) == 1
+
+
+def test_stop_returns_unsent_items():
+    batcher = ReportBatcher(lambda batch: None, max_size=10, window_seconds=60)
+    batcher.add(BatchItem("/intake/a.pdf", "t1"))
+
+    assert batcher.stop() == [BatchItem("/intake/a.pdf", "t1")]
+
+
+def test_report_batch_resolves_center_once_and_checks_duplicates_in_bulk(
+    monkeypatch,
+):
+    import lx_annotate.file_watcher as file_watcher
+
+    monkeypatch.setenv("WATCHER_REPORT_BATCH_SIZE", "3")
+    monkeypatch.setenv("WATCHER_REPORT_BATCH_SECONDS", "60")
+    centers = []
+    ingested = []
+    duplicate_queries = []
+    duplicate_body = b"%PDF-1.4 batch already imported"
+    duplicate_hash = hashlib.sha256(duplicate_body).hexdigest()
+
+    def resolve_center(key):
+        centers.append(key)
+        return SimpleNamespace(center_key=key)
+
+    def filter_reports(**kwargs):
+        duplicate_queries.append(kwargs)
+        return SimpleNamespace(values_list=lambda *args, **kw: [duplicate_hash])
+
+    monkeypatch.setattr(file_watcher, "_resolve_center_by_key", resolve_center)
+    monkeypatch.setattr(file_watcher.RawPdfFile.objects, "filter", filter_reports)
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: ingested.append(kwargs)
+        or SimpleNamespace(is_complete=True, id="job"),
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    paths = [
+        file_watcher.INTAKE_REPORT_DIR / f"batch-report-{index}.pdf"
+        for index in range(3)
+    ]
+    paths[0].write_bytes(b"%PDF-1.4 batch first")
+    paths[1].write_bytes(b"%PDF-1.4 batch second")
+    paths[2].write_bytes(duplicate_body)
+
+    try:
+        for path in paths:
+            handler.readiness.mark_closed(path)
+            handler._process_file(str(path))
+
+        deadline = time.monotonic() + 10
+        while any(path.exists() for path in paths) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        while handler.in_flight_files and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert centers == [handler.default_center_key]
+        assert len(duplicate_queries) == 1
+        assert duplicate_queries[0]["pdf_hash__in"] == {
+            hashlib.sha256(b"%PDF-1.4 batch first").hexdigest(),
+            hashlib.sha256(b"%PDF-1.4 batch second").hexdigest(),
+            duplicate_hash,
+        }
+        assert [call["file_path"] for call in ingested] == paths[:2]
+        outcomes = [handler.ledger.lookup(str(path)).outcome for path in paths]
+        assert outcomes == [OUTCOME_SUCCEEDED, OUTCOME_SUCCEEDED, OUTCOME_DUPLICATE]
+        assert handler.in_flight_files == set()
+        assert handler.metrics.report_batch_files_per_second.value() > 0
+    finally:
+        for path in paths:
+            path.unlink(missing_ok=True)
+        handler.shutdown()
+
+
+def test_report_batch_imports_identical_pdfs_once(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    monkeypatch.setenv("WATCHER_REPORT_BATCH_SIZE", "2")
+    monkeypatch.setenv("WATCHER_REPORT_BATCH_SECONDS", "60")
+    ingested = []
+    monkeypatch.setattr(
+        file_watcher,
+        "_resolve_center_by_key",
+        lambda key: SimpleNamespace(center_key=key),
+    )
+    monkeypatch.setattr(
+        file_watcher.RawPdfFile.objects,
+        "filter",
+        lambda **kwargs: SimpleNamespace(values_list=lambda *args, **kw: []),
+    )
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: ingested.append(kwargs)
+        or SimpleNamespace(is_complete=True, id="job"),
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    paths = [
+        file_watcher.INTAKE_REPORT_DIR / f"batch-copy-{index}.pdf"
+        for index in range(2)
+    ]
+    for path in paths:
+        path.write_bytes(b"%PDF-1.4 batch same report")
+
+    try:
+        for path in paths:
+            handler.readiness.mark_closed(path)
+            handler._process_file(str(path))
+
+        deadline = time.monotonic() + 10
+        while any(path.exists() for path in paths) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        while handler.in_flight_files and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert [call["file_path"] for call in ingested] == paths[:1]
+        outcomes = [handler.ledger.lookup(str(path)).outcome for path in paths]
+        assert outcomes == [OUTCOME_SUCCEEDED, OUTCOME_DUPLICATE]
+    finally:
+        for path in paths:
+            path.unlink(missing_ok=True)
+        handler.shutdown()
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from lx_annotate.watcher import ingest
+from lx_annotate.watcher.claims import (
+    activate_claim,
+    active_claim_path,
+    claim_file,
+    is_claimed,
+    queued_claim_path,
+    read_claim,
+    release_claim,
+    requeue_claim,
+)
+
+
+def test_claim_is_exclusive_and_keyed_by_token(tmp_path):
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF")
+
+    assert claim_file(report, "task-a")
+    assert not claim_file(report, "task-b")
+    assert read_claim(report).token == "task-a"
+
+    assert not activate_claim(report, "task-b")
+    assert activate_claim(report, "task-a")
+    assert not activate_claim(report, "task-a")
+    assert not claim_file(report, "task-b")
+    assert active_claim_path(report).exists()
+
+    assert requeue_claim(report, "task-a")
+    assert queued_claim_path(report).exists()
+    release_claim(report, "task-b")
+    assert is_claimed(report)
+    release_claim(report, "task-a")
+    assert not is_claimed(report)
+
+
+def _current_task(task):
+    if hasattr(task, "_get_current_object"):
+        return task._get_current_object()
+    return task
+
+
+@pytest.fixture
+def celery_mode(monkeypatch):
+    monkeypatch.setenv("WATCHER_INGEST_MODE", "celery")
+    from lx_annotate import tasks
+
+    enqueued = []
+    monkeypatch.setattr(
+        _current_task(tasks.ingest_watcher_file_task),
+        "apply_async",
+        lambda kwargs, task_id: enqueued.append((task_id, kwargs)),
+    )
+    return enqueued
+
+
+def _ready_report(handler, report_path):
+    handler.readiness.events_available = True
+    handler.readiness.mark_closed(report_path)
+
+
+def test_celery_mode_claims_and_enqueues_without_importing(monkeypatch, celery_mode):
+    import lx_annotate.file_watcher as file_watcher
+
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: (_ for _ in ()).throw(AssertionError("ingest in watcher")),
+    )
+    first = file_watcher.AutoProcessingHandler()
+    second = file_watcher.AutoProcessingHandler()
+    report_path = file_watcher.INTAKE_REPORT_DIR / "celery-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 shared intake")
+
+    try:
+        _ready_report(first, report_path)
+        first._process_file(str(report_path))
+        _ready_report(second, report_path)
+        second._process_file(str(report_path))
+
+        assert len(celery_mode) == 1
+        task_id, kwargs = celery_mode[0]
+        assert kwargs["file_path"] == str(report_path)
+        assert kwargs["kind"] == "report"
+        assert kwargs["content_hash"]
+        assert read_claim(report_path).token == task_id
+        assert report_path.exists()
+        assert first.is_known_file(str(report_path))
+        assert second.is_known_file(str(report_path))
+    finally:
+        release_claim(report_path, celery_mode[0][0] if celery_mode else "")
+        report_path.unlink(missing_ok=True)
+        first.shutdown()
+        second.shutdown()
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    monkeypatch.setattr(
+        file_watcher,
+        "_resolve_center_by_key",
+        lambda key: SimpleNamespace(center_key=key),
+    )
+    calls = []
+    outcome = {"error": None}
+
+    def fake_ingest(**kwargs):
+        calls.append(kwargs)
+        if outcome["error"] is not None:
+            raise outcome["error"]
+        return SimpleNamespace(is_complete=True, id="job-1")
+
+    monkeypatch.setattr(file_watcher, "process_watcher_file", fake_ingest)
+    yield SimpleNamespace(calls=calls, outcome=outcome, module=file_watcher)
+
+
+def test_worker_ingest_is_idempotent_per_claim(worker):
+    report_path = worker.module.INTAKE_REPORT_DIR / "claimed-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 claimed")
+    claim_file(report_path, "task-1")
+
+    try:
+        first = ingest.ingest_claimed_file(
+            file_path=str(report_path), kind="report", claim_token="task-1"
+        )
+        again = ingest.ingest_claimed_file(
+            file_path=str(report_path), kind="report", claim_token="task-1"
+        )
+    finally:
+        report_path.unlink(missing_ok=True)
+
+    assert first.status == ingest.INGEST_STATUS_SUCCEEDED
+    assert again.status == ingest.INGEST_STATUS_MISSING
+    assert len(worker.calls) == 1
+    assert not is_claimed(report_path)
+
+
+def test_worker_skips_files_claimed_by_another_task(worker):
+    report_path = worker.module.INTAKE_REPORT_DIR / "foreign-claim.pdf"
+    report_path.write_bytes(b"%PDF-1.4 foreign")
+    claim_file(report_path, "task-other")
+
+    try:
+        result = ingest.ingest_claimed_file(
+            file_path=str(report_path), kind="report", claim_token="task-mine"
+        )
+        assert result.status == ingest.INGEST_STATUS_CLAIMED_ELSEWHERE
+        assert read_claim(report_path).token == "task-other"
+    finally:
+        release_claim(report_path, "task-other")
+        report_path.unlink(missing_ok=True)
+
+    assert worker.calls == []
+
+
+def test_failed_worker_ingest_keeps_claim_for_retry(worker):
+    worker.outcome["error"] = RuntimeError("OCR crashed")
+    report_path = worker.module.INTAKE_REPORT_DIR / "failing-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 failing")
+    claim_file(report_path, "task-2")
+
+    try:
+        result = ingest.ingest_claimed_file(
+            file_path=str(report_path), kind="report", claim_token="task-2"
+        )
+        assert result.retryable
+        assert result.error == "OCR crashed"
+        assert read_claim(report_path).token == "task-2"
+        assert report_path.exists()
+    finally:
+        release_claim(report_path, "task-2")
+        report_path.unlink(missing_ok=True)
+
+
+def test_ingest_task_quarantines_after_last_retry(monkeypatch, worker, tmp_path):
+    from lx_annotate import tasks
+
+    monkeypatch.setenv("LX_ANNOTATE_QUARANTINE_DIR", str(tmp_path / "quarantine"))
+    monkeypatch.setenv("WATCHER_MAX_FAILURES", "1")
+    worker.outcome["error"] = RuntimeError("broken PDF")
+    report_path = worker.module.INTAKE_REPORT_DIR / "poison-task.pdf"
+    report_path.write_bytes(b"%PDF-1.4 poison")
+    claim_file(report_path, "task-3")
+    current_task = _current_task(tasks.ingest_watcher_file_task)
+
+    current_task.push_request(id="task-3", retries=0)
+    try:
+        result = tasks.ingest_watcher_file_task.run(str(report_path), "report")
+    finally:
+        current_task.pop_request()
+        report_path.unlink(missing_ok=True)
+
+    assert result == "quarantined"
+    assert (tmp_path / "quarantine" / "poison-task.pdf").exists()
+    assert not is_claimed(report_path)
+
+
+def test_ingest_task_retries_failed_import_with_backoff(monkeypatch, worker):
+    from lx_annotate import tasks
+
+    monkeypatch.setenv("WATCHER_MAX_FAILURES", "5")
+    worker.outcome["error"] = RuntimeError("database locked")
+    report_path = worker.module.INTAKE_REPORT_DIR / "retry-task.pdf"
+    report_path.write_bytes(b"%PDF-1.4 retry")
+    claim_file(report_path, "task-4")
+    current_task = _current_task(tasks.ingest_watcher_file_task)
+
+    current_task.push_request(id="task-4", retries=2)
+    try:
+        with (
+            patch.object(
+                current_task,
+                "retry",
+                side_effect=RuntimeError("celery retry requested"),
+            ) as retry,
+            pytest.raises(RuntimeError, match="celery retry requested"),
+        ):
+            tasks.ingest_watcher_file_task.run(str(report_path), "report")
+    finally:
+        current_task.pop_request()
+        release_claim(report_path, "task-4")
+        report_path.unlink(missing_ok=True)
+
+    assert retry.call_args.kwargs["countdown"] == 120
+    assert retry.call_args.kwargs["max_retries"] == 4
+
+
+def test_ingest_task_returns_deferred_file_to_watchers_after_last_retry(
+    monkeypatch, worker
+):
+    from lx_annotate import tasks
+
+    monkeypatch.setenv("WATCHER_MAX_FAILURES", "2")
+    worker.outcome["error"] = worker.module.WatcherFileNotReadyError("still copying")
+    report_path = worker.module.INTAKE_REPORT_DIR / "deferred-task.pdf"
+    report_path.write_bytes(b"%PDF-1.4 deferred")
+    claim_file(report_path, "task-6")
+    current_task = _current_task(tasks.ingest_watcher_file_task)
+
+    current_task.push_request(id="task-6", retries=1)
+    try:
+        result = tasks.ingest_watcher_file_task.run(str(report_path), "report")
+    finally:
+        current_task.pop_request()
+        report_path_exists = report_path.exists()
+        report_path.unlink(missing_ok=True)
+
+    assert result == ingest.INGEST_STATUS_DEFERRED
+    assert report_path_exists
+    assert not is_claimed(report_path)
+
+
+def test_claim_outlives_retry_countdowns_longer_than_lease(
+    monkeypatch, worker, tmp_path
+):
+    from lx_annotate import tasks
+    from lx_annotate.watcher import claims
+
+    monkeypatch.setenv("LX_ANNOTATE_QUARANTINE_DIR", str(tmp_path / "quarantine"))
+    monkeypatch.setenv("WATCHER_MAX_FAILURES", "3")
+    monkeypatch.setenv("WATCHER_LEASE_TTL_SECONDS", "10")
+    clock = SimpleNamespace(now=claims.time.time())
+    monkeypatch.setattr(claims, "time", SimpleNamespace(time=lambda: clock.now))
+    worker.outcome["error"] = RuntimeError("broken PDF")
+    report_path = worker.module.INTAKE_REPORT_DIR / "slow-retry.pdf"
+    report_path.write_bytes(b"%PDF-1.4 slow retry")
+    claim_file(report_path, "task-5")
+    current_task = _current_task(tasks.ingest_watcher_file_task)
+    max_retries = ingest.ingest_max_retries()
+
+    try:
+        for retries in range(max_retries):
+            current_task.push_request(id="task-5", retries=retries)
+            try:
+                with (
+                    patch.object(
+                        current_task,
+                        "retry",
+                        side_effect=RuntimeError("celery retry requested"),
+                    ) as retry,
+                    pytest.raises(RuntimeError, match="celery retry requested"),
+                ):
+                    tasks.ingest_watcher_file_task.run(str(report_path), "report")
+            finally:
+                current_task.pop_request()
+
+            countdown = retry.call_args.kwargs["countdown"]
+            assert countdown > 10
+            # A rescan while the retry is pending must not break the claim.
+            clock.now += countdown
+            assert is_claimed(report_path)
+            assert not claim_file(report_path, "task-5")
+
+        current_task.push_request(id="task-5", retries=max_retries)
+        try:
+            result = tasks.ingest_watcher_file_task.run(str(report_path), "report")
+        finally:
+            current_task.pop_request()
+    finally:
+        release_claim(report_path, "task-5")
+        report_path.unlink(missing_ok=True)
+
+    assert result == "quarantined"
+    assert len(worker.calls) == max_retries + 1
+    assert (tmp_path / "quarantine" / "slow-retry.pdf").exists()
+    assert not is_claimed(report_path)
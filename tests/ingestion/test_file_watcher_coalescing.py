@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+
+from watchdog.events import (
+    FileClosedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+)
+
+from lx_annotate.watcher.coalescer import EventCoalescer
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_event_burst_for_one_path_becomes_one_candidate():
+    clock = _Clock()
+    emitted = []
+    coalescer = EventCoalescer(
+        emitted.append, window_seconds=1.0, clock=clock, autostart=False
+    )
+
+    coalescer.add("/intake/report.pdf")
+    clock.now += 0.6
+    coalescer.touch("/intake/report.pdf")
+    coalescer.add("/intake/report.pdf")
+    clock.now += 0.6
+    assert coalescer.flush_due() == 0
+
+    clock.now += 0.5
+    assert coalescer.flush_due() == 1
+    assert emitted == ["/intake/report.pdf"]
+    stats = coalescer.stats()
+    assert (stats.raw_events, stats.coalesced_events, stats.pending) == (3, 1, 0)
+
+
+def test_touch_alone_and_discarded_paths_emit_nothing():
+    clock = _Clock()
+    emitted = []
+    coalescer = EventCoalescer(
+        emitted.append, window_seconds=1.0, clock=clock, autostart=False
+    )
+
+    coalescer.touch("/intake/modified-only.pdf")
+    coalescer.add("/intake/deleted.pdf")
+    coalescer.discard("/intake/deleted.pdf")
+    coalescer.settle("/intake/closed-only.pdf")
+    clock.now += 5
+    assert coalescer.flush_due() == 0
+    assert emitted == []
+    assert coalescer.stats().raw_events == 4
+
+
+def test_close_event_submits_pending_path_without_waiting():
+    clock = _Clock()
+    emitted = []
+    coalescer = EventCoalescer(
+        emitted.append, window_seconds=10.0, clock=clock, autostart=False
+    )
+
+    coalescer.add("/intake/report.pdf")
+    coalescer.touch("/intake/report.pdf")
+    coalescer.settle("/intake/report.pdf")
+
+    assert emitted == ["/intake/report.pdf"]
+    assert coalescer.stats().pending == 0
+
+
+def test_zero_window_emits_immediately():
+    emitted = []
+    coalescer = EventCoalescer(emitted.append, window_seconds=0)
+
+    coalescer.add("/intake/video.mp4")
+
+    assert emitted == ["/intake/video.mp4"]
+    assert coalescer.stats().coalesced_events == 1
+
+
+def test_bulk_drop_submits_each_report_once(tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    submitted = []
+    done = threading.Event()
+    paths = [str(file_watcher.INTAKE_REPORT_DIR / f"bulk-{i}.pdf") for i in range(300)]
+
+    def record(path):
+        submitted.append(path)
+        if len(submitted) == len(paths):
+            done.set()
+
+    handler.coalescer.stop()
+    handler.coalescer = EventCoalescer(record, window_seconds=0.5)
+    try:
+        for path in paths[::2]:
+            # Writers that close the file are submitted on close.
+            handler.dispatch(FileCreatedEvent(path))
+            handler.dispatch(FileModifiedEvent(path))
+            handler.dispatch(FileModifiedEvent(path))
+            handler.dispatch(FileClosedEvent(path))
+        for path in paths[1::2]:
+            # Without a close event the window decides.
+            handler.dispatch(FileCreatedEvent(path))
+            handler.dispatch(FileModifiedEvent(path))
+            handler.dispatch(FileCreatedEvent(path))
+
+        assert done.wait(5)
+        stats = handler.coalescer.stats()
+        assert sorted(submitted) == sorted(paths)
+        assert stats.raw_events == 4 * 150 + 3 * 150
+        assert stats.coalesced_events == len(paths)
+
+        handler.dispatch(FileCreatedEvent(paths[0]))
+        handler.dispatch(FileDeletedEvent(paths[0]))
+        assert handler.coalescer.stats().pending == 0
+    finally:
+        handler.shutdown()
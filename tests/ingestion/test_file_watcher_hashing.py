@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from types import SimpleNamespace
+
+from lx_annotate.watcher.hashing import IncrementalHasher
+from lx_annotate.watcher.ledger import OUTCOME_DUPLICATE
+
+
+def test_growing_file_is_hashed_once_while_it_grows(tmp_path):
+    video_path = tmp_path / "growing.mp4"
+    hasher = IncrementalHasher(video_path, chunk_size=7)
+    written = b""
+
+    with video_path.open("wb") as handle:
+        for part in (b"first-bytes", b"second-bytes", b"third"):
+            handle.write(part)
+            handle.flush()
+            written += part
+            hasher.update()
+
+    content_hash = hasher.finish()
+
+    assert content_hash is not None
+    assert content_hash.sha256 == hashlib.sha256(written).hexdigest()
+    assert content_hash.size == len(written)
+    assert hasher.bytes_hashed == len(written)
+
+
+def test_replaced_or_truncated_file_restarts_the_hash(tmp_path):
+    report_path = tmp_path / "report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 draft version")
+    hasher = IncrementalHasher(report_path)
+    hasher.update()
+
+    replacement = tmp_path / "replacement.pdf"
+    replacement.write_bytes(b"%PDF-1.4 final")
+    os.replace(replacement, report_path)
+    assert hasher.finish().sha256 == hashlib.sha256(b"%PDF-1.4 final").hexdigest()
+
+    report_path.write_bytes(b"%PDF")
+    assert hasher.finish().sha256 == hashlib.sha256(b"%PDF").hexdigest()
+
+
+def test_missing_file_has_no_hash(tmp_path):
+    hasher = IncrementalHasher(tmp_path / "gone.pdf")
+    hasher.update()
+
+    assert hasher.finish() is None
+
+
+def _ready_report(handler, report_path):
+    handler.readiness.events_available = True
+    handler.readiness.mark_closed(report_path)
+    assert handler._wait_for_file_stable(report_path, timeout=5)
+
+
+def test_duplicate_report_is_skipped_before_hand_off(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    report_path = file_watcher.INTAKE_REPORT_DIR / "duplicate-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 already imported")
+    expected_hash = hashlib.sha256(b"%PDF-1.4 already imported").hexdigest()
+    looked_up = []
+
+    def filter_reports(**kwargs):
+        looked_up.append(kwargs)
+        return SimpleNamespace(exists=lambda: True)
+
+    monkeypatch.setattr(file_watcher.RawPdfFile.objects, "filter", filter_reports)
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: (_ for _ in ()).throw(AssertionError("ingest called")),
+    )
+
+    try:
+        _ready_report(handler, report_path)
+        handler._process_report(report_path)
+
+        assert looked_up == [{"pdf_hash": expected_hash}]
+        assert not report_path.exists()
+        entry = handler.ledger.lookup(str(report_path))
+        assert entry.outcome == OUTCOME_DUPLICATE
+        assert entry.content_hash == expected_hash
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
+
+
+def test_new_report_hash_is_passed_into_ingest(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    report_path = file_watcher.INTAKE_REPORT_DIR / "new-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 new report")
+    ingest_calls = []
+
+    def fake_ingest(**kwargs):
+        ingest_calls.append(kwargs)
+        return SimpleNamespace(is_complete=True, id="job-1")
+
+    monkeypatch.setattr(
+        file_watcher,
+        "_resolve_center_by_key",
+        lambda key: SimpleNamespace(center_key=key),
+    )
+    monkeypatch.setattr(
+        file_watcher.RawPdfFile.objects,
+        "filter",
+        lambda **kwargs: SimpleNamespace(exists=lambda: False),
+    )
+    monkeypatch.setattr(file_watcher, "process_watcher_file", fake_ingest)
+
+    try:
+        _ready_report(handler, report_path)
+        handler._process_report(report_path)
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
+
+    assert len(ingest_calls) == 1
+    assert (
+        ingest_calls[0]["content_hash"]
+        == hashlib.sha256(b"%PDF-1.4 new report").hexdigest()
+    )
+
+
+def test_ingest_hash_is_omitted_for_ingest_without_hash_parameter(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    def legacy_ingest(*, file_path, file_type, center, source_system):
+        return None
+
+    monkeypatch.setattr(file_watcher, "process_watcher_file", legacy_ingest)
+
+    assert file_watcher._ingest_hash_kwargs("abc") == {}
+    assert file_watcher._ingest_hash_kwargs("") == {}
@@ -30,6 +30,8 @@ class RecordingExecutor:
 
 
 def make_handler(monkeypatch):
+    # Submit straight from the event callbacks instead of after the debounce.
+    monkeypatch.setenv("WATCHER_DEBOUNCE_SECONDS", "0")
     handler = file_watcher.AutoProcessingHandler()
     executor = RecordingExecutor()
     monkeypatch.setattr(handler, "executor", executor)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+
+from lx_annotate.watcher.lanes import (
+    LANE_CONTROL,
+    LANE_PSEUDONYMIZED,
+    LANE_REPORT,
+    LANE_VIDEO,
+    IntakeLaneExecutor,
+    configured_lane_workers,
+)
+
+
+def _classify_by_suffix(file_path: str) -> str:
+    return LANE_VIDEO if file_path.endswith(".mp4") else LANE_REPORT
+
+
+def test_long_video_import_does_not_block_reports():
+    executor = IntakeLaneExecutor(classify=_classify_by_suffix)
+    release_video = threading.Event()
+    try:
+        video_future = executor.submit(
+            lambda path: release_video.wait(timeout=10), "/intake/huge.mp4"
+        )
+        report_future = executor.submit(lambda path: path, "/intake/report.pdf")
+
+        assert report_future.result(timeout=5) == "/intake/report.pdf"
+        assert not video_future.done()
+    finally:
+        release_video.set()
+        executor.shutdown(wait=True)
+
+    assert video_future.result() is True
+
+
+def test_lane_snapshot_reports_queue_depth_per_lane():
+    executor = IntakeLaneExecutor(
+        classify=_classify_by_suffix,
+        lane_workers={LANE_VIDEO: 1},
+    )
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(_path):
+        started.set()
+        release.wait(timeout=10)
+
+    try:
+        executor.submit(blocking, "/intake/a.mp4")
+        assert started.wait(timeout=5)
+        executor.submit(blocking, "/intake/b.mp4")
+        executor.submit(blocking, "/intake/c.mp4")
+
+        snapshot = executor.snapshot()
+        assert snapshot[LANE_VIDEO].running == 1
+        assert snapshot[LANE_VIDEO].queued == 2
+        assert snapshot[LANE_REPORT].queued == 0
+        assert executor.queue_depth() == 2
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    assert executor.snapshot()[LANE_VIDEO].completed == 3
+
+
+def test_submissions_without_path_run_on_control_lane():
+    executor = IntakeLaneExecutor(classify=_classify_by_suffix)
+    try:
+        assert executor.lane_for() == LANE_CONTROL
+        assert executor.submit(lambda: "rescan").result(timeout=5) == "rescan"
+    finally:
+        executor.shutdown(wait=True)
+
+    assert executor.snapshot()[LANE_CONTROL].completed == 1
+
+
+def test_lane_concurrency_is_configurable(monkeypatch):
+    monkeypatch.setenv("WATCHER_VIDEO_WORKERS", "1")
+    monkeypatch.setenv("WATCHER_REPORT_WORKERS", "4")
+    monkeypatch.setenv("WATCHER_PSEUDONYMIZED_WORKERS", "0")
+
+    workers = configured_lane_workers()
+
+    assert workers[LANE_VIDEO] == 1
+    assert workers[LANE_REPORT] == 4
+    assert workers[LANE_PSEUDONYMIZED] == 1
+
+
+def test_handler_routes_intake_directories_to_lanes_without_starting_threads():
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    try:
+        assert not [
+            thread
+            for thread in threading.enumerate()
+            if thread.name.startswith("FileProcessor-")
+        ]
+        assert (
+            handler._lane_for_path(str(file_watcher.INTAKE_VIDEO_DIR / "clip.mp4"))
+            == LANE_VIDEO
+        )
+        assert (
+            handler._lane_for_path(str(file_watcher.INTAKE_REPORT_DIR / "r.pdf"))
+            == LANE_REPORT
+        )
+        assert (
+            handler._lane_for_path(
+                str(file_watcher.INTAKE_PREANONYMIZED_DIR / "pseudo.pdf")
+            )
+            == LANE_PSEUDONYMIZED
+        )
+    finally:
+        handler.shutdown()
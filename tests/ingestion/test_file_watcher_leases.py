@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+from lx_annotate.watcher.claims import (
+    ClaimKeeper,
+    active_claim_path,
+    claim_file,
+    is_claimed,
+    queued_claim_path,
+    read_claim,
+    release_claim,
+)
+
+
+def _age(marker, seconds):
+    past = time.time() - seconds
+    os.utime(marker, (past, past))
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"video")
+
+    assert claim_file(video, "host-a", active=True, ttl=60)
+    assert not claim_file(video, "host-b", active=True, ttl=60)
+
+    _age(active_claim_path(video), 120)
+    assert not is_claimed(video, ttl=60)
+    assert claim_file(video, "host-b", active=True, ttl=60)
+    assert read_claim(video, active=True).token == "host-b"
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".stale")]
+
+
+def test_lease_of_dead_local_process_is_reclaimed(tmp_path):
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF")
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    dead_pid = finished.pid
+    queued_claim_path(report).write_text(
+        json.dumps(
+            {
+                "token": "crashed-watcher",
+                "owner": f"{socket.gethostname()}:{dead_pid}",
+                "claimed_at": time.time(),
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    assert not is_claimed(report, ttl=3600)
+    assert claim_file(report, "task-new", ttl=3600)
+    assert read_claim(report).token == "task-new"
+
+
+def test_keeper_renews_held_claims_until_released(tmp_path):
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF")
+    keeper = ClaimKeeper(ttl_seconds=60)
+    assert claim_file(report, "task-1", ttl=60)
+    keeper.hold(report, "task-1", active=False)
+
+    try:
+        _age(queued_claim_path(report), 50)
+        assert keeper.renew_all() == 1
+        assert time.time() - queued_claim_path(report).stat().st_mtime < 5
+
+        release_claim(report, "task-1")
+        assert keeper.renew_all() == 0
+        assert keeper.held() == 0
+    finally:
+        keeper.stop()
+
+
+def test_inline_watcher_skips_file_leased_by_another_host(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    calls = []
+    monkeypatch.setattr(
+        file_watcher,
+        "_resolve_center_by_key",
+        lambda key: SimpleNamespace(center_key=key),
+    )
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: calls.append(kwargs),
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    report_path = file_watcher.INTAKE_REPORT_DIR / "shared-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 shared")
+    marker = active_claim_path(report_path)
+    marker.write_text(
+        json.dumps(
+            {"token": "other", "owner": "other-host:1", "claimed_at": time.time()}
+        ),
+        encoding="utf-8",
+    )
+
+    try:
+        handler._process_file(str(report_path))
+        assert calls == []
+        assert handler.is_known_file(str(report_path))
+
+        _age(marker, 3600)
+        assert not handler.is_known_file(str(report_path))
+        handler.readiness.mark_closed(report_path)
+        handler._process_file(str(report_path))
+        assert len(calls) == 1
+        assert not marker.exists()
+    finally:
+        marker.unlink(missing_ok=True)
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
+
+
+def test_rescan_checks_claims_only_for_unsettled_files(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    checked = []
+    monkeypatch.setattr(
+        file_watcher, "is_claimed", lambda path, ttl=None: checked.append(path)
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    imported = file_watcher.INTAKE_REPORT_DIR / "settled-report.pdf"
+    fresh = file_watcher.INTAKE_REPORT_DIR / "fresh-report.pdf"
+    imported.write_bytes(b"%PDF-1.4 imported")
+    fresh.write_bytes(b"%PDF-1.4 fresh")
+
+    try:
+        handler.ledger.record_started(str(imported))
+        handler.ledger.record_outcome(str(imported), "succeeded")
+        assert handler.is_known_file(str(imported), imported.stat())
+        assert not handler.is_known_file(str(fresh), fresh.stat())
+    finally:
+        imported.unlink(missing_ok=True)
+        fresh.unlink(missing_ok=True)
+        handler.shutdown()
+
+    assert checked == [fresh]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import time
+
+from lx_annotate.watcher.ledger import (
+    OUTCOME_FAILED,
+    OUTCOME_INTERRUPTED,
+    OUTCOME_SUCCEEDED,
+    IntakeLedger,
+)
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.submissions = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submissions.append((fn, args, kwargs))
+        return None
+
+
+def test_transaction_commits_batch_and_rolls_back_on_error(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    reports = [tmp_path / f"report-{index}.pdf" for index in range(3)]
+    for report in reports:
+        report.write_bytes(b"%PDF-1.4")
+
+    ledger = IntakeLedger(db_path)
+    with ledger.transaction():
+        for report in reports[:2]:
+            ledger.record_started(report)
+    try:
+        with ledger.transaction():
+            ledger.record_started(reports[2])
+            raise RuntimeError("abort batch")
+    except RuntimeError:
+        pass
+
+    assert ledger.lookup(reports[2]) is None
+    ledger.close()
+    reopened = IntakeLedger(db_path)
+    assert [reopened.lookup(report) is not None for report in reports] == [
+        True,
+        True,
+        False,
+    ]
+
+
+def test_succeeded_entry_survives_restart(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-1.4")
+
+    ledger = IntakeLedger(db_path)
+    ledger.record_started(report)
+    ledger.record_outcome(report, OUTCOME_SUCCEEDED, content_hash="abc")
+    ledger.close()
+
+    reopened = IntakeLedger(db_path)
+    entry = reopened.lookup(report)
+    assert entry is not None
+    assert entry.outcome == OUTCOME_SUCCEEDED
+    assert entry.content_hash == "abc"
+    assert entry.attempts == 1
+    assert reopened.is_settled(report)
+
+
+def test_rewritten_file_at_same_path_is_not_settled(tmp_path):
+    ledger = IntakeLedger(tmp_path / "ledger.sqlite3")
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-1.4 first")
+    ledger.record_started(report)
+    ledger.record_outcome(report, OUTCOME_SUCCEEDED)
+
+    report.write_bytes(b"%PDF-1.4 second drop with new content")
+
+    assert not ledger.is_settled(report)
+    assert ledger.record_started(report).attempts == 1
+
+
+def test_processing_entries_from_crashed_run_are_retried(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"video")
+    ledger = IntakeLedger(db_path)
+    ledger.record_started(video)
+    assert ledger.is_settled(video)
+    ledger.close()
+
+    reopened = IntakeLedger(db_path)
+
+    assert reopened.lookup(video).outcome == OUTCOME_INTERRUPTED
+    assert not reopened.is_settled(video)
+    assert reopened.record_started(video).attempts == 2
+
+
+def test_failures_record_attempts_and_reason(tmp_path):
+    ledger = IntakeLedger(tmp_path / "ledger.sqlite3")
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-1.4")
+
+    for _ in range(3):
+        ledger.record_started(report)
+        ledger.record_outcome(report, OUTCOME_FAILED, error="OCR crashed")
+
+    entry = ledger.lookup(report)
+    assert entry.attempts == 3
+    assert entry.last_error == "OCR crashed"
+    assert not ledger.is_settled(report)
+
+
+def test_compaction_keeps_succeeded_entries_for_files_still_in_intake(tmp_path):
+    ledger = IntakeLedger(tmp_path / "ledger.sqlite3", retention_seconds=60)
+    still_there = tmp_path / "still-there.pdf"
+    still_there.write_bytes(b"%PDF-1.4")
+    gone = tmp_path / "gone.pdf"
+    gone.write_bytes(b"%PDF-1.4")
+    failed = tmp_path / "failed.pdf"
+    failed.write_bytes(b"%PDF-1.4")
+    for path, outcome in (
+        (still_there, OUTCOME_SUCCEEDED),
+        (gone, OUTCOME_SUCCEEDED),
+        (failed, OUTCOME_FAILED),
+    ):
+        ledger.record_started(path)
+        ledger.record_outcome(path, outcome)
+    gone.unlink()
+
+    removed = ledger.compact(now=time.time() + 120)
+
+    assert removed == 2
+    assert ledger.lookup(still_there) is not None
+    assert ledger.lookup(gone) is None
+    assert ledger.lookup(failed) is None
+
+
+def test_restarted_service_only_submits_new_files(monkeypatch, tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    service = file_watcher.FileWatcherService()
+    service.handler.shutdown()
+    service.report_dir = tmp_path / "report_import"
+    service.video_dir = tmp_path / "video_import"
+    service.pseudonymized_dir = tmp_path / "preanonymized_import"
+    for directory in (service.report_dir, service.video_dir, service.pseudonymized_dir):
+        directory.mkdir()
+    imported = service.report_dir / "imported.pdf"
+    imported.write_bytes(b"%PDF-1.4 old")
+    service.handler._mark_processed(str(imported))
+    service.handler._mark_succeeded(str(imported))
+    service.handler.shutdown()
+
+    restarted = file_watcher.AutoProcessingHandler()
+    executor = RecordingExecutor()
+    monkeypatch.setattr(restarted, "executor", executor)
+    service.handler = restarted
+    fresh = service.report_dir / "fresh.pdf"
+    fresh.write_bytes(b"%PDF-1.4 new")
+    os.utime(fresh)
+
+    assert service._process_existing_files() == 1
+    assert [args[0] for _fn, args, _kwargs in executor.submissions] == [str(fresh)]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import urllib.request
+from types import SimpleNamespace
+
+from lx_annotate.watcher.metrics import (
+    Histogram,
+    MetricsServer,
+    WatcherMetrics,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("lx_test_seconds", "Test.", ["kind"], buckets=(1, 5, 10))
+    for value in (0.5, 3, 3, 20):
+        histogram.observe(value, kind="video")
+
+    lines = histogram.render()
+
+    assert "# TYPE lx_test_seconds histogram" in lines
+    assert 'lx_test_seconds_bucket{kind="video",le="1.0"} 1' in lines
+    assert 'lx_test_seconds_bucket{kind="video",le="5.0"} 3' in lines
+    assert 'lx_test_seconds_bucket{kind="video",le="10.0"} 3' in lines
+    assert 'lx_test_seconds_bucket{kind="video",le="+Inf"} 4' in lines
+    assert 'lx_test_seconds_sum{kind="video"} 26.5' in lines
+    assert 'lx_test_seconds_count{kind="video"} 4' in lines
+
+
+def test_metrics_are_served_and_written_to_file(tmp_path):
+    metrics = WatcherMetrics()
+    metrics.observer_restarts.inc()
+    metrics.add_collector(lambda: metrics.lane_queue_depth.set(7, lane="video"))
+    server = MetricsServer(metrics, host="127.0.0.1", port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{server.port}/metrics", timeout=5
+        ) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.stop()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "lx_watcher_observer_restarts_total 1" in body
+    assert 'lx_watcher_lane_queue_depth{lane="video"} 7' in body
+
+    metrics_file = tmp_path / "textfile" / "watcher.prom"
+    metrics.write_file(metrics_file)
+    assert metrics_file.read_text(encoding="utf-8") == metrics.render()
+
+
+def test_inline_report_import_records_wait_duration_and_bytes(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    monkeypatch.setattr(
+        file_watcher,
+        "_resolve_center_by_key",
+        lambda key: SimpleNamespace(center_key=key),
+    )
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: SimpleNamespace(is_complete=True, id="job-1"),
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    report_path = file_watcher.INTAKE_REPORT_DIR / "metrics-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 metrics")
+
+    try:
+        handler.readiness.mark_closed(report_path)
+        handler._process_file(str(report_path))
+
+        metrics = handler.metrics
+        assert metrics.stability_wait_seconds.count(kind="report") == 1
+        assert (
+            metrics.ingest_duration_seconds.count(kind="report", outcome="succeeded")
+            == 1
+        )
+        assert metrics.ingested_bytes.value(kind="report") == len(b"%PDF-1.4 metrics")
+        assert 'lx_watcher_lane_queue_depth{lane="report"} 0' in metrics.render()
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
+
+
+def test_failures_count_retries_then_quarantine(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    quarantined = []
+    monkeypatch.setattr(
+        file_watcher,
+        "quarantine_file",
+        lambda source, **kwargs: quarantined.append(source),
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    report_path = file_watcher.INTAKE_REPORT_DIR / "metrics-failing.pdf"
+    report_path.write_bytes(b"%PDF-1.4 broken")
+
+    try:
+        for _ in range(handler.retry_policy.max_failures):
+            handler.ledger.record_started(str(report_path))
+            handler._record_failure(str(report_path), "broken")
+
+        metrics = handler.metrics
+        assert (
+            metrics.retries.value(kind="report")
+            == handler.retry_policy.max_failures - 1
+        )
+        assert metrics.quarantined.value(kind="report") == 1
+        assert quarantined == [report_path]
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lx_annotate.watcher.model_residency import (
+    ModelResidencyManager,
+    available_memory_mb,
+)
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    requests: list[dict] = []
+    load_delay = 0.05
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        type(self).requests.append({"path": self.path, **payload})
+        if payload.get("keep_alive") == -1:
+            time.sleep(self.load_delay)
+        body = json.dumps({"model": payload.get("model"), "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    _StubOllama.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, _StubOllama.requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _manager(server, clock, **kwargs):
+    host, port = server.server_address
+    return ModelResidencyManager(
+        base_url=f"http://{host}:{port}",
+        model="test-model",
+        idle_seconds=300,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def test_model_stays_loaded_across_back_to_back_reports(ollama):
+    server, requests = ollama
+    clock = _Clock()
+    manager = _manager(server, clock)
+
+    for _ in range(3):
+        with manager.in_use():
+            clock.now += 20
+        manager.tick(pending_reports=1)
+
+    stats = manager.stats()
+    assert stats.loaded
+    assert stats.loads == 1
+    assert stats.unloads == 0
+    assert stats.load_seconds >= 0.05
+    assert all(request["path"] == "/api/generate" for request in requests)
+    assert [request["keep_alive"] for request in requests].count(0) == 0
+
+
+def test_model_is_unloaded_after_idle_period_only(ollama):
+    server, requests = ollama
+    clock = _Clock()
+    manager = _manager(server, clock)
+
+    with manager.in_use():
+        pass
+    clock.now += 200
+    manager.tick(pending_reports=0)
+    assert manager.stats().loaded
+
+    clock.now += 101
+    manager.tick(pending_reports=0)
+
+    assert not manager.stats().loaded
+    assert manager.stats().unloads == 1
+    assert requests[-1] == {
+        "path": "/api/generate",
+        "model": "test-model",
+        "keep_alive": 0,
+    }
+
+
+def test_memory_pressure_unloads_idle_model_but_not_busy_one(ollama):
+    server, _requests = ollama
+    clock = _Clock()
+    manager = _manager(server, clock, min_available_mb=2048, memory_probe=lambda: 512.0)
+
+    with manager.in_use():
+        manager.tick(pending_reports=1)
+        assert manager.stats().loaded
+
+    manager.tick(pending_reports=1)
+    assert not manager.stats().loaded
+
+
+def test_unreachable_server_counts_failure_and_waits_before_retrying():
+    clock = _Clock()
+    manager = ModelResidencyManager(
+        base_url="http://127.0.0.1:9", model="test-model", clock=clock
+    )
+
+    with manager.in_use():
+        pass
+    with manager.in_use():
+        pass
+
+    stats = manager.stats()
+    assert (stats.loads, stats.load_failures, stats.loaded) == (0, 1, False)
+
+
+def test_residency_is_only_enabled_for_ollama(monkeypatch):
+    monkeypatch.setenv("LLM_ENABLED", "true")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    assert ModelResidencyManager.from_env() is None
+
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("LLM_MODEL", "lx-gemma")
+    monkeypatch.setenv("WATCHER_LLM_IDLE_SECONDS", "90")
+    manager = ModelResidencyManager.from_env()
+    assert (manager.model, manager.idle_seconds) == ("lx-gemma", 90.0)
+
+
+def test_available_memory_is_read_from_meminfo(tmp_path):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal: 8192000 kB\nMemAvailable: 2097152 kB\n")
+
+    assert available_memory_mb(meminfo) == 2048.0
+    assert available_memory_mb(tmp_path / "missing") is None
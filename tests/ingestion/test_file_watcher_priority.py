@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from io import StringIO
+
+from django.core.management import call_command
+
+from lx_annotate.watcher.lanes import (
+    LANE_PSEUDONYMIZED,
+    LANE_REPORT,
+    IntakeLaneExecutor,
+)
+from lx_annotate.watcher.priority import (
+    KIND_REPORT,
+    KIND_VIDEO,
+    MEBIBYTE,
+    PriorityPolicy,
+    QueuedFile,
+    estimate_start_times,
+    write_queue_snapshot,
+)
+
+
+def test_small_report_ranks_ahead_of_large_video_until_the_video_has_aged():
+    policy = PriorityPolicy(kind_offsets={KIND_REPORT: 0.0, KIND_VIDEO: 300.0})
+    video = policy.rank(
+        path="/intake/huge.mp4", kind=KIND_VIDEO, size=700 * MEBIBYTE, now=1000.0
+    )
+
+    early_report = policy.rank(
+        path="/intake/a.pdf", kind=KIND_REPORT, size=MEBIBYTE, now=1010.0
+    )
+    late_report = policy.rank(
+        path="/intake/b.pdf", kind=KIND_REPORT, size=MEBIBYTE, now=2100.0
+    )
+
+    assert early_report.key < video.key
+    assert late_report.key > video.key
+
+
+def test_center_weight_moves_a_center_ahead():
+    policy = PriorityPolicy(center_weights={"urgent": 4.0})
+
+    regular = policy.rank(
+        path="/a.pdf", kind=KIND_REPORT, size=40 * MEBIBYTE, center_key="x", now=0.0
+    )
+    urgent = policy.rank(
+        path="/b.pdf", kind=KIND_REPORT, size=40 * MEBIBYTE, center_key="urgent", now=0
+    )
+
+    assert urgent.key < regular.key
+
+
+def test_policy_reads_weights_from_env(monkeypatch):
+    monkeypatch.setenv("WATCHER_PRIORITY_KIND_OFFSETS", "video=60,broken")
+    monkeypatch.setenv("WATCHER_PRIORITY_CENTER_WEIGHTS", "site_a=2.5")
+    monkeypatch.setenv("WATCHER_PRIORITY_AGING", "0.5")
+
+    policy = PriorityPolicy.from_env()
+
+    assert policy.kind_offsets == {KIND_REPORT: 0.0, KIND_VIDEO: 60.0}
+    assert policy.center_weights == {"site_a": 2.5}
+    assert policy.aging_factor == 0.5
+
+
+def test_lane_starts_queued_files_in_rank_order():
+    policy = PriorityPolicy()
+    sizes = {
+        "/intake/huge.mp4": 900 * MEBIBYTE,
+        "/intake/scan.pdf": 5 * MEBIBYTE,
+        "/intake/letter.pdf": 10_000,
+    }
+
+    def rank(path):
+        kind = KIND_VIDEO if path.endswith(".mp4") else KIND_REPORT
+        return policy.rank(path=path, kind=kind, size=sizes.get(path, 0))
+
+    executor = IntakeLaneExecutor(
+        classify=lambda path: LANE_PSEUDONYMIZED,
+        lane_workers={LANE_PSEUDONYMIZED: 1},
+        rank=rank,
+    )
+    release = threading.Event()
+    started = threading.Event()
+    order = []
+
+    def blocking(path):
+        started.set()
+        release.wait(timeout=10)
+
+    try:
+        executor.submit(blocking, "/intake/first.pdf")
+        assert started.wait(timeout=5)
+        futures = [
+            executor.submit(order.append, path)
+            for path in ("/intake/huge.mp4", "/intake/scan.pdf", "/intake/letter.pdf")
+        ]
+        running, pending = executor.queued_files()
+        assert [item.path for item in running] == ["/intake/first.pdf"]
+        assert [item.path for item in pending] == [
+            "/intake/letter.pdf",
+            "/intake/scan.pdf",
+            "/intake/huge.mp4",
+        ]
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    assert order == ["/intake/letter.pdf", "/intake/scan.pdf", "/intake/huge.mp4"]
+
+
+def _queued(path, *, lane=LANE_REPORT, estimate=60.0, started_at=None):
+    return QueuedFile(
+        lane=lane,
+        path=path,
+        kind=KIND_REPORT,
+        size=MEBIBYTE,
+        center_key="",
+        submitted_at=900.0,
+        estimate_seconds=estimate,
+        started_at=started_at,
+    )
+
+
+def test_start_times_follow_worker_availability():
+    schedule = estimate_start_times(
+        workers={LANE_REPORT: 2},
+        running=[_queued("/r.pdf", estimate=100.0, started_at=950.0)],
+        pending=[_queued("/a.pdf"), _queued("/b.pdf"), _queued("/c.pdf")],
+        now=1000.0,
+    )
+
+    assert [(item.position, item.estimated_start) for item in schedule] == [
+        (1, 1000.0),
+        (2, 1050.0),
+        (3, 1060.0),
+    ]
+
+
+def test_watcher_queue_command_prints_pending_files(tmp_path):
+    snapshot = tmp_path / "queue.json"
+    write_queue_snapshot(
+        snapshot,
+        workers={LANE_REPORT: 1},
+        running=[_queued("/intake/running.pdf", started_at=None)],
+        pending=[_queued("/intake/waiting.pdf")],
+    )
+    stdout = StringIO()
+
+    call_command("watcher_queue", snapshot=str(snapshot), stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "running" in output and "/intake/running.pdf" in output
+    assert "/intake/waiting.pdf" in output
+    assert "(+1m00s)" in output
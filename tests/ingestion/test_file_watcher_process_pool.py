@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from lx_annotate.watcher.ledger import OUTCOME_DEFERRED
+from lx_annotate.watcher.lanes import LANE_PSEUDONYMIZED, LANE_REPORT
+from lx_annotate.watcher.process_pool import (
+    RESULT_COMPLETE,
+    RESULT_NOT_READY,
+    configured_ocr_pool,
+)
+
+
+class FakePool:
+    processes = 3
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+        self.closed = False
+
+    def run(self, kind, **kwargs):
+        self.calls.append((kind, kwargs))
+        return self.result
+
+    def shutdown(self):
+        self.closed = True
+
+
+def test_pool_is_disabled_unless_processes_are_configured(monkeypatch):
+    monkeypatch.delenv("WATCHER_OCR_PROCESSES", raising=False)
+    assert configured_ocr_pool() is None
+
+    monkeypatch.setenv("WATCHER_OCR_PROCESSES", "4")
+    monkeypatch.setenv("WATCHER_OCR_RECYCLE_AFTER", "10")
+    pool = configured_ocr_pool()
+    assert (pool.processes, pool.recycle_after) == (4, 10)
+
+
+def test_ocr_lanes_get_one_thread_per_process(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    monkeypatch.setenv("WATCHER_OCR_PROCESSES", "3")
+    handler = file_watcher.AutoProcessingHandler()
+    try:
+        assert handler.executor.lanes[LANE_REPORT].max_workers == 3
+        assert handler.executor.lanes[LANE_PSEUDONYMIZED].max_workers == 3
+    finally:
+        handler.shutdown()
+
+
+def _report_handler(monkeypatch, file_watcher, pool):
+    monkeypatch.setattr(
+        file_watcher.RawPdfFile.objects,
+        "filter",
+        lambda **kwargs: SimpleNamespace(exists=lambda: False),
+    )
+    monkeypatch.setattr(
+        file_watcher,
+        "process_watcher_file",
+        lambda **kwargs: (_ for _ in ()).throw(AssertionError("ingest in watcher")),
+    )
+    handler = file_watcher.AutoProcessingHandler()
+    handler.ocr_pool = pool
+    return handler
+
+
+def test_report_import_runs_in_ocr_process(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    pool = FakePool((RESULT_COMPLETE, 42))
+    handler = _report_handler(monkeypatch, file_watcher, pool)
+    report_path = file_watcher.INTAKE_REPORT_DIR / "pooled-report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 pooled")
+
+    try:
+        handler._process_report(report_path)
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
+
+    kind, kwargs = pool.calls[0]
+    assert kind == "report"
+    assert kwargs["file_path"] == report_path
+    assert kwargs["center_reference"] == handler.default_center_reference
+    assert not report_path.exists()
+    assert pool.closed
+
+
+def test_not_ready_result_from_ocr_process_defers_report(monkeypatch):
+    import lx_annotate.file_watcher as file_watcher
+
+    pool = FakePool((RESULT_NOT_READY, "still copying"))
+    handler = _report_handler(monkeypatch, file_watcher, pool)
+    report_path = file_watcher.INTAKE_REPORT_DIR / "pooled-not-ready.pdf"
+    report_path.write_bytes(b"%PDF-1.4 partial")
+
+    try:
+        handler._process_report(report_path)
+        entry = handler.ledger.lookup(str(report_path))
+        assert entry.outcome == OUTCOME_DEFERRED
+        assert "still copying" in entry.last_error
+        assert report_path.exists()
+    finally:
+        report_path.unlink(missing_ok=True)
+        handler.shutdown()
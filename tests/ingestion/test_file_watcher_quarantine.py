@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import time
+
+from lx_annotate.watcher.ledger import (
+    OUTCOME_FAILED,
+    OUTCOME_QUARANTINED,
+    IntakeLedger,
+)
+from lx_annotate.watcher.quarantine import (
+    RetryPolicy,
+    read_quarantine_reason,
+    reason_sidecar_path,
+)
+
+
+def test_retry_delay_grows_exponentially_up_to_cap():
+    policy = RetryPolicy(base_delay_seconds=10, max_delay_seconds=60, max_failures=5)
+
+    assert [policy.delay_for(failures) for failures in range(1, 6)] == [
+        10,
+        20,
+        40,
+        60,
+        60,
+    ]
+    assert not policy.should_quarantine(4)
+    assert policy.should_quarantine(5)
+
+
+def test_failed_file_is_skipped_until_backoff_expires(tmp_path):
+    ledger = IntakeLedger(tmp_path / "ledger.sqlite3")
+    report = tmp_path / "broken.pdf"
+    report.write_bytes(b"%PDF-1.4 broken")
+    ledger.record_started(report)
+    now = time.time()
+    ledger.record_outcome(report, OUTCOME_FAILED, next_attempt_at=now + 30)
+
+    assert ledger.retry_pending(report, now=now)
+    assert not ledger.retry_pending(report, now=now + 31)
+
+    report.write_bytes(b"%PDF-1.4 replaced by a fixed export")
+    assert not ledger.retry_pending(report, now=now)
+
+
+def test_handler_quarantines_file_after_max_failures(monkeypatch, tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    quarantine_dir = tmp_path / "quarantine"
+    monkeypatch.setenv("LX_ANNOTATE_QUARANTINE_DIR", str(quarantine_dir))
+    handler = file_watcher.AutoProcessingHandler()
+    handler.retry_policy = RetryPolicy(
+        base_delay_seconds=0, max_delay_seconds=0, max_failures=3
+    )
+    report = tmp_path / "poison.pdf"
+    report.write_bytes(b"%PDF-1.4 poison")
+
+    try:
+        for attempt in range(1, 4):
+            assert str(report) not in handler.processed_files
+            handler._mark_processed(str(report))
+            handler._unmark_processed(str(report), error=f"OCR crashed #{attempt}")
+    finally:
+        handler.shutdown()
+
+    quarantined = quarantine_dir / "poison.pdf"
+    assert not report.exists()
+    assert quarantined.read_bytes() == b"%PDF-1.4 poison"
+    recorded = read_quarantine_reason(quarantined)
+    assert recorded["reason"] == "OCR crashed #3"
+    assert recorded["failures"] == 3
+    assert json.loads(reason_sidecar_path(quarantined).read_text())["original_name"]
+    entry = handler.ledger.lookup(str(report))
+    assert entry.outcome == OUTCOME_QUARANTINED
+    assert str(report) in handler.processed_files
+
+
+def test_handler_backs_off_instead_of_retrying_on_next_rescan(monkeypatch, tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    handler.retry_policy = RetryPolicy(
+        base_delay_seconds=60, max_delay_seconds=600, max_failures=5
+    )
+    report = tmp_path / "flaky.pdf"
+    report.write_bytes(b"%PDF-1.4 flaky")
+
+    try:
+        handler._mark_processed(str(report))
+        handler._unmark_processed(str(report), error="database locked")
+
+        assert str(report) in handler.processed_files
+        assert not handler._ensure_processing_slot(str(report))
+        entry = handler.ledger.lookup(str(report))
+        assert entry.failures == 1
+        assert entry.next_attempt_at > time.time() + 50
+    finally:
+        handler.shutdown()
+
+    assert report.exists()
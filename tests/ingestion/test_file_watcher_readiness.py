@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+from watchdog.events import FileClosedEvent, FileModifiedEvent  # type: ignore[import-not-found]
+from watchdog.observers import Observer  # type: ignore[import-not-found]
+
+from lx_annotate.watcher.readiness import (
+    FileReadinessTracker,
+    is_network_filesystem,
+    observer_emits_close_events,
+)
+
+
+def test_close_write_marks_file_ready_without_polling(tmp_path):
+    tracker = FileReadinessTracker(mode="events")
+    report_path = tmp_path / "report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 closed")
+    tracker.mark_closed(report_path)
+
+    started = time.monotonic()
+    assert tracker.wait_until_ready(report_path, timeout=5, interval=2.0)
+    assert time.monotonic() - started < 0.5
+    assert tracker.pending_signal(report_path) is None
+
+
+def test_waiting_worker_wakes_on_close_event(tmp_path):
+    tracker = FileReadinessTracker(mode="events")
+    report_path = tmp_path / "report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 partial")
+    os.utime(report_path)
+
+    def close_later():
+        time.sleep(0.1)
+        tracker.mark_closed(report_path)
+
+    closer = threading.Thread(target=close_later)
+    closer.start()
+    started = time.monotonic()
+    ready = tracker.wait_until_ready(report_path, timeout=5, interval=2.0)
+    closer.join()
+
+    assert ready
+    assert time.monotonic() - started < 1.5
+
+
+def test_write_after_close_invalidates_signal(tmp_path):
+    tracker = FileReadinessTracker(mode="events")
+    report_path = tmp_path / "report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 first")
+    tracker.mark_closed(report_path)
+    with report_path.open("ab") as handle:
+        handle.write(b" appended")
+
+    assert not tracker.wait_until_ready(
+        report_path, timeout=0.3, stable_checks_required=10, interval=0.05
+    )
+
+
+def test_polling_mode_ignores_close_events(tmp_path):
+    tracker = FileReadinessTracker(mode="polling")
+    report_path = tmp_path / "report.pdf"
+    report_path.write_bytes(b"%PDF-1.4 polled")
+    tracker.mark_closed(report_path)
+
+    started = time.monotonic()
+    assert tracker.wait_until_ready(
+        report_path, timeout=5, stable_checks_required=3, interval=0.05
+    )
+    assert time.monotonic() - started >= 0.15
+
+
+def test_network_mounts_fall_back_to_polling():
+    mounts = [("/", "ext4"), ("/srv/intake", "nfs4"), ("/srv/intake/local", "xfs")]
+
+    assert is_network_filesystem("/srv/intake/video/clip.mp4", mounts=mounts)
+    assert not is_network_filesystem("/srv/intake/local/clip.mp4", mounts=mounts)
+    assert not is_network_filesystem("/srv/intakes/clip.mp4", mounts=mounts)
+
+
+def test_handler_routes_close_and_modify_events_to_tracker(monkeypatch, tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    handler = file_watcher.AutoProcessingHandler()
+    try:
+        report_path = tmp_path / "report.pdf"
+        report_path.write_bytes(b"%PDF-1.4")
+
+        handler.dispatch(FileClosedEvent(str(report_path)))
+        assert handler.readiness.pending_signal(report_path) is not None
+
+        handler.dispatch(FileModifiedEvent(str(report_path)))
+        assert handler.readiness.pending_signal(report_path) is None
+    finally:
+        handler.shutdown()
+
+
+def test_small_pdf_is_imported_within_milliseconds_of_close(monkeypatch, tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    observer = Observer()
+    if not observer_emits_close_events(observer):
+        pytest.skip("close-write events require the inotify observer")
+
+    report_dir = (tmp_path / "report_import").resolve()
+    report_dir.mkdir()
+    monkeypatch.setattr(file_watcher, "INTAKE_REPORT_DIR", report_dir)
+
+    handler = file_watcher.AutoProcessingHandler()
+    handler.readiness.events_available = True
+    imported = threading.Event()
+    monkeypatch.setattr(handler, "_process_report", lambda path: imported.set())
+
+    observer.schedule(handler, str(report_dir), recursive=False)
+    observer.start()
+    try:
+        started = time.monotonic()
+        with (report_dir / "small.pdf").open("wb") as handle:
+            handle.write(b"%PDF-1.4 small report")
+        assert imported.wait(timeout=10)
+        time_to_import = time.monotonic() - started
+    finally:
+        observer.stop()
+        observer.join()
+        handler.shutdown()
+
+    # The polling fallback needs at least 10 checks * 2 s before it accepts a file.
+    assert time_to_import < 1.0
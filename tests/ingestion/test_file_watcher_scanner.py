@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import time
+
+from lx_annotate.watcher.scanner import IntakeScanner, ScanRoot
+
+
+def _age_directory(directory, seconds=60):
+    past = time.time() - seconds
+    os.utime(directory, (past, past))
+
+
+def _paths(scanner, roots):
+    return sorted(candidate.path for candidate in scanner.scan(roots))
+
+
+def test_unchanged_directory_is_not_listed_again(tmp_path):
+    report_dir = tmp_path / "report_import"
+    report_dir.mkdir()
+    (report_dir / "a.pdf").write_bytes(b"%PDF a")
+    (report_dir / "notes.txt").write_text("ignored")
+    (report_dir / ".hidden.pdf").write_bytes(b"%PDF hidden")
+    _age_directory(report_dir)
+    scanner = IntakeScanner(
+        ignore=lambda path: os.path.basename(path).startswith("."),
+        full_rescan_seconds=300,
+    )
+    roots = [ScanRoot("report", report_dir, {".pdf"})]
+
+    assert _paths(scanner, roots) == [str(report_dir / "a.pdf")]
+    assert _paths(scanner, roots) == [str(report_dir / "a.pdf")]
+
+    stats = scanner.stats()
+    assert stats.directories_listed == 1
+    assert stats.directories_reused == 1
+    assert stats.entries_listed == 3
+
+
+def test_directory_mtime_change_triggers_relisting(tmp_path):
+    video_dir = tmp_path / "video_import"
+    video_dir.mkdir()
+    (video_dir / "first.mp4").write_bytes(b"first")
+    _age_directory(video_dir, seconds=120)
+    scanner = IntakeScanner(full_rescan_seconds=300)
+    roots = [ScanRoot("video", video_dir, {".mp4"})]
+    list(scanner.scan(roots))
+
+    (video_dir / "second.MP4").write_bytes(b"second")
+    _age_directory(video_dir, seconds=60)
+
+    assert _paths(scanner, roots) == [
+        str(video_dir / "first.mp4"),
+        str(video_dir / "second.MP4"),
+    ]
+    assert scanner.stats().directories_listed == 2
+
+
+def test_recently_modified_directory_is_not_trusted(tmp_path):
+    report_dir = tmp_path / "report_import"
+    report_dir.mkdir()
+    scanner = IntakeScanner(full_rescan_seconds=300, racy_window_seconds=3600)
+    roots = [ScanRoot("report", report_dir, {".pdf"})]
+
+    list(scanner.scan(roots))
+    list(scanner.scan(roots))
+
+    assert scanner.stats().directories_listed == 2
+
+
+def test_full_rescan_interval_relists_unchanged_directories(tmp_path):
+    report_dir = tmp_path / "report_import"
+    report_dir.mkdir()
+    _age_directory(report_dir)
+    scanner = IntakeScanner(full_rescan_seconds=0)
+    roots = [ScanRoot("report", report_dir, {".pdf"})]
+
+    list(scanner.scan(roots))
+    list(scanner.scan(roots))
+
+    assert scanner.stats().directories_listed == 2
+
+
+def test_missing_directory_yields_nothing(tmp_path):
+    scanner = IntakeScanner()
+
+    assert list(scanner.scan([ScanRoot("report", tmp_path / "gone", {".pdf"})])) == []
+
+
+def test_service_rescan_submits_each_unseen_file_once(monkeypatch, tmp_path):
+    import lx_annotate.file_watcher as file_watcher
+
+    class RecordingExecutor:
+        def __init__(self):
+            self.submissions = []
+
+        def submit(self, fn, *args, **kwargs):
+            self.submissions.append(args[0])
+
+    service = file_watcher.FileWatcherService()
+    service.handler.shutdown()
+    executor = RecordingExecutor()
+    monkeypatch.setattr(service.handler, "executor", executor)
+    service.video_dir = tmp_path / "video_import"
+    service.report_dir = tmp_path / "report_import"
+    service.pseudonymized_dir = tmp_path / "preanonymized_import"
+    for directory in (service.video_dir, service.report_dir, service.pseudonymized_dir):
+        directory.mkdir()
+    report = service.report_dir / "ready.pdf"
+    report.write_bytes(b"%PDF")
+    for directory in (service.video_dir, service.report_dir, service.pseudonymized_dir):
+        _age_directory(directory)
+
+    assert service._process_existing_files() == 1
+    assert service._process_existing_files() == 0
+    assert executor.submissions == [str(report)]
+    assert service.scanner.stats().directories_reused == 3
+
+
+def test_service_start_scans_only_on_the_calling_thread(monkeypatch, tmp_path):
+    import threading
+
+    import lx_annotate.file_watcher as file_watcher
+
+    service = file_watcher.FileWatcherService()
+    service.video_dir = tmp_path / "video_import"
+    service.report_dir = tmp_path / "report_import"
+    service.pseudonymized_dir = tmp_path / "preanonymized_import"
+    for directory in (service.video_dir, service.report_dir, service.pseudonymized_dir):
+        directory.mkdir()
+    scan_threads = []
+    sleeps = []
+    main_thread = threading.current_thread()
+    real_sleep = file_watcher.time.sleep
+
+    def stop_after_one_rescan(seconds):
+        if threading.current_thread() is not main_thread:
+            return real_sleep(seconds)
+        sleeps.append(seconds)
+        if len(sleeps) > 1:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(service, "_validate_django_setup", lambda: None)
+    monkeypatch.setattr(service, "_health_check", lambda: None)
+    monkeypatch.setattr(
+        service,
+        "_process_existing_files",
+        lambda: scan_threads.append(threading.current_thread()) or 0,
+    )
+    monkeypatch.setattr(file_watcher.time, "sleep", stop_after_one_rescan)
+
+    service.start()
+
+    assert scan_threads == [main_thread] * 2
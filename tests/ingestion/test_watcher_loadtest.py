@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import scripts.loadtest_watcher as loadtest
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert loadtest.percentile(values, 50) == 50.0
+    assert loadtest.percentile(values, 95) == 95.0
+    assert loadtest.percentile(values, 99) == 99.0
+    assert loadtest.percentile([], 50) is None
+
+
+def test_load_test_hands_off_every_synthetic_file(monkeypatch, tmp_path):
+    monkeypatch.setenv("WATCHER_DEBOUNCE_SECONDS", "0.1")
+    config = loadtest.LoadTestConfig(
+        duration_seconds=1.0,
+        drain_seconds=20.0,
+        traffic=[
+            loadtest.TrafficSpec("report", 600, 4 * loadtest.KIBIBYTE, ".pdf"),
+            loadtest.TrafficSpec("video", 120, 64 * loadtest.KIBIBYTE, ".mp4"),
+        ],
+        seed=7,
+    )
+
+    summary = loadtest.run_load_test(config, tmp_path).summary()
+
+    assert summary["missing"] == 0
+    overall = summary["kinds"]["all"]
+    assert overall["handed_off"] == overall["written"] > 0
+    assert overall["p50"] <= overall["p95"] <= overall["p99"]
+    assert summary["files_per_second"] > 0
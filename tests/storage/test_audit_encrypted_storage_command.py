@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+
+from lx_annotate.storage.encrypted import EncryptedStorage
+
+
+@pytest.fixture
+def audit_storage(tmp_path, master_key):
+    # The command audits with the configured key, as the storage does.
+    return EncryptedStorage(
+        location=str(tmp_path / "vault"),
+        base_url="/media/",
+        master_key=master_key,
+        chunk_size=1024,
+    )
+
+
+@pytest.fixture
+def audit_paths(tmp_path):
+    maintenance = tmp_path / "maintenance"
+    return [
+        f"--state={maintenance / 'audit.sqlite3'}",
+        f"--report={maintenance / 'report.json'}",
+    ], maintenance / "report.json"
+
+
+def _run(monkeypatch, storage, *args):
+    from lx_annotate.management.commands import audit_encrypted_storage as command_mod
+
+    monkeypatch.setattr(command_mod, "default_storage", storage)
+    out = StringIO()
+    call_command("audit_encrypted_storage", *args, stdout=out, stderr=StringIO())
+    return out.getvalue()
+
+
+def test_audit_passes_clean_vault_and_skips_unchanged_files(
+    monkeypatch, audit_storage, audit_paths
+):
+    options, report_path = audit_paths
+    audit_storage.save("videos/a.mp4", ContentFile(b"a" * 5000))
+    audit_storage.save("videos/b.mp4", ContentFile(b"b" * 100))
+
+    first = _run(monkeypatch, audit_storage, *options)
+    second = _run(monkeypatch, audit_storage, *options)
+
+    assert "checked=2" in first and "corrupt=0" in first
+    assert "checked=0" in second and "unchanged=2" in second
+    report = json.loads(report_path.read_text())
+    assert report["corrupt"] == []
+    assert report["files_unchanged"] == 2
+
+
+def test_audit_reports_tampered_chunk(monkeypatch, audit_storage, audit_paths):
+    options, report_path = audit_paths
+    name = audit_storage.save("videos/a.mp4", ContentFile(b"a" * 5000))
+    raw_path = Path(audit_storage.path(name))
+    raw = bytearray(raw_path.read_bytes())
+    raw[-40] ^= 0xFF
+    raw_path.write_bytes(bytes(raw))
+
+    with pytest.raises(CommandError, match="corrupt=1"):
+        _run(monkeypatch, audit_storage, *options)
+
+    report = json.loads(report_path.read_text())
+    assert [entry["name"] for entry in report["corrupt"]] == [name]
+    assert report["corrupt"][0]["chunk"] == 4
+
+
+def test_audit_lists_plaintext_payloads_without_failing(
+    monkeypatch, audit_storage, audit_paths
+):
+    options, report_path = audit_paths
+    raw_path = Path(audit_storage.location) / "videos" / "copied.mp4"
+    raw_path.parent.mkdir(parents=True)
+    raw_path.write_bytes(b"plaintext")
+
+    output = _run(monkeypatch, audit_storage, *options)
+
+    assert "Not encrypted: videos/copied.mp4" in output
+    assert json.loads(report_path.read_text())["unencrypted"] == ["videos/copied.mp4"]
+
+
+def test_audit_fails_when_backend_is_not_encrypted(monkeypatch):
+    from django.core.files.storage import FileSystemStorage
+
+    with pytest.raises(CommandError, match="Encrypted storage is not active"):
+        _run(monkeypatch, FileSystemStorage(location="/tmp", base_url="/media/"))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import importlib
+import io
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from django.core.files.base import ContentFile
+
+from lx_annotate.storage.encrypted import EncryptedStorage
+from lx_annotate.storage.encryption import (
+    CHUNK_LENGTH_STRUCT,
+    build_chunk_index,
+    encrypt_stream,
+)
+from lx_annotate.storage.index_cache import (
+    ChunkIndexCache,
+    ChunkIndexError,
+    storage_chunk_index,
+    walk_chunk_index,
+)
+
+MASTER_KEY = b"k" * 32
+
+
+def _walk(path):
+    with open(path, "rb") as handle:
+        return walk_chunk_index(handle)
+
+
+def _write_encrypted(path, payload: bytes, chunk_size=1000) -> None:
+    with open(path, "wb") as handle:
+        encrypt_stream(
+            io.BytesIO(payload), handle, master_key=MASTER_KEY, chunk_size=chunk_size
+        )
+
+
+def test_walk_records_chunk_layout(tmp_path):
+    path = tmp_path / "video.enc"
+    _write_encrypted(path, os.urandom(2250))
+
+    index = _walk(path)
+
+    with open(path, "rb") as handle:
+        _header, _header_bytes, entries, plaintext_size = build_chunk_index(handle)
+    assert index.chunk_size == 1000
+    assert index.chunk_count == 3
+    assert index.plaintext_size == plaintext_size == 2250
+    assert [index.chunk_for_offset(offset) for offset in (0, 999, 1000, 2249)] == [
+        0,
+        0,
+        1,
+        2,
+    ]
+    assert index.plaintext_start(2) == 2000
+    assert [index.entry(chunk) for chunk in range(3)] == entries
+    assert index.ciphertext_offset(0) == index.data_offset
+    assert (
+        index.ciphertext_offset(1) + CHUNK_LENGTH_STRUCT.size
+        == entries[1].ciphertext_offset
+    )
+    with pytest.raises(IndexError):
+        index.chunk_for_offset(2250)
+
+
+def test_walk_rejects_truncated_file(tmp_path):
+    path = tmp_path / "video.enc"
+    _write_encrypted(path, os.urandom(2000))
+    with open(path, "r+b") as handle:
+        handle.truncate(os.path.getsize(path) - 10)
+
+    with pytest.raises(ChunkIndexError):
+        _walk(path)
+
+
+def test_walk_rejects_plaintext_file(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"not encrypted")
+
+    with pytest.raises(ChunkIndexError):
+        _walk(path)
+
+
+def test_cache_value_matches_build_chunk_index(tmp_path):
+    path = tmp_path / "video.enc"
+    _write_encrypted(path, os.urandom(2250))
+
+    with open(path, "rb") as handle:
+        expected = build_chunk_index(handle)
+
+    assert _walk(path).cache_value() == expected
+    assert ChunkIndexCache(None).get(path).cache_value() == expected
+
+
+def test_storage_index_is_seeded_from_the_persisted_cache(tmp_path, monkeypatch):
+    from lx_annotate.storage import index_cache
+
+    monkeypatch.setattr(
+        index_cache,
+        "_default_cache",
+        index_cache.ChunkIndexCache(tmp_path / "chunk_index.sqlite3"),
+    )
+    storage = EncryptedStorage(
+        location=str(tmp_path / "vault"), master_key=MASTER_KEY, chunk_size=1000
+    )
+    payload = os.urandom(2250)
+    name = storage.save("videos/clip.mp4", ContentFile(payload))
+    storage_chunk_index(storage, name)
+    restarted = EncryptedStorage(
+        location=storage.location, master_key=MASTER_KEY, chunk_size=1000
+    )
+
+    with restarted.open_encrypted(name) as handle:
+        expected = build_chunk_index(handle)
+    monkeypatch.setattr(
+        importlib.import_module(EncryptedStorage.__module__),
+        "build_chunk_index",
+        lambda *_args: pytest.fail("the storage walked a seeded file"),
+    )
+
+    storage_chunk_index(restarted, name)
+
+    assert list(restarted._index_cache.values()) == [expected]
+    assert restarted.get_plaintext_size(name) == 2250
+    assert b"".join(restarted.iter_decrypted_range(name, start=990, end=1010)) == (
+        payload[990:1011]
+    )
+
+
+def test_cache_survives_restart_and_invalidates_rewrites(tmp_path, monkeypatch):
+    from lx_annotate.storage import index_cache
+
+    path = tmp_path / "video.enc"
+    _write_encrypted(path, os.urandom(1500))
+    db_path = tmp_path / "chunk_index.sqlite3"
+    ChunkIndexCache(db_path).get(path)
+
+    walks = []
+    original_walk = index_cache.walk_chunk_index
+    monkeypatch.setattr(
+        index_cache,
+        "walk_chunk_index",
+        lambda target: walks.append(target) or original_walk(target),
+    )
+    restarted = ChunkIndexCache(db_path)
+
+    cached = restarted.get(path)
+    assert cached == _walk(path)
+    assert walks == []
+    assert (restarted.hits, restarted.misses) == (1, 0)
+
+    _write_encrypted(path, os.urandom(2010))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+    assert restarted.get(path).plaintext_size == 2010
+    assert len(walks) == 1
+
+
+def test_prune_drops_missing_files(tmp_path):
+    kept = tmp_path / "kept.enc"
+    removed = tmp_path / "removed.enc"
+    _write_encrypted(kept, b"k" * 10)
+    _write_encrypted(removed, b"r" * 10)
+    cache = ChunkIndexCache(tmp_path / "chunk_index.sqlite3")
+    cache.get(kept)
+    cache.get(removed)
+    removed.unlink()
+
+    assert cache.prune() == 1
+    assert cache.prune() == 0
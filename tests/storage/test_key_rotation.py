@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import base64
+import io
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from lx_annotate.storage.encryption import (
+    DecryptedStream,
+    encrypt_stream,
+    iter_decrypted_chunks,
+)
+from lx_annotate.storage.key_rotation import (
+    OUTCOME_CURRENT,
+    OUTCOME_REENCRYPTED,
+    OUTCOME_WOULD_REENCRYPT,
+    KeyRotationError,
+    RotationVerificationError,
+    decode_master_key,
+    read_file_header,
+    reencrypt_stream,
+    rotate_file,
+)
+
+OLD_KEY = b"o" * 32
+NEW_KEY = b"n" * 32
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def _write_file(path, payload: bytes, key: bytes = OLD_KEY) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as handle:
+        encrypt_stream(io.BytesIO(payload), handle, master_key=key, chunk_size=1024)
+
+
+def _read_file(path, key: bytes) -> bytes:
+    with open(path, "rb") as handle:
+        return DecryptedStream(handle, master_key=key).read()
+
+
+def test_reencrypt_keeps_chunking_under_a_fresh_header():
+    payload = os.urandom(5000)
+    source = io.BytesIO()
+    old_header = encrypt_stream(
+        io.BytesIO(payload), source, master_key=OLD_KEY, chunk_size=1024
+    )
+    source.seek(0)
+    target = io.BytesIO()
+
+    new_header = reencrypt_stream(source, target, old_key=OLD_KEY, new_key=NEW_KEY)
+
+    assert new_header.chunk_size == old_header.chunk_size
+    assert new_header.nonce_prefix != old_header.nonce_prefix
+    target.seek(0)
+    chunks = list(iter_decrypted_chunks(target, master_key=NEW_KEY))
+    assert [len(chunk) for chunk in chunks] == [1024] * 4 + [904]
+    assert b"".join(chunks) == payload
+
+
+def test_rotate_file_reencrypts_under_the_new_key(tmp_path):
+    payload = os.urandom(5000)
+    path = tmp_path / "videos" / "clip.mp4"
+    _write_file(path, payload)
+    os.chmod(path, 0o600)
+
+    assert rotate_file(path, OLD_KEY, NEW_KEY, dry_run=True) == (
+        OUTCOME_WOULD_REENCRYPT
+    )
+    assert _read_file(path, OLD_KEY) == payload
+    assert rotate_file(path, OLD_KEY, NEW_KEY) == OUTCOME_REENCRYPTED
+    assert rotate_file(path, OLD_KEY, NEW_KEY) == OUTCOME_CURRENT
+
+    assert _read_file(path, NEW_KEY) == payload
+    assert read_file_header(path).chunk_size == 1024
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert sorted(p.name for p in path.parent.iterdir()) == ["clip.mp4"]
+
+
+def test_file_opening_with_neither_key_is_rejected(tmp_path):
+    path = tmp_path / "clip.mp4"
+    _write_file(path, b"payload", key=b"x" * 32)
+
+    with pytest.raises(KeyRotationError, match="neither"):
+        rotate_file(path, OLD_KEY, NEW_KEY)
+
+
+def test_damaged_chunk_keeps_the_original(tmp_path):
+    path = tmp_path / "clip.mp4"
+    _write_file(path, os.urandom(3000))
+    with open(path, "r+b") as handle:
+        handle.seek(-10, os.SEEK_END)
+        handle.write(b"\0" * 10)
+    before = path.read_bytes()
+
+    with pytest.raises(KeyRotationError, match="does not decrypt"):
+        rotate_file(path, OLD_KEY, NEW_KEY)
+
+    assert path.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["clip.mp4"]
+
+
+def test_failed_verification_keeps_the_original(tmp_path):
+    path = tmp_path / "clip.mp4"
+    _write_file(path, b"payload")
+    before = path.read_bytes()
+    checked = []
+
+    with pytest.raises(RotationVerificationError):
+        rotate_file(
+            path,
+            OLD_KEY,
+            NEW_KEY,
+            verify=lambda copy: checked.append(_read_file(copy, NEW_KEY)) and False,
+        )
+
+    assert checked == [b"payload"]
+    assert path.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["clip.mp4"]
+
+
+def test_decode_master_key_validates_length():
+    assert decode_master_key(_b64(NEW_KEY) + "\n") == NEW_KEY
+    with pytest.raises(KeyRotationError):
+        decode_master_key(_b64(b"short"))
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import io
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.exceptions import InvalidTag
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+
+from lx_annotate.storage import encryption, parallel
+from lx_annotate.storage.encrypted import EncryptedStorage
+from lx_annotate.storage.parallel import (
+    encrypt_stream_parallel,
+    iter_decrypted_chunks_parallel,
+    iter_parallel_decrypted_chunks,
+)
+
+MASTER_KEY = b"test-master-key-32-bytes-long-!!"
+SIZES = [0, 1, 999, 1000, 1001, 23456]
+
+
+@pytest.fixture
+def fixed_header(monkeypatch):
+    """Make every new file use one header so outputs can be compared."""
+    from endoreg_db.utils.encryption import encryption as endoreg_encryption
+
+    header = encryption.build_file_header(master_key=MASTER_KEY, chunk_size=1000)
+    monkeypatch.setattr(
+        endoreg_encryption, "build_file_header", lambda **_kwargs: header
+    )
+    monkeypatch.setattr(parallel, "build_file_header", lambda **_kwargs: header)
+    return header
+
+
+def _serial_ciphertext(payload: bytes) -> bytes:
+    destination = io.BytesIO()
+    encryption.encrypt_stream(
+        io.BytesIO(payload), destination, master_key=MASTER_KEY, chunk_size=1000
+    )
+    return destination.getvalue()
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_parallel_encryption_is_byte_identical_to_serial(fixed_header, size):
+    payload = os.urandom(size)
+    destination = io.BytesIO()
+
+    header = encrypt_stream_parallel(
+        io.BytesIO(payload),
+        destination,
+        master_key=MASTER_KEY,
+        chunk_size=1000,
+        workers=4,
+    )
+
+    assert header == fixed_header
+    assert destination.getvalue() == _serial_ciphertext(payload)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_parallel_decryption_matches_serial(size):
+    payload = os.urandom(size)
+    ciphertext = _serial_ciphertext(payload)
+
+    serial = list(
+        encryption.iter_decrypted_chunks(io.BytesIO(ciphertext), master_key=MASTER_KEY)
+    )
+    parallel_chunks = list(
+        iter_decrypted_chunks_parallel(
+            io.BytesIO(ciphertext), master_key=MASTER_KEY, workers=4
+        )
+    )
+
+    assert parallel_chunks == serial
+    assert b"".join(parallel_chunks) == payload
+
+
+def test_parallel_output_round_trips_through_serial_decryption():
+    payload = os.urandom(23456)
+    destination = io.BytesIO()
+    encrypt_stream_parallel(
+        io.BytesIO(payload), destination, master_key=MASTER_KEY, chunk_size=1000
+    )
+    destination.seek(0)
+
+    decrypted = encryption.DecryptedStream(destination, master_key=MASTER_KEY)
+
+    assert decrypted.read() == payload
+
+
+def test_parallel_decryption_rejects_tampered_chunk():
+    ciphertext = bytearray(_serial_ciphertext(os.urandom(5000)))
+    ciphertext[-3] ^= 0xFF
+
+    with pytest.raises(InvalidTag):
+        list(
+            iter_decrypted_chunks_parallel(
+                io.BytesIO(bytes(ciphertext)), master_key=MASTER_KEY, workers=3
+            )
+        )
+
+
+def test_workers_default_to_setting(monkeypatch):
+    ciphertext = _serial_ciphertext(os.urandom(5000))
+    pools = []
+    original = parallel.ThreadPoolExecutor
+
+    def tracking_pool(*args, **kwargs):
+        pools.append(kwargs["max_workers"])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(parallel, "ThreadPoolExecutor", tracking_pool)
+
+    with override_settings(LX_ANNOTATE_STORAGE_CRYPTO_WORKERS=3):
+        list(
+            iter_decrypted_chunks_parallel(
+                io.BytesIO(ciphertext), master_key=MASTER_KEY
+            )
+        )
+        encrypt_stream_parallel(
+            io.BytesIO(b"x" * 5000), io.BytesIO(), master_key=MASTER_KEY
+        )
+    with override_settings(LX_ANNOTATE_STORAGE_CRYPTO_WORKERS=1):
+        list(
+            iter_decrypted_chunks_parallel(
+                io.BytesIO(ciphertext), master_key=MASTER_KEY
+            )
+        )
+
+    assert pools == [3, 3]
+
+
+def test_encrypted_storage_parallel_round_trip(tmp_path):
+    storage = EncryptedStorage(
+        location=str(tmp_path), master_key=MASTER_KEY, chunk_size=4096
+    )
+    payload = os.urandom(4096 * 37 + 11)
+    name = storage.save("videos/encrypted.bin", ContentFile(payload))
+
+    chunks = list(
+        iter_parallel_decrypted_chunks(
+            storage, name, master_key=MASTER_KEY, workers=4, chunk_size=1000
+        )
+    )
+
+    assert b"".join(chunks) == payload
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+
+
+def test_early_close_releases_the_file(tmp_path, monkeypatch):
+    storage = EncryptedStorage(
+        location=str(tmp_path), master_key=MASTER_KEY, chunk_size=1000
+    )
+    name = storage.save("videos/encrypted.bin", ContentFile(os.urandom(20000)))
+    opened = []
+    original_open = storage.open_encrypted
+
+    def tracking_open(*args, **kwargs):
+        handle = original_open(*args, **kwargs)
+        opened.append(handle)
+        return handle
+
+    monkeypatch.setattr(storage, "open_encrypted", tracking_open)
+
+    stream = iter_parallel_decrypted_chunks(
+        storage, name, master_key=MASTER_KEY, workers=3
+    )
+    next(stream)
+    stream.close()
+
+    assert opened and all(handle.closed for handle in opened)
+
+
+def test_plaintext_storage_is_read_sequentially(tmp_path):
+    storage = FileSystemStorage(location=str(tmp_path))
+    payload = os.urandom(5000)
+    name = storage.save("videos/clip.bin", ContentFile(payload))
+
+    chunks = list(iter_parallel_decrypted_chunks(storage, name, chunk_size=700))
+
+    assert b"".join(chunks) == payload
+    assert all(len(chunk) <= 700 for chunk in chunks)
+
+
+def test_single_worker_reads_through_the_storage(tmp_path, monkeypatch):
+    storage = EncryptedStorage(
+        location=str(tmp_path), master_key=MASTER_KEY, chunk_size=1000
+    )
+    payload = os.urandom(5000)
+    name = storage.save("videos/encrypted.bin", ContentFile(payload))
+    monkeypatch.setattr(
+        parallel, "load_master_key", lambda: pytest.fail("key was loaded")
+    )
+
+    chunks = list(iter_parallel_decrypted_chunks(storage, name, workers=1))
+
+    assert b"".join(chunks) == payload
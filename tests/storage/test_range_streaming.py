@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory
+
+from lx_annotate.storage.streaming import (
+    RangeNotSatisfiable,
+    managed_media_response,
+    parse_byte_range,
+)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=5-1", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0", "bytes=2000-3000"])
+def test_parse_byte_range_rejects_unsatisfiable_ranges(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(header, 1000)
+
+
+@pytest.fixture
+def media(tmp_path):
+    storage = FileSystemStorage(location=str(tmp_path))
+    payload = os.urandom(3 * 512 * 1024 + 77)
+    name = storage.save("videos/clip.mp4", ContentFile(payload))
+    return storage, name, payload
+
+
+def _body(response) -> bytes:
+    return b"".join(response.streaming_content)
+
+
+def test_full_response_advertises_ranges(media):
+    storage, name, payload = media
+    request = RequestFactory().get("/")
+
+    response = managed_media_response(request, storage, name)
+
+    assert response.status_code == 200
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["Content-Type"] == "video/mp4"
+    assert int(response["Content-Length"]) == len(payload)
+    assert _body(response) == payload
+
+
+def test_partial_response_streams_only_requested_bytes(media):
+    storage, name, payload = media
+    request = RequestFactory().get("/", HTTP_RANGE="bytes=524200-1048700")
+
+    response = managed_media_response(request, storage, name)
+
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 524200-1048700/{len(payload)}"
+    assert response["Content-Length"] == str(1048700 - 524200 + 1)
+    assert _body(response) == payload[524200:1048701]
+
+
+def test_unsatisfiable_range_returns_416(media):
+    storage, name, payload = media
+    request = RequestFactory().get("/", HTTP_RANGE=f"bytes={len(payload)}-")
+
+    response = managed_media_response(request, storage, name)
+
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(payload)}"
+
+
+def test_encrypted_storage_serves_range_without_temp_copy(tmp_path, monkeypatch):
+    pytest.importorskip("cryptography")
+    from lx_annotate.storage import index_cache
+    from lx_annotate.storage.encrypted import EncryptedStorage
+
+    monkeypatch.setattr(
+        index_cache, "_default_cache", index_cache.ChunkIndexCache(None)
+    )
+    storage = EncryptedStorage(
+        location=str(tmp_path / "vault"),
+        master_key=b"test-master-key-32-bytes-long-!!",
+        chunk_size=64 * 1024,
+    )
+    payload = os.urandom(10 * 64 * 1024 + 5)
+    name = storage.save("videos/clip.mp4", ContentFile(payload))
+    request = RequestFactory().get("/", HTTP_RANGE="bytes=300000-400000")
+
+    response = managed_media_response(request, storage, name)
+
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 300000-400000/{len(payload)}"
+    assert _body(response) == payload[300000:400001]
+
+
+def test_tail_range_decrypts_only_overlapping_chunks(tmp_path, monkeypatch):
+    pytest.importorskip("cryptography")
+    import importlib
+
+    from lx_annotate.storage import index_cache
+    from lx_annotate.storage.encrypted import EncryptedStorage
+
+    monkeypatch.setattr(
+        index_cache, "_default_cache", index_cache.ChunkIndexCache(None)
+    )
+    storage = EncryptedStorage(
+        location=str(tmp_path / "vault"),
+        master_key=b"test-master-key-32-bytes-long-!!",
+        chunk_size=64 * 1024,
+    )
+    payload = os.urandom(10 * 64 * 1024 + 500)
+    name = storage.save("videos/clip.mp4", ContentFile(payload))
+    index_cache.storage_chunk_index(storage, name)
+    # A fresh process: the storage's in-memory index is empty.
+    storage = EncryptedStorage(
+        location=storage.location,
+        master_key=b"test-master-key-32-bytes-long-!!",
+        chunk_size=64 * 1024,
+    )
+
+    record_reads = []
+    original_open = storage.open_encrypted
+
+    class RecordingFile:
+        def __init__(self, handle):
+            self.handle = handle
+
+        def read(self, size=-1):
+            data = self.handle.read(size)
+            if len(data) > 300:
+                record_reads.append(len(data))
+            return data
+
+        def __getattr__(self, attribute):
+            return getattr(self.handle, attribute)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.handle.close()
+
+    def no_walk(*_args, **_kwargs):
+        pytest.fail("the storage walked a file the persisted index covers")
+
+    monkeypatch.setattr(
+        storage, "open_encrypted", lambda name: RecordingFile(original_open(name))
+    )
+    monkeypatch.setattr(
+        importlib.import_module(EncryptedStorage.__module__),
+        "build_chunk_index",
+        no_walk,
+    )
+    start = 9 * 64 * 1024 - 100
+    request = RequestFactory().get("/", HTTP_RANGE=f"bytes={start}-")
+
+    response = managed_media_response(request, storage, name)
+
+    assert response.status_code == 206
+    assert _body(response) == payload[start:]
+    # Apart from the header and the length prefixes, only the records of
+    # chunks 8, 9 and 10 are read.
+    assert record_reads == [64 * 1024 + 16, 64 * 1024 + 16, 500 + 16]
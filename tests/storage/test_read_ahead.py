@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import io
+import os
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+
+from lx_annotate.storage.read_ahead import ReadAheadFile
+
+
+def test_read_ahead_returns_source_bytes_for_any_read_size():
+    payload = os.urandom(10 * 1024 + 17)
+
+    with ReadAheadFile(io.BytesIO(payload), block_size=1024, depth=2) as reader:
+        parts = [reader.read(1), reader.read(3000), reader.read(1024)]
+        parts.append(reader.read())
+
+    assert b"".join(parts) == payload
+
+
+def test_read_ahead_rejects_backward_seek():
+    with ReadAheadFile(io.BytesIO(b"abcdef"), block_size=2) as reader:
+        assert reader.seek(0) == 0
+        reader.read(4)
+
+        with pytest.raises(io.UnsupportedOperation):
+            reader.seek(0)
+
+
+def test_read_ahead_surfaces_source_errors():
+    class BrokenSource(io.BytesIO):
+        def read(self, size=-1):
+            raise OSError("disk went away")
+
+    with ReadAheadFile(BrokenSource(), block_size=4) as reader:
+        with pytest.raises(OSError, match="disk went away"):
+            reader.read(4)
+
+
+def test_close_stops_reader_blocked_on_full_queue():
+    reader = ReadAheadFile(io.BytesIO(b"x" * 4096), block_size=1, depth=1)
+    reader.read(1)
+
+    reader.close()
+
+    assert reader.closed
+    assert not reader._thread.is_alive()
+
+
+def test_process_intake_file_reads_large_files_ahead(monkeypatch, tmp_path):
+    from lx_annotate.management.commands import run_filewatcher
+
+    monkeypatch.setattr(run_filewatcher, "READ_AHEAD_MIN_BYTES", 1024)
+    wrapped = []
+    original_init = ReadAheadFile.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        wrapped.append(kwargs["block_size"])
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(ReadAheadFile, "__init__", tracking_init)
+    storage = FileSystemStorage(location=str(tmp_path / "vault"))
+    storage.chunk_size = 4096
+    payload = os.urandom(64 * 1024 + 5)
+    intake_file = tmp_path / "large.mp4"
+    intake_file.write_bytes(payload)
+
+    saved_name = run_filewatcher.process_intake_file(
+        intake_file, storage_backend=storage
+    )
+
+    assert wrapped == [4096]
+    assert not intake_file.exists()
+    with storage.open(saved_name, "rb") as handle:
+        assert handle.read() == payload
+
+
+def test_encrypted_intake_reads_ahead_in_storage_chunks(monkeypatch, tmp_path):
+    pytest.importorskip("cryptography")
+    from lx_annotate.management.commands import run_filewatcher
+    from lx_annotate.storage.encrypted import EncryptedStorage
+    from lx_annotate.storage.encryption import build_chunk_index
+
+    monkeypatch.setattr(run_filewatcher, "READ_AHEAD_MIN_BYTES", 1024)
+    storage = EncryptedStorage(
+        location=str(tmp_path / "vault"),
+        master_key=b"test-master-key-32-bytes-long-!!",
+        chunk_size=4096,
+    )
+    payload = os.urandom(64 * 1024 + 5)
+    intake_file = tmp_path / "large.mp4"
+    intake_file.write_bytes(payload)
+
+    saved_name = run_filewatcher.process_intake_file(
+        intake_file, storage_backend=storage
+    )
+
+    with storage.open_encrypted(saved_name) as source:
+        _header, _header_bytes, entries, _size = build_chunk_index(source)
+    # Each read-ahead block is one full chunk for encrypt_stream.
+    assert [entry.plaintext_length for entry in entries] == [4096] * 16 + [5]
+    with storage.open(saved_name, "rb") as handle:
+        assert handle.read() == payload
@@ -123,3 +123,55 @@ def test_repair_managed_payloads_fails_when_backend_is_not_encrypted(monkeypatch
 
     with pytest.raises(CommandError, match="Encrypted storage is not active"):
         call_command("repair_managed_payloads")
+
+
+def test_repair_managed_payloads_resumes_from_checkpoint(
+    monkeypatch, repair_storage, tmp_path_factory
+):
+    from lx_annotate.management.commands import repair_managed_payloads as command_mod
+    from lx_annotate.storage.vault_scan import ScanCheckpoint
+
+    for name in ["videos/a.bin", "videos/b.bin", "videos/c.bin"]:
+        raw_path = Path(repair_storage.path(name))
+        raw_path.parent.mkdir(parents=True, exist_ok=True)
+        raw_path.write_bytes(b"plaintext")
+    checkpoint_path = tmp_path_factory.mktemp("maintenance") / "repair.json"
+    ScanCheckpoint(
+        checkpoint_path,
+        scope={
+            "command": "repair_managed_payloads",
+            "root": str(Path(repair_storage.location).resolve()),
+            "path_prefix": "",
+            "dry_run": False,
+        },
+    ).save("videos/a.bin", {"repaired": 1}, force=True)
+    monkeypatch.setattr(command_mod, "default_storage", repair_storage)
+    out = StringIO()
+
+    call_command(
+        "repair_managed_payloads",
+        "--resume",
+        "--workers=2",
+        f"--checkpoint={checkpoint_path}",
+        stdout=out,
+    )
+
+    assert Path(repair_storage.path("videos/a.bin")).read_bytes() == b"plaintext"
+    assert "Repaired plaintext payload: videos/b.bin" in out.getvalue()
+    assert "repaired=3" in out.getvalue()
+    assert not checkpoint_path.exists()
+
+
+def test_repair_managed_payloads_resume_requires_checkpoint(
+    monkeypatch, repair_storage, tmp_path
+):
+    from lx_annotate.management.commands import repair_managed_payloads as command_mod
+
+    monkeypatch.setattr(command_mod, "default_storage", repair_storage)
+
+    with pytest.raises(CommandError, match="No matching checkpoint"):
+        call_command(
+            "repair_managed_payloads",
+            "--resume",
+            f"--checkpoint={tmp_path / 'missing.json'}",
+        )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import base64
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from lx_annotate.storage.encrypted import EncryptedStorage
+
+OLD_KEY = b"old-master-key-32-bytes-long-!!!"
+NEW_KEY = b"new-master-key-32-bytes-long-!!!"
+
+
+def _storage(location: Path, key: bytes) -> EncryptedStorage:
+    return EncryptedStorage(
+        location=str(location),
+        base_url="/media/",
+        master_key=key,
+        chunk_size=1024,
+    )
+
+
+@pytest.fixture
+def rotation(tmp_path, monkeypatch):
+    from lx_annotate.management.commands import rotate_master_key as command_mod
+
+    vault = tmp_path / "vault"
+    old_storage = _storage(vault, OLD_KEY)
+    monkeypatch.setattr(command_mod, "default_storage", old_storage)
+    keys = tmp_path / "keys"
+    keys.mkdir()
+    (keys / "old.key").write_text(base64.urlsafe_b64encode(OLD_KEY).decode("ascii"))
+    (keys / "new.key").write_text(base64.urlsafe_b64encode(NEW_KEY).decode("ascii"))
+    with override_settings(APP_DATA_DIR=tmp_path / "data"):
+        yield old_storage, [
+            f"--old-key-file={keys / 'old.key'}",
+            f"--new-key-file={keys / 'new.key'}",
+        ]
+
+
+def test_rotation_reencrypts_files_under_the_new_key(rotation):
+    old_storage, key_options = rotation
+    payload = b"frame" * 2000
+    name = old_storage.save("videos/clip.mp4", ContentFile(payload))
+    out = StringIO()
+
+    call_command("rotate_master_key", *key_options, "--workers=2", stdout=out)
+
+    with _storage(old_storage.location, NEW_KEY).open(name, "rb") as handle:
+        assert handle.read() == payload
+    assert sorted(p.name for p in Path(old_storage.path(name)).parent.iterdir()) == [
+        "clip.mp4"
+    ]
+    assert "reencrypted=1" in out.getvalue()
+
+
+def test_rotation_is_idempotent(rotation):
+    old_storage, key_options = rotation
+    old_storage.save("videos/clip.mp4", ContentFile(b"clip"))
+    call_command("rotate_master_key", *key_options, stdout=StringIO())
+    out = StringIO()
+
+    call_command("rotate_master_key", *key_options, stdout=out)
+
+    assert "reencrypted=0 already_current=1" in out.getvalue()
+
+
+def test_dry_run_leaves_files_unchanged(rotation):
+    old_storage, key_options = rotation
+    name = old_storage.save("videos/clip.mp4", ContentFile(b"clip"))
+    before = Path(old_storage.path(name)).read_bytes()
+    out = StringIO()
+
+    call_command("rotate_master_key", *key_options, "--dry-run", stdout=out)
+
+    assert Path(old_storage.path(name)).read_bytes() == before
+    assert "would_reencrypt=1" in out.getvalue()
+
+
+def test_file_opening_with_neither_key_is_reported(rotation):
+    old_storage, key_options = rotation
+    _storage(old_storage.location, b"x" * 32).save(
+        "videos/foreign.mp4", ContentFile(b"clip")
+    )
+
+    with pytest.raises(CommandError, match="failed=1"):
+        call_command(
+            "rotate_master_key", *key_options, stdout=StringIO(), stderr=StringIO()
+        )
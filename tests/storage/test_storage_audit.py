@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+import random
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from django.core.files.base import ContentFile
+
+from lx_annotate.storage.audit import (
+    AuditState,
+    audit_file,
+    chunk_runs,
+    select_chunks,
+)
+from lx_annotate.storage.encrypted import EncryptedStorage
+from lx_annotate.storage.index_cache import walk_chunk_index
+from lx_annotate.storage.vault_scan import ThroughputLimiter
+
+MASTER_KEY = b"test-master-key-32-bytes-long-!!"
+
+
+def _flip_byte_in_chunk(path, chunk: int) -> None:
+    with open(path, "rb") as handle:
+        offset = walk_chunk_index(handle).entry(chunk).ciphertext_offset + 10
+    with open(path, "r+b") as handle:
+        handle.seek(offset)
+        byte = handle.read(1)
+        handle.seek(offset)
+        handle.write(bytes([byte[0] ^ 0xFF]))
+
+
+@pytest.fixture
+def vault(tmp_path):
+    storage = EncryptedStorage(
+        location=str(tmp_path / "vault"), master_key=MASTER_KEY, chunk_size=1000
+    )
+    name = storage.save("videos/clip.mp4", ContentFile(os.urandom(9300)))
+    return storage, name, tmp_path / "vault" / name
+
+
+def test_full_audit_authenticates_every_chunk(vault):
+    storage, name, path = vault
+
+    result = audit_file(storage, name, master_key=MASTER_KEY)
+
+    assert result.ok
+    assert (result.chunk_count, result.checked_chunks) == (10, 10)
+    # The framing walk, the key check, then one range read that walks again
+    # and decrypts.
+    with open(path, "rb") as handle:
+        header_size = walk_chunk_index(handle).data_offset
+    framing = header_size + 10 * 4
+    assert result.bytes_read == framing + header_size + os.path.getsize(path)
+
+
+def test_audit_reports_the_damaged_chunk(vault):
+    storage, name, path = vault
+    _flip_byte_in_chunk(path, 4)
+
+    result = audit_file(storage, name, master_key=MASTER_KEY)
+
+    assert not result.ok
+    assert result.chunk == 4
+    assert result.error == "InvalidTag"
+    assert result.checked_chunks == 4
+
+
+def test_audit_reports_broken_framing(vault):
+    storage, name, path = vault
+    with open(path, "r+b") as handle:
+        handle.truncate(os.path.getsize(path) - 5)
+
+    result = audit_file(storage, name, master_key=MASTER_KEY)
+
+    assert not result.ok
+    assert "truncated" in result.error
+    assert result.checked_chunks == 0
+
+
+def test_audit_rejects_file_wrapped_with_another_key(vault):
+    storage, name, _path = vault
+
+    result = audit_file(storage, name, master_key=b"x" * 32)
+
+    assert not result.ok
+    assert result.checked_chunks == 0
+    assert result.chunk is None
+
+
+def test_limiter_is_charged_for_the_bytes_read(vault):
+    storage, name, path = vault
+    charged = []
+
+    class RecordingLimiter:
+        def consume(self, size):
+            charged.append(size)
+
+    result = audit_file(
+        storage, name, master_key=MASTER_KEY, fraction=0, limiter=RecordingLimiter()
+    )
+
+    assert result.checked_chunks == 2
+    assert sum(charged) == result.bytes_read
+    # Three framing walks (the audit's own and one per run), the key check
+    # and two records.
+    with open(path, "rb") as handle:
+        header_size = walk_chunk_index(handle).data_offset
+    framing = header_size + 10 * 4
+    assert result.bytes_read == 3 * framing + header_size + 1016 + 316
+    assert charged.count(1016) == 1 and charged.count(316) == 1
+
+
+def test_sample_always_includes_first_and_last_chunk():
+    rng = random.Random(1)
+
+    assert select_chunks(100, 1.0, rng) == list(range(100))
+    sample = select_chunks(100, 0.1, rng)
+    assert len(sample) == 10
+    assert sample[0] == 0 and sample[-1] == 99
+    assert sample == sorted(set(sample))
+    assert select_chunks(1, 0.1, rng) == [0]
+    assert select_chunks(0, 0.5, rng) == []
+
+
+def test_sampled_audit_reads_fewer_chunks(vault):
+    storage, name, _path = vault
+
+    result = audit_file(
+        storage, name, master_key=MASTER_KEY, fraction=0.3, rng=random.Random(7)
+    )
+
+    assert result.ok
+    assert result.checked_chunks == 3
+
+
+def test_chunk_runs_group_adjacent_chunks():
+    assert chunk_runs([0, 1, 2, 5, 7, 8]) == [(0, 2), (5, 5), (7, 8)]
+    assert chunk_runs([]) == []
+
+
+def test_limiter_spreads_reads_over_time():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    limiter = ThroughputLimiter(1000, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.consume(500)
+
+    assert slept == [0.5, 0.5, 0.5]
+    assert now[0] == pytest.approx(1.5)
+
+
+def test_unlimited_limiter_never_sleeps():
+    limiter = ThroughputLimiter(0, sleep=lambda seconds: pytest.fail("slept"))
+    limiter.consume(10**9)
+
+
+def test_state_skips_only_unchanged_files(tmp_path):
+    state = AuditState(tmp_path / "audit.sqlite3")
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"x")
+    state.record(path, size=1, mtime_ns=5, fraction=0.5)
+
+    assert state.is_verified(path, size=1, mtime_ns=5, fraction=0.5)
+    assert not state.is_verified(path, size=1, mtime_ns=6, fraction=0.5)
+    assert not state.is_verified(path, size=1, mtime_ns=5, fraction=1.0)
+
+    state.forget(path)
+    assert not state.is_verified(path, size=1, mtime_ns=5, fraction=0.1)
+
+    state.record(path, size=1, mtime_ns=5, fraction=1.0)
+    path.unlink()
+    assert state.prune() == 1
+    state.close()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from lx_annotate.storage.vault_scan import (
+    ScanCheckpoint,
+    ThroughputMeter,
+    run_ordered,
+    walk_vault,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def vault(tmp_path):
+    root = tmp_path / "vault"
+    for name in ["a/1.bin", "a/b/2.bin", "a/b/3.bin", "a0.bin", "c/4.bin"]:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(name.encode())
+    (root / "c" / "link.bin").symlink_to(root / "a0.bin")
+    return root
+
+
+def _names(entries) -> list[str]:
+    return [entry.relative_name for entry in entries]
+
+
+def test_walk_is_depth_first_and_name_sorted(vault):
+    entries = list(walk_vault(vault))
+
+    assert _names(entries) == [
+        "a/1.bin",
+        "a/b/2.bin",
+        "a/b/3.bin",
+        "a0.bin",
+        "c/4.bin",
+        "c/link.bin",
+    ]
+    assert [entry.is_symlink for entry in entries] == [False] * 5 + [True]
+    assert entries[0].size == len(b"a/1.bin")
+
+
+def test_walk_resumes_after_a_nested_position(vault):
+    assert _names(walk_vault(vault, resume_after="a/b/2.bin")) == [
+        "a/b/3.bin",
+        "a0.bin",
+        "c/4.bin",
+        "c/link.bin",
+    ]
+    assert _names(walk_vault(vault, resume_after="a0.bin")) == [
+        "c/4.bin",
+        "c/link.bin",
+    ]
+    assert _names(walk_vault(vault, resume_after="c/link.bin")) == []
+
+
+def test_walk_of_subtree_keeps_root_relative_names(vault):
+    assert _names(walk_vault(vault, vault / "a" / "b")) == ["a/b/2.bin", "a/b/3.bin"]
+
+
+def test_run_ordered_yields_in_input_order():
+    def slow_for_small(value: int) -> int:
+        time.sleep(0.01 * (5 - value))
+        return value * 10
+
+    results = [
+        (item, future.result())
+        for item, future in run_ordered(slow_for_small, range(5), workers=4)
+    ]
+
+    assert results == [(value, value * 10) for value in range(5)]
+
+
+def test_run_ordered_surfaces_worker_errors_per_item():
+    def fail_on_two(value: int) -> int:
+        if value == 2:
+            raise ValueError("bad")
+        return value
+
+    outcomes = []
+    for item, future in run_ordered(fail_on_two, range(4), workers=2):
+        outcomes.append(type(future.exception()).__name__ if item == 2 else item)
+
+    assert outcomes == [0, 1, "ValueError", 3]
+
+
+def test_run_ordered_bounds_work_in_flight():
+    started = []
+    lock = threading.Lock()
+
+    def record(value: int) -> int:
+        with lock:
+            started.append(value)
+        return value
+
+    results = run_ordered(record, range(100), workers=2, window=3)
+    next(results)
+    results.close()
+
+    assert len(started) <= 4
+
+
+def test_checkpoint_round_trip_and_scope(tmp_path):
+    path = tmp_path / "state" / "scan.json"
+    clock = FakeClock()
+    checkpoint = ScanCheckpoint(path, scope={"root": "/vault"}, clock=clock)
+
+    assert checkpoint.save("a/1.bin", {"done": 1}) is False
+    clock.now = 11
+    assert checkpoint.save("a/1.bin", {"done": 1}) is True
+    assert checkpoint.load() == ("a/1.bin", {"done": 1})
+    assert ScanCheckpoint(path, scope={"root": "/other"}).load() is None
+
+    checkpoint.clear()
+    assert not path.exists()
+
+
+def test_throughput_summary():
+    clock = FakeClock()
+    meter = ThroughputMeter(clock=clock)
+    meter.add(1024 * 1024)
+    meter.add(1024 * 1024)
+    clock.now = 2
+
+    assert meter.summary() == "files_per_second=1.0 mb_per_second=1.0 elapsed=2.0s"
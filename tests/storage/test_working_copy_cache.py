@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import fcntl
+import os
+import threading
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from lx_annotate.storage.working_copies import WorkingCopyCache, secure_delete
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingStorage(FileSystemStorage):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.opened = 0
+
+    def open(self, name, mode="rb"):
+        self.opened += 1
+        return super().open(name, mode)
+
+
+@pytest.fixture
+def vault(tmp_path):
+    storage = CountingStorage(location=str(tmp_path / "vault"))
+    names = [
+        storage.save(f"videos/clip-{index}.mp4", ContentFile(bytes([index]) * 1000))
+        for index in range(3)
+    ]
+    return storage, names
+
+
+def _cache(tmp_path, **kwargs) -> WorkingCopyCache:
+    kwargs.setdefault("max_bytes", 10_000)
+    kwargs.setdefault("ttl_seconds", 600)
+    return WorkingCopyCache(tmp_path / "copies", **kwargs)
+
+
+def test_second_acquire_is_a_hit(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path)
+
+    with cache.acquire(storage, names[0], suffix=".mp4") as first:
+        assert first.read_bytes() == bytes([0]) * 1000
+        assert first.suffix == ".mp4"
+    with cache.acquire(storage, names[0], suffix=".mp4") as second:
+        assert second == first
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.bytes) == (1, 1, 1, 1000)
+    assert storage.opened == 1
+    assert oct(first.stat().st_mode & 0o777) == oct(0o600)
+
+
+def test_least_recently_used_idle_copy_is_evicted(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path, max_bytes=2000)
+
+    with cache.acquire(storage, names[0]) as oldest:
+        pass
+    with cache.acquire(storage, names[1]):
+        pass
+    with cache.acquire(storage, names[2]):
+        pass
+
+    assert not oldest.exists()
+    assert cache.stats().evictions == 1
+    assert cache.stats().bytes == 2000
+
+
+def test_copies_in_use_are_not_evicted(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path, max_bytes=500)
+
+    with cache.acquire(storage, names[0]) as held:
+        with cache.acquire(storage, names[1]):
+            pass
+        assert held.exists()
+    assert not held.exists()
+    assert cache.stats().entries == 0
+
+
+def test_idle_copies_expire_after_ttl(tmp_path, vault):
+    storage, names = vault
+    clock = FakeClock()
+    cache = _cache(tmp_path, ttl_seconds=60, clock=clock)
+    with cache.acquire(storage, names[0]) as path:
+        pass
+
+    clock.now = 30
+    assert cache.sweep() == 0
+    clock.now = 61
+    assert cache.sweep() == 1
+    assert not path.exists()
+
+
+def test_changed_source_is_decrypted_again(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path)
+    with cache.acquire(storage, names[0]):
+        pass
+
+    source = storage.path(names[0])
+    with open(source, "wb") as handle:
+        handle.write(b"rewritten")
+    os.utime(source, (1, 1))
+
+    with cache.acquire(storage, names[0]) as path:
+        assert path.read_bytes() == b"rewritten"
+    assert cache.stats().misses == 2
+
+
+def test_concurrent_acquires_decrypt_once(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path)
+    start = threading.Barrier(4)
+    contents = []
+
+    def worker():
+        start.wait()
+        with cache.acquire(storage, names[0]) as path:
+            contents.append(path.read_bytes())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert contents == [bytes([0]) * 1000] * 4
+    assert storage.opened == 1
+
+
+def test_failed_decrypt_leaves_no_partial_copy(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        with cache.acquire(storage, "videos/missing.mp4"):
+            pass
+
+    assert list(cache.root.iterdir()) == []
+    assert cache.stats().entries == 0
+
+
+def test_secure_delete_overwrites_before_unlink(tmp_path, monkeypatch):
+    path = tmp_path / "plaintext.bin"
+    path.write_bytes(b"secret" * 100)
+    seen = []
+    original_unlink = type(path).unlink
+
+    def checking_unlink(self, missing_ok=False):
+        seen.append(self.read_bytes())
+        original_unlink(self, missing_ok=missing_ok)
+
+    monkeypatch.setattr(type(path), "unlink", checking_unlink)
+
+    secure_delete(path)
+
+    assert seen == [bytes(600)]
+    assert not path.exists()
+
+
+def test_processes_share_copies_and_one_budget(tmp_path, vault):
+    storage, names = vault
+    first = _cache(tmp_path, max_bytes=1500)
+    second = _cache(tmp_path, max_bytes=1500)
+
+    with first.acquire(storage, names[0]) as path:
+        with second.acquire(storage, names[0]) as shared:
+            assert shared == path
+    assert storage.opened == 1
+    assert second.stats().hits == 1
+
+    with second.acquire(storage, names[1]):
+        pass
+    assert first.stats().entries == 1
+    assert not path.exists()
+
+
+def test_copy_leased_by_another_process_is_not_evicted(tmp_path, vault):
+    storage, names = vault
+    cache = _cache(tmp_path, ttl_seconds=0)
+    with cache.acquire(storage, names[0]) as path:
+        pass
+    assert not path.exists()
+
+    with cache.acquire(storage, names[0]) as path:
+        lease = os.open(path, os.O_RDONLY)
+        fcntl.flock(lease, fcntl.LOCK_SH)
+    try:
+        assert cache.sweep() == 0
+        assert path.exists()
+    finally:
+        os.close(lease)
+    assert cache.sweep() == 1
+
+
+def test_sweep_wipes_part_files_left_by_a_crash(tmp_path, vault):
+    cache = _cache(tmp_path)
+    part = cache.root / ".abc.mp4.part"
+    part.write_bytes(b"plaintext")
+
+    cache.sweep()
+
+    assert list(cache.root.iterdir()) == []